@@ -1,7 +1,6 @@
 #!/usr/bin/env python3
 import sys
 import os
-from random import random
 from typing import Dict
 
 # Добавляем src/ в PYTHONPATH, чтобы пакеты my_game были доступны
@@ -10,7 +9,6 @@ sys.path.insert(0, os.path.join(here, "src"))
 
 from my_game.characters.player import Player
 from my_game.characters.character_class import CharacterClass
-from my_game.characters.player_character import PlayerCharacter
 from my_game.utils.cli_utils import (
     prompt_int,
     prompt_str,
@@ -18,17 +16,20 @@ from my_game.utils.cli_utils import (
     exit_program,
 )
 from my_game.utils.monster_utils import generate_enemies_for_tier
-from my_game.battle.dispatcher import take_turn as ai_take_turn
+from my_game.battle.context import BattleContext
+from my_game.battle.engine import run_battle
+from my_game.battle.events import BattleStarted, BattleEnded
+from my_game.battle.log import TextLogRenderer
 from my_game.items.store import Store
 from my_game.items.item import GearItem, PotionItem
-from my_game.config import CONFIG
+from my_game.config import current
 
 # ——— Магазин ———
 players: Dict[int, Player] = {}
 store = Store()
 
 # Подгружаем локализации из gear.yaml
-_gear_cfg = CONFIG.get("gear", {})
+_gear_cfg = current().raw.get("gear", {})
 QUALITY_NAMES = {
     q_name: info.get("display_name", q_name)
     for q_name, info in _gear_cfg.get("quality_tiers", {}).items()
@@ -233,7 +234,7 @@ def fight():
         "Доступные персонажи:",
     )
 
-    tiers = CONFIG["monsters"]["monster_tiers"]
+    tiers = current().raw["monsters"]["monster_tiers"]
     tier_keys = ["tier1", "tier2", "tier3", "tier4"]
     sel = choose_from_list(
         tier_keys,
@@ -241,42 +242,29 @@ def fight():
         prompt="Выберите сложность боя",
     )
     tier = tier_keys.index(sel) + 1
-    enemies = generate_enemies_for_tier(tier)
-
-    participants = [pc] + enemies
-    print(f"\n⚔️  Начало боя (тир {tier} — {tiers[sel]['name']})")
-    for e in enemies:
-        print(f"   • {e.name} (ур. {e.level}) — HP {e.health}/{e.max_health}")
-    print(f"🔹 {pc.name} (lvl {pc.level}) — HP {pc.health}/{pc.max_health}\n")
-
-    round_num = 1
-    while pc.is_alive and any(m.is_alive for m in enemies):
-        print(f"=== Раунд {round_num} ===")
-        order = [p for p in participants if p.is_alive]
-        order.sort(key=lambda x: x.agility + random() * 0.1, reverse=True)
-
-        for actor in order:
-            if isinstance(actor, PlayerCharacter):
-                ai_take_turn(actor, [m for m in enemies if m.is_alive])
-            else:
-                ai_take_turn(actor, pc)
-
-            if not pc.is_alive or not any(m.is_alive for m in enemies):
-                break
-
-        round_num += 1
-        print()
-
-    if pc.is_alive:
-        base = CONFIG["growth"]["xp_rewards"][f"tier{tier}"]
+    ctx = BattleContext(TextLogRenderer(sys.stdout))
+    enemies = generate_enemies_for_tier(tier, ctx.rng, ctx.config)
+
+    emit = ctx.emit
+    emit(
+        BattleStarted(
+            tier,
+            ctx.config.tier(tier).name,
+            tuple((e.name, e.level, e.health, e.max_health) for e in enemies),
+            ((pc.name, pc.level, pc.health, pc.max_health),),
+        )
+    )
+
+    if run_battle(ctx, [pc], enemies):
+        base = ctx.config.xp_rewards[tier]
         count = len(enemies)
         reward = base * count * 1.2 if count > 1 else base
         pc.add_exp(reward)
         gold = int(reward // 10)
         pc.owner.add_gold(gold)
-        print(f"🎉 Победа! {pc.name!r} получает {reward} XP и {gold} золота")
+        emit(BattleEnded(True, reward, gold))
     else:
-        print(f"☠️  Поражение... {pc.name!r} пал в бою.")
+        emit(BattleEnded(False, 0, 0))
 
 
 def main():
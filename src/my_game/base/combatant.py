@@ -3,15 +3,41 @@
 from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
-from typing import Dict, List, ClassVar
+from typing import TYPE_CHECKING, Dict, List, ClassVar, Optional, Tuple
 
-from ..config import CONFIG
-from ..battle.status import (
-    start_of_turn,
-    modify_incoming_damage,
-    apply_extra_turn,
-    end_of_turn,
-)
+from ..battle.context import BattleContext, DEFAULT_CONTEXT
+from ..battle.effects import EffectStore, effect_bit
+from ..battle.events import DamageTaken, LastStand, Death, EffectApplied, EffectExpired
+from ..battle.passives import NO_PASSIVES, PassiveHooks, hooks_for
+from .stats import Modifier, StatStack
+from ..battle.triggers import ALWAYS, ENEMY_LOW, FATAL, FIRST, SELF_LOW, SkillBook, skill_book
+from ..battle.status import modify_incoming_damage, apply_extra_turn
+
+if TYPE_CHECKING:
+    from ..battle.ai.base_ai import BaseAI
+    from ..battle.damage import Matchup
+
+
+_SURVIVE = effect_bit("survive_one_turn")
+
+
+@dataclass(frozen=True, slots=True)
+class CombatState:
+    """
+    Снимок изменяемого боевого состояния участника (см. Combatant.snapshot).
+    Эффекты и кулдауны скопированы, поэтому один снимок можно
+    восстанавливать сколько угодно раз.
+    """
+
+    health: int
+    mana: float
+    status_effects: Tuple[Dict, ...]
+    cooldowns: Tuple[Tuple[str, int], ...]
+    turn_clock: int
+    has_acted: bool
+    last_incoming_damage: int
+    last_stand_used: bool
+    battle: BattleContext
 
 
 @dataclass
@@ -31,6 +57,7 @@ class Combatant(ABC):
     accuracy: float = 0.8
     crit_chance: float = 0.05
     dodge_chance: float = 0.03
+    magic_damage: float = 0.0  # доля к магическому урону (ауры отряда)
 
     # Ресурсы
     base_mana: int = 0  # максимальный запас маны
@@ -38,10 +65,18 @@ class Combatant(ABC):
     mana: int = field(init=False, default=0)
 
     # Состояния, кулдауны и умения
-    status_effects: List[Dict] = field(default_factory=list)
+    effects: EffectStore = field(default_factory=EffectStore)
+    # навык → значение turn_clock, с которого он снова доступен
     cooldowns: Dict[str, int] = field(default_factory=dict)
-    passives: List[str] = field(default_factory=list)
     skills: List[str] = field(default_factory=list)
+    # хуки пассивок из skills (battle.passives); обновляет refresh_skills()
+    passives: PassiveHooks = field(default=NO_PASSIVES, init=False, repr=False, compare=False)
+    # книга навыков (battle.triggers) по конфигу боя; None — собрать заново
+    _book: Optional[SkillBook] = field(default=None, init=False, repr=False, compare=False)
+    # навыки на кулдауне (биты книги) и ближайший turn_clock, когда маску
+    # нужно пересчитать (0 — пересчитать при следующем запросе)
+    _cooling: int = field(default=0, init=False, repr=False, compare=False)
+    _cd_next: float = field(default=0, init=False, repr=False, compare=False)
 
     # Системные поля
     _uid_counter: ClassVar[int] = 0
@@ -52,14 +87,115 @@ class Combatant(ABC):
         default=False, init=False
     )  # трек, был ли уже Last Stand
     _uid: int = field(init=False)
+    # часы хода: сколько своих ходов завершено (end_of_turn). По ним считаются
+    # кулдауны и длительности эффектов — без ежеходового обхода таймеров
+    turn_clock: int = field(default=0, init=False)
+    # контекст текущего боя (приёмник событий и т.п.)
+    battle: BattleContext = field(
+        default=DEFAULT_CONTEXT, init=False, repr=False, compare=False
+    )
+    # версия статов: растёт в stats_changed(), по ней устаревают кэши пар
+    # атакующий → защитник (battle.damage.Matchup) — id(защитника) → Matchup
+    _stat_version: int = field(default=0, init=False, repr=False, compare=False)
+    _matchups: Dict[int, Matchup] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+    # слои модификаторов статов (base/stats.py); создаются при первом обращении
+    _stats: Optional[StatStack] = field(default=None, init=False, repr=False, compare=False)
+    # ИИ участника на текущий бой (создаёт dispatcher на первом ходу)
+    _ai: Optional[BaseAI] = field(default=None, init=False, repr=False, compare=False)
 
     def __post_init__(self):
         # стартовое здоровье и мана
         self.health = self.max_health
         self.mana = self.base_mana
+        self.refresh_skills()
         type(self)._uid_counter += 1
         self._uid = type(self)._uid_counter
 
+    def refresh_skills(self) -> None:
+        """Пересобрать хуки пассивок и книгу навыков после изменения skills."""
+        self.passives = hooks_for(self.skills)
+        self._book = None
+
+    @property
+    def stats(self) -> StatStack:
+        """Модификаторы статов; слой base — статы на момент первого обращения."""
+        stack = self._stats
+        if stack is None:
+            stack = self._stats = StatStack(self)
+        return stack
+
+    def _sync_buffs(self) -> None:
+        """Слой buffs по текущим эффектам, у которых в правилах есть stat."""
+        config = self.battle.config
+        mods = []
+        for eff in self.effects:
+            rules = config.effect_rules(eff["effect"])
+            if rules.stat is not None:
+                value = eff.get("power", rules.stat_value)
+                if value:
+                    mods.append(Modifier(rules.stat, value, "buffs", rules.stat_percent, eff))
+        if mods or self._stats is not None:
+            self.stats.replace_layer("buffs", mods)
+
+    def stats_changed(self) -> None:
+        """Отметить смену статов (уровень, экипировка…): кэши урона устаревают."""
+        self._stat_version += 1
+
+    def reset_combat_state(self) -> None:
+        """
+        Вернуть боевое состояние к началу боя: полное здоровье и мана,
+        без эффектов и кулдаунов, вне какого‑либо боя. Статы — без баффов
+        и аур боя, остальные слои не трогает.
+        """
+        if self._stats is not None:
+            self._stats.replace_layer("buffs", ())
+            self._stats.replace_layer("auras", ())
+        self.health = self.max_health
+        self.mana = self.base_mana
+        self.effects = EffectStore()
+        self.cooldowns = {}
+        self._cd_next = 0
+        self.turn_clock = 0
+        self._has_acted = False
+        self._last_incoming_damage = 0
+        self._last_stand_used = False
+        self.battle = DEFAULT_CONTEXT
+        self._ai = None
+        self._matchups = {}
+
+    def snapshot(self) -> CombatState:
+        """
+        Запомнить боевое состояние (здоровье, мана, эффекты, кулдауны, флаги).
+        Статы и прогресс не входят — они не меняются в бою.
+        """
+        return CombatState(
+            self.health,
+            self.mana,
+            tuple(dict(e) for e in self.effects),
+            tuple(self.cooldowns.items()),
+            self.turn_clock,
+            self._has_acted,
+            self._last_incoming_damage,
+            self._last_stand_used,
+            self.battle,
+        )
+
+    def restore(self, state: CombatState) -> None:
+        """Вернуть состояние из snapshot(): O(число эффектов и кулдаунов)."""
+        self.health = state.health
+        self.mana = state.mana
+        self.effects = EffectStore(dict(e) for e in state.status_effects)
+        self._sync_buffs()
+        self.cooldowns = dict(state.cooldowns)
+        self._cd_next = 0
+        self.turn_clock = state.turn_clock
+        self._has_acted = state.has_acted
+        self._last_incoming_damage = state.last_incoming_damage
+        self._last_stand_used = state.last_stand_used
+        self.battle = state.battle
+
     @abstractmethod
     def attack(self, target: Combatant) -> None:
         """
@@ -97,141 +233,152 @@ class Combatant(ABC):
         # Passive: Last Stand — если он у нас есть, ещё не потрачен и удар смертелен
         if (
             not self._last_stand_used
-            and any(e.get("effect") == "survive_one_turn" for e in self.status_effects)
+            and self.effects.mask & _SURVIVE
             and amount >= self.health
         ):
             # убираем эффект и отмечаем, что использовали
-            self.status_effects = [
-                e for e in self.status_effects if e.get("effect") != "survive_one_turn"
-            ]
+            self.effects.discard("survive_one_turn")
             self._last_stand_used = True
             self.health = 1
-            print(f"{self.display_name} активирует Last Stand и остаётся с 1 HP!")
+            emit = self.battle.emit
+            if emit:
+                emit(LastStand(self))
             return
 
         # 3) обычное вычитание
+        was_alive = self.health > 0
         self.health = max(self.health - amount, 0)
-        print(
-            f"{self.display_name} получает {amount} урона, осталось {self.health}/{self.max_health} HP."
-        )
+        emit = self.battle.emit
+        if emit:
+            emit(DamageTaken(self, amount, self.health, self.max_health))
+            if was_alive and self.health == 0:
+                emit(Death(self))
 
     def apply_effect(self, effect: Dict) -> None:
-        """Наложить статус‑эффект."""
-        self.status_effects.append(effect)
-        print(
-            f"{self.display_name} получает эффект: {effect['effect']} "
-            f"на {effect.get('duration', '?')} ходов."
-        )
+        """Наложить статус‑эффект (повторное — по buff_rules.stacking)."""
+        config = self.battle.config
+        rules = config.effect_rules(effect["effect"])
+        duration = effect.get("duration")
+        if duration is not None and rules.duration_decrement != "none":
+            # снимется в конце хода, на котором часы дойдут до expires
+            effect["expires"] = self.turn_clock + max(duration, 1)
+        self.effects.add(effect, config.rules)
+        if rules.stat is not None:
+            self._sync_buffs()
+        emit = self.battle.emit
+        if emit:
+            emit(EffectApplied(self, effect["effect"], effect.get("duration")))
 
     def has_effect(self, effect_name: str) -> bool:
         """Проверить наличие эффекта по имени."""
-        return any(e["effect"] == effect_name for e in self.status_effects)
+        return self.effects.has(effect_name)
+
+    @property
+    def status_effects(self) -> List[Dict]:
+        """Все эффекты списком (для логов и проверок); менять через effects."""
+        return list(self.effects)
 
     def tick_effects(self) -> None:
-        """Декрементировать duration и убирать истёкшие эффекты."""
-        remaining: List[Dict] = []
-        cfgs = CONFIG["battle_rules"]["status_effects"]
-        for effect in self.status_effects:
-            if "duration" in effect:
-                cfg = cfgs.get(effect["effect"], {})
-
-                if (
-                    cfg.get("periodic_damage")
-                    and cfg.get("duration_decrement") == "end_of_turn"
-                ):
-                    remaining.append(effect)
-                    continue
-
-                if cfg.get("duration_decrement") == "none":
-                    remaining.append(effect)
-                    continue
-                effect["duration"] -= 1
-                if effect["duration"] > 0:
-                    remaining.append(effect)
-                else:
-                    print(f"{self.name} теряет эффект: {effect['effect']}")
-            else:
-                remaining.append(effect)
-        self.status_effects = remaining
-
-    def tick_cooldowns(self) -> None:
-        """Декрементировать кулдауны навыков."""
-        new_cd: Dict[str, int] = {}
-        for skill, cd in self.cooldowns.items():
-            if cd > 1:
-                new_cd[skill] = cd - 1
-        self.cooldowns = new_cd
+        """
+        Конец своего хода: часы +1, снимаются эффекты из корзины колеса
+        таймеров с этим номером. Остальные эффекты не трогаются.
+        """
+        self.turn_clock += 1
+        store = self.effects
+        if not store:
+            return
+        fired = store.expire(self.turn_clock)
+        if not fired:
+            return
+        config = self.battle.config
+        if any(config.effect_rules(e["effect"]).stat is not None for e in fired):
+            self._sync_buffs()
+        emit = self.battle.emit
+        if emit:
+            periodic = config.periodic_effects
+            for effect in fired:
+                name = effect["effect"]
+                emit(EffectExpired(self, name, "cured" if name in periodic else "expired"))
+
+    def cooldown_left(self, skill_name: str) -> int:
+        """Сколько своих ходов осталось до готовности навыка."""
+        return max(self.cooldowns.get(skill_name, 0) - self.turn_clock, 0)
 
     def tick_mana(self) -> None:
         """Восстановление маны за ход."""
         if self.base_mana > 0:
             self.mana = min(self.base_mana, self.mana + self.mana_regen)
 
-    def check_trigger(self, skill_name: str, target: Combatant) -> bool:
-        """
-        Проверяет условие применения навыка по его триггеру.
-        """
-        trig_cfgs = CONFIG["battle_rules"]["skill_triggers"]
-        skill_cfg = CONFIG["skills"][skill_name]
-        trig_name = skill_cfg.get("trigger", "always")
-
-        hp_ratio = self.health / self.max_health
-        enemy_hp_ratio = target.health / target.max_health
-
-        if trig_name == "always":
-            return True
-        if trig_name == "on_low_hp":
-            return hp_ratio < trig_cfgs["on_low_hp"]["threshold"]
-        if trig_name == "if_enemy_low_hp":
-            return enemy_hp_ratio < trig_cfgs["if_enemy_low_hp"]["threshold"]
-        if trig_name == "on_fatal_hit":
-            return self._last_incoming_damage >= self.health
-        if trig_name == "if_first":
-            return not self._has_acted
-        return False
+    # ───────────────────────
+    #  Готовность навыков (battle.triggers)
+    # ───────────────────────
+    def skill_book(self) -> SkillBook:
+        """Книга навыков по конфигу текущего боя."""
+        book = self._book
+        if book is None or book.config is not self.battle.config:
+            book = self._book = skill_book(self.battle.config, self.skills)
+            self._cd_next = 0  # биты навыков могли смениться
+        return book
+
+    def start_cooldown(self, skill_name: str, turns: int) -> None:
+        """Навык готов снова через turns своих ходов."""
+        ready_at = self.turn_clock + turns
+        self.cooldowns[skill_name] = ready_at
+        self._cooling |= self.skill_book().bits.get(skill_name, 0)
+        self._cd_next = min(self._cd_next, ready_at)
+
+    def _refresh_cooling(self, book: SkillBook) -> None:
+        # пересчёт только когда часы дошли до ближайшего конца кулдауна
+        clock = self.turn_clock
+        mask, nxt = 0, float("inf")
+        for name, ready_at in self.cooldowns.items():
+            if ready_at > clock:
+                mask |= book.bits.get(name, 0)
+                nxt = min(nxt, ready_at)
+        self._cooling = mask
+        self._cd_next = nxt
+
+    def trigger_state(self, target: Combatant) -> int:
+        """Биты выполненных триггеров (ALWAYS, SELF_LOW, …) против target."""
+        book = self.skill_book()
+        state = ALWAYS
+        if self.health / self.max_health < book.low_hp:
+            state |= SELF_LOW
+        if target.health / target.max_health < book.enemy_low_hp:
+            state |= ENEMY_LOW
+        if self._last_incoming_damage >= self.health:
+            state |= FATAL
+        if not self._has_acted:
+            state |= FIRST
+        return state
+
+    def ready_skills(self, target: Combatant) -> int:
+        """Битсет готовых навыков: триггер выполнен, не на CD, хватает маны."""
+        book = self.skill_book()
+        if self.turn_clock >= self._cd_next:
+            self._refresh_cooling(book)
+        return (
+            book.by_state[self.trigger_state(target)]
+            & ~self._cooling
+            & book.affordable(self.mana)
+        )
 
     def can_use(self, skill_name: str, target: Combatant) -> bool:
         """Проверить, доступен ли навык (есть ли, не на CD, хватает маны, триггер)."""
-        if skill_name not in self.skills:
-            return False
-        cfg = CONFIG["skills"][skill_name]
-        if self.cooldowns.get(skill_name, 0) > 0:
-            return False
-        cost = cfg.get("mana_cost", 0)
-        if cost and self.mana < cost:
-            return False
-        return self.check_trigger(skill_name, target)
+        bit = self.skill_book().bits.get(skill_name, 0)
+        return bool(bit and self.ready_skills(target) & bit)
 
     def take_turn(self, opponent: Combatant) -> None:
         """
-        Выполнить ход:
-          1. tick_cooldowns, tick_mana
-          2. start_of_turn
-          3. ai_take_turn
-          4. apply_extra_turn
-          5. end_of_turn
-          6. отметить _has_acted
+        Выполнить ход через диспетчер ИИ (он же ведёт реген маны, эффекты
+        начала и конца хода и часы хода), затем дополнительные ходы, пока
+        наложен extra_turn.
         """
-
-        self.tick_cooldowns()
-        self.tick_mana()
-
-        # стартовые эффекты (яд, горение и т.п.)
-        start_of_turn(self)
-
-        # ход ИИ
         from ..battle.dispatcher import take_turn as ai_take_turn
 
         ai_take_turn(self, opponent)
-
-        # дополнительный ход
-        if apply_extra_turn(self):
-            self.take_turn(opponent)
-
-        # концевые эффекты
-        end_of_turn(self)
-
-        self._has_acted = True
+        while self.is_alive and apply_extra_turn(self):
+            ai_take_turn(self, opponent)
 
     @property
     def display_name(self) -> str:
@@ -0,0 +1,129 @@
+# src/my_game/base/stats.py
+"""
+Слоистые модификаторы статов участника.
+
+Итог стата = Σ прибавок всех слоёв × (1 + Σ процентов). Слои:
+  • base   — статы при создании (класс + рост до уровня + стат‑пассивки);
+  • growth — прибавки level_up;
+  • gear   — экипировка (источник — предмет);
+  • buffs  — эффекты со `stat` в battle_rules.status_effects;
+  • auras  — ауры отряда на бой.
+
+Итог лежит в обычном атрибуте участника (pc.strength, pc.dodge_chance…),
+так что calc_damage и hit_chance читают его простой загрузкой атрибута.
+Изменение модификаторов помечает задетые статы грязными, и в конце той же
+операции пересчитываются только они; затем участник получает
+stats_changed() (устаревают кэши урона).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional
+
+if TYPE_CHECKING:
+    from .combatant import Combatant
+
+LAYERS = ("base", "growth", "gear", "buffs", "auras")
+STATS = (
+    "max_health",
+    "strength",
+    "agility",
+    "intelligence",
+    "defense",
+    "accuracy",
+    "crit_chance",
+    "dodge_chance",
+    "base_mana",
+    "mana_regen",
+    "magic_damage",
+)
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Modifier:
+    """Один модификатор: value — прибавка или, при percent, доля (+0.08 = +8 %)."""
+
+    stat: str
+    value: float
+    layer: str = "gear"
+    percent: bool = False
+    source: object = None  # предмет, эффект… — по нему модификатор снимают
+
+
+class StatStack:
+    """Модификаторы статов одного участника и пересчёт их итогов."""
+
+    __slots__ = ("owner", "_mods")
+
+    def __init__(self, owner: "Combatant") -> None:
+        self.owner = owner
+        # стат → модификаторы в порядке наложения (первым — base)
+        self._mods: Dict[str, List[Modifier]] = {
+            stat: [Modifier(stat, getattr(owner, stat), "base")] for stat in STATS
+        }
+
+    def copy_for(self, owner: "Combatant") -> "StatStack":
+        """Тот же набор модификаторов для другого участника (клон монстра)."""
+        other = object.__new__(StatStack)
+        other.owner = owner
+        other._mods = {stat: list(mods) for stat, mods in self._mods.items()}
+        return other
+
+    # ───────────────────────
+    #  Запросы
+    # ───────────────────────
+    def value(self, stat: str) -> float:
+        """Итог стата по всем слоям."""
+        mods = self._mods[stat]
+        flat = sum(m.value for m in mods if not m.percent)
+        pct = sum(m.value for m in mods if m.percent)
+        if not pct:
+            return flat
+        if isinstance(mods[0].value, int):
+            # целые статы остаются целыми (округление как у пассивок)
+            return int(flat * (1.0 + pct) + 0.5)
+        return flat * (1.0 + pct)
+
+    def layer(self, layer: str) -> List[Modifier]:
+        return [m for mods in self._mods.values() for m in mods if m.layer == layer]
+
+    # ───────────────────────
+    #  Изменение (каждый вызов — один пересчёт задетых статов)
+    # ───────────────────────
+    def add(self, *mods: Modifier) -> None:
+        self._apply((), mods)
+
+    def remove(self, source: object) -> None:
+        """Снять все модификаторы этого источника."""
+        self._apply(self._of_source(source), ())
+
+    def replace(self, source: Optional[object], mods: Iterable[Modifier]) -> None:
+        """Снять модификаторы source (если есть) и добавить mods — одним пересчётом."""
+        self._apply(self._of_source(source) if source is not None else (), mods)
+
+    def replace_layer(self, layer: str, mods: Iterable[Modifier]) -> None:
+        """Заменить весь слой (баффы, ауры) новым набором."""
+        self._apply(self.layer(layer), mods)
+
+    def _of_source(self, source: object) -> List[Modifier]:
+        return [m for mods in self._mods.values() for m in mods if m.source is source]
+
+    def _apply(self, old: Iterable[Modifier], new: Iterable[Modifier]) -> None:
+        dirty = set()
+        for m in old:
+            self._mods[m.stat].remove(m)
+            dirty.add(m.stat)
+        for m in new:
+            if m.stat not in self._mods:
+                raise ValueError(f"Неизвестный стат {m.stat!r}")
+            if m.layer not in LAYERS:
+                raise ValueError(f"Неизвестный слой {m.layer!r}")
+            self._mods[m.stat].append(m)
+            dirty.add(m.stat)
+        if not dirty:
+            return
+        owner = self.owner
+        for stat in dirty:
+            setattr(owner, stat, self.value(stat))
+        owner.stats_changed()
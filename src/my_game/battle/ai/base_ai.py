@@ -1,6 +1,6 @@
-from typing import List, TYPE_CHECKING, Optional, Tuple, Union
+from typing import ClassVar, Dict, List, TYPE_CHECKING, Optional, Tuple, Union
 
-from my_game.config import CONFIG
+from my_game.config_defs import AIConfig, ConfigError, DEFAULT_AI_SKILL, MonsterTemplate
 
 if TYPE_CHECKING:
     from my_game.base.combatant import Combatant
@@ -9,24 +9,41 @@ if TYPE_CHECKING:
 class BaseAI:
     """Базовый интерфейс для всех AI‑классов."""
 
-    def __init__(self, actor: "Combatant", cfg: dict):
+    # навык → поля AISkillConfig, без которых choose_action не работает
+    REQUIRES: ClassVar[Dict[str, Tuple[str, ...]]] = {}
+
+    def __init__(self, actor: "Combatant", cfg: AIConfig):
         # actor — это тот самый Combatant, от имени которого играет AI
-        # cfg — это содержимое секции CONFIG["ai"][<класс>], загруженное из ai_warrior.yaml
+        # cfg — скомпилированный AIConfig роли (из ai_<роль>.yaml)
         self.actor = actor
         self.cfg = cfg
+        # бой, на который создан AI (dispatcher пересоздаёт AI в новом бою)
+        self.battle = actor.battle
+        # угроза врагов за этот бой: (шаблон, accuracy, interval) → threat
+        self._threat: Dict[Tuple, float] = {}
+
+    @classmethod
+    def check_config(cls, cfg: AIConfig) -> None:
+        """Проверить, что в cfg есть всё из REQUIRES (вызывается при загрузке)."""
+        for skill, keys in cls.REQUIRES.items():
+            scfg = cfg.skills.get(skill)
+            if scfg is None:
+                raise ConfigError(f"ai.{cfg.role}.skills: нет секции {skill!r}")
+            missing = [k for k in keys if getattr(scfg, k) is None]
+            if missing:
+                raise ConfigError(f"ai.{cfg.role}.skills.{skill}: нет ключей {missing}")
 
     def cd(self, skill_name: str) -> float:
         """Оставшееся время восстановления навыкa."""
-        return float(self.actor.cooldowns.get(skill_name, 0.0))
+        return float(self.actor.cooldown_left(skill_name))
 
     def cd_factor(self, skill_name: str) -> float:
         """
         Учитывает готовность + вес из YAML:
-          weight = cfg["skills"][skill_name]["cd_weight"]
+          weight = cfg.skills[skill_name].cd_weight
           factor = weight * (1 / (cd + 1))
         """
-        scfg = self.cfg["skills"].get(skill_name, {})
-        weight = scfg.get("cd_weight", 1.0)
+        weight = self.cfg.skills.get(skill_name, DEFAULT_AI_SKILL).cd_weight
         cd_time = self.cd(skill_name)
         return weight * (1.0 / (cd_time + 1.0))
 
@@ -43,33 +60,41 @@ class BaseAI:
         """
         Threat = DPS (base_damage × accuracy / attack_interval),
         скорректированное по resistances/weaknesses и tag_weights из cfg.
+
+        Считается один раз за бой на каждый (шаблон, accuracy, interval):
+        однотипные монстры делят значение, а смена учитываемого стата
+        даёт новый ключ и пересчёт.
         """
-        t = self.cfg["threat"]
-        key = enemy.name.upper()
-        tpl = CONFIG["monsters"]["templates"].get(key, {})
-        base = CONFIG["monsters"]["base_damage"].get(key, 0)
+        t = self.cfg.threat
+        tpl = getattr(enemy, "template", None)
+        if tpl is None:
+            # не монстр из шаблона — урона по конфигу нет
+            return 0.0
 
         # если включено, читаем accuracy, иначе 1.0
-        acc = getattr(enemy, "accuracy", 1.0) if t.get("use_accuracy", False) else 1.0
+        acc = getattr(enemy, "accuracy", 1.0) if t.use_accuracy else 1.0
         # если включено, читаем attack_interval, иначе 1.0
-        interval = (
-            getattr(enemy, "attack_interval", 1.0)
-            if t.get("use_interval", False)
-            else 1.0
-        )
-        dps = base * acc / interval
+        interval = getattr(enemy, "attack_interval", 1.0) if t.use_interval else 1.0
+
+        key = (tpl, acc, interval)
+        threat = self._threat.get(key)
+        if threat is None:
+            threat = self._threat[key] = self._threat_of(tpl, acc, interval)
+        return threat
+
+    def _threat_of(self, tpl: MonsterTemplate, acc: float, interval: float) -> float:
+        t = self.cfg.threat
+        dps = tpl.base_damage * acc / interval
 
         # резисты/уязвимости к физическому
-        if "physical" in tpl.get("resistances", []):
-            dps *= t.get("resist_modifier", 1.0)
-        if "physical" in tpl.get("weaknesses", []):
-            dps *= t.get("weak_modifier", 1.0)
+        if "physical" in tpl.resistances:
+            dps *= t.resist_modifier
+        if "physical" in tpl.weaknesses:
+            dps *= t.weak_modifier
 
         # тэги
-        for tag in tpl.get("tags", []):
-            dps *= t.get("tag_weights", {}).get(
-                tag, t.get("tag_weights", {}).get("default", 1.0)
-            )
+        for tag in tpl.tags:
+            dps *= self.cfg.tag_weight(tag)
 
         return dps
 
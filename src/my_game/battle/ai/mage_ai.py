@@ -2,11 +2,10 @@
 
 import logging
 from typing import Tuple, Union, List, Optional
-from random import sample
 
 from my_game.battle.ai.base_ai import BaseAI
 from my_game.base.combatant import Combatant
-from my_game.config import CONFIG
+from my_game.config_defs import AIConfig
 
 logger = logging.getLogger(__name__)
 
@@ -20,11 +19,19 @@ class MageAI(BaseAI):
         "Meteor",
         "Time Warp",
     ]
-
-    def __init__(self, actor: Combatant, cfg: dict):
+    REQUIRES = {
+        "Fireball": (),
+        "Magic Barrier": ("hp_pct",),
+        "Chain Lightning": (),
+        "Mana Drain": ("mana_threshold",),
+        "Meteor": (),
+        "Time Warp": (),
+    }
+
+    def __init__(self, actor: Combatant, cfg: AIConfig):
         """
         actor — Combatant, за которого играет ИИ.
-        cfg — секция CONFIG['ai']['mage'] из ai_mage.yaml.
+        cfg — AIConfig роли mage из ai_mage.yaml.
         """
         super().__init__(actor, cfg)
 
@@ -34,23 +41,24 @@ class MageAI(BaseAI):
         enemies: List[Combatant],
     ) -> Tuple[Optional[str], Union[Combatant, List[Combatant]]]:
         user = self.actor
+        skills = user.battle.config.skills
         cfg_ai = self.cfg
-        skills_cfg = cfg_ai["skills"]
+        skills_cfg = cfg_ai.skills
 
         # 0) Если нам пора поставить щит — делаем это сразу
         mb_cfg = skills_cfg["Magic Barrier"]
-        if mb_cfg["enabled"] and user.can_use("Magic Barrier", primary):
+        if mb_cfg.enabled and user.can_use("Magic Barrier", primary):
             hp_pct = user.health / user.max_health if user.max_health else 0.0
-            if hp_pct < mb_cfg["hp_pct"]:
+            if hp_pct < mb_cfg.hp_pct:
                 logger.debug(
-                    f"{user.name}: HP={user.health}/{user.max_health} < {mb_cfg['hp_pct']*100}% — ставим Magic Barrier"
+                    f"{user.name}: HP={user.health}/{user.max_health} < {mb_cfg.hp_pct*100}% — ставим Magic Barrier"
                 )
                 return "Magic Barrier", user
 
         # вспомогательные функции
-        cdf = lambda name: self.cd_factor(name) * skills_cfg[name].get("cd_weight", 1.0)
+        cdf = lambda name: self.cd_factor(name) * skills_cfg[name].cd_weight
         mana_future = user.mana + (
-            user.mana_regen if cfg_ai["resource"]["consider_mana_regen"] else 0.0
+            user.mana_regen if cfg_ai.consider_mana_regen else 0.0
         )
 
         utils: dict[str, float] = {}
@@ -58,8 +66,8 @@ class MageAI(BaseAI):
         # 1) Fireball — прямой урон
         name = "Fireball"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
-            power = CONFIG["skills"][name]["power"]
+        if scfg.enabled and user.can_use(name, primary):
+            power = skills[name].power
             est = user.intelligence * power
             utils[name] = est * cdf(name)
         else:
@@ -69,13 +77,13 @@ class MageAI(BaseAI):
         name = "Chain Lightning"
         scfg = skills_cfg[name]
         if (
-            scfg["enabled"]
+            scfg.enabled
             and user.can_use(name, primary)
-            and len(enemies) >= scfg["min_enemies"]
+            and len(enemies) >= scfg.min_enemies
         ):
-            main_p = CONFIG["skills"][name]["power"] * user.intelligence
+            main_p = skills[name].power * user.intelligence
             sec_p = (
-                CONFIG["skills"][name].get("secondary_power", 0.0) * user.intelligence
+                skills[name].secondary_power * user.intelligence
             )
             utils[name] = (main_p + sec_p) * cdf(name)
         else:
@@ -85,11 +93,11 @@ class MageAI(BaseAI):
         name = "Meteor"
         scfg = skills_cfg[name]
         if (
-            scfg["enabled"]
+            scfg.enabled
             and user.can_use(name, primary)
-            and len(enemies) >= scfg["min_enemies"]
+            and len(enemies) >= scfg.min_enemies
         ):
-            power = CONFIG["skills"][name]["power"]
+            power = skills[name].power
             utils[name] = user.intelligence * power * len(enemies) * cdf(name)
         else:
             utils[name] = 0.0
@@ -97,9 +105,9 @@ class MageAI(BaseAI):
         # 4) Mana Drain — восстанавливаем ману, если мало
         name = "Mana Drain"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
-            if user.mana < user.base_mana * scfg["mana_threshold"]:
-                power = CONFIG["skills"][name]["power"]
+        if scfg.enabled and user.can_use(name, primary):
+            if user.mana < user.base_mana * scfg.mana_threshold:
+                power = skills[name].power
                 recovered = user.intelligence * power
                 utils[name] = recovered * cdf(name)
             else:
@@ -110,8 +118,8 @@ class MageAI(BaseAI):
         # 5) Time Warp — utility: extra turn
         name = "Time Warp"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
-            uw = scfg.get("utility_weight", 1.0)
+        if scfg.enabled and user.can_use(name, primary):
+            uw = scfg.utility_weight
             utils[name] = user.intelligence * uw * cdf(name)
         else:
             utils[name] = 0.0
@@ -125,12 +133,12 @@ class MageAI(BaseAI):
             return None, primary
 
         # формируем цели по таргет-моде
-        mode = CONFIG["skills"][best_skill].get("target", "enemy")
+        mode = skills[best_skill].target
         if mode == "all_enemies":
             return best_skill, enemies
         if mode == "two_random_enemies":
             cnt = min(2, len(enemies))
-            return best_skill, sample(enemies, cnt)
+            return best_skill, user.battle.rng.sample(enemies, cnt)
         if mode == "team":
             return best_skill, user.get_allies()
         if mode == "ally":
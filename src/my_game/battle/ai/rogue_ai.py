@@ -2,18 +2,18 @@
 
 import logging
 from typing import Tuple, Union, List, Optional
-from random import sample
 
 from my_game.battle.ai.base_ai import BaseAI
 from my_game.base.combatant import Combatant
-from my_game.config import CONFIG
+from my_game.config_defs import AIConfig
 
 logger = logging.getLogger(__name__)
 
 
 def base_dps(enemy: Combatant) -> float:
-    """Приблизительный DPS врага по конфигу."""
-    return CONFIG["monsters"]["base_damage"].get(enemy.name, 0.0)
+    """Приблизительный DPS врага по его шаблону."""
+    tpl = getattr(enemy, "template", None)
+    return tpl.base_damage if tpl else 0.0
 
 
 def pick_target(
@@ -29,7 +29,7 @@ def pick_target(
     poisoned = getattr(user, "_poison_mark", None)
 
     if skill == "Assassinate":
-        power = CONFIG["skills"]["Assassinate"]["power"]
+        power = user.battle.config.skills["Assassinate"].power
         est = user.strength * power
         low = [e for e in enemies if e.health < est * 0.9]
         if low:
@@ -64,11 +64,18 @@ class RogueAI(BaseAI):
         "Shadowstep",
         "Backstab",
     ]
-
-    def __init__(self, actor: Combatant, cfg: dict):
+    REQUIRES = {
+        "Smoke Bomb": (),
+        "Poisoned Blade": (),
+        "Assassinate": ("hp_pct",),
+        "Shadowstep": ("hp_pct",),
+        "Backstab": (),
+    }
+
+    def __init__(self, actor: Combatant, cfg: AIConfig):
         """
         actor — Combatant, от имени которого играет ИИ.
-        cfg — секция CONFIG["ai"]["rogue"] из ai_rogue.yaml.
+        cfg — AIConfig роли rogue из ai_rogue.yaml.
         """
         super().__init__(actor, cfg)
 
@@ -78,32 +85,33 @@ class RogueAI(BaseAI):
         enemies: List[Combatant],
     ) -> Tuple[Optional[str], Union[Combatant, List[Combatant]]]:
         user = self.actor
+        skills = user.battle.config.skills
         cfg_ai = self.cfg
-        skills_cfg = cfg_ai["skills"]
+        skills_cfg = cfg_ai.skills
 
         hp_pct = user.health / user.max_health if user.max_health else 0.0
 
         # 1) Assassinate — финишер
         asc = "Assassinate"
         asc_cfg = skills_cfg[asc]
-        if asc_cfg["enabled"] and user.can_use(asc, primary):
+        if asc_cfg.enabled and user.can_use(asc, primary):
             tgt = pick_target(asc, enemies, user, primary)
-            if tgt.health / tgt.max_health < asc_cfg["hp_pct"]:
+            if tgt.health / tgt.max_health < asc_cfg.hp_pct:
                 logger.debug(f"{user.name}: Assassinate → {tgt.name}")
                 return asc, tgt
 
         # 2) Shadowstep — спасение если опасно или мало HP
         ss = "Shadowstep"
         ss_cfg = skills_cfg[ss]
-        if ss_cfg["enabled"] and user.can_use(ss, primary):
-            if hp_pct < ss_cfg.get("hp_pct", 0.5) or need_shadowstep(user, enemies):
+        if ss_cfg.enabled and user.can_use(ss, primary):
+            if hp_pct < ss_cfg.hp_pct or need_shadowstep(user, enemies):
                 logger.debug(f"{user.name}: Shadowstep (HP {hp_pct:.0%})")
                 return ss, user
 
         # Подготовка утилит: factor по кулдауну и вес
-        cdf = lambda name: self.cd_factor(name) * skills_cfg[name].get("cd_weight", 1.0)
+        cdf = lambda name: self.cd_factor(name) * skills_cfg[name].cd_weight
         mana_future = user.mana + (
-            user.mana_regen if cfg_ai["resource"]["consider_mana_regen"] else 0.0
+            user.mana_regen if cfg_ai.consider_mana_regen else 0.0
         )
 
         utils: dict[str, float] = {}
@@ -111,11 +119,11 @@ class RogueAI(BaseAI):
         # 3) Smoke Bomb — массовый бафф уклонения
         sb = "Smoke Bomb"
         sb_cfg = skills_cfg[sb]
-        if sb_cfg["enabled"] and user.can_use(sb, primary):
-            if len(enemies) >= sb_cfg.get("min_enemies", 0):
+        if sb_cfg.enabled and user.can_use(sb, primary):
+            if len(enemies) >= sb_cfg.min_enemies:
                 allies = user.get_allies()
                 # ценность — power × число союзников
-                val = CONFIG["skills"][sb]["power"] * len(allies)
+                val = skills[sb].power * len(allies)
                 utils[sb] = val * cdf(sb)
             else:
                 utils[sb] = 0.0
@@ -125,10 +133,10 @@ class RogueAI(BaseAI):
         # 4) Poisoned Blade — ставим яд
         pb = "Poisoned Blade"
         pb_cfg = skills_cfg[pb]
-        if pb_cfg["enabled"] and user.can_use(pb, primary):
+        if pb_cfg.enabled and user.can_use(pb, primary):
             tgt = pick_target(pb, enemies, user, primary)
             if not tgt.has_effect("poison"):
-                power = CONFIG["skills"][pb]["power"]
+                power = skills[pb].power
                 utils[pb] = tgt.max_health * power * cdf(pb)
             else:
                 utils[pb] = 0.0
@@ -138,8 +146,8 @@ class RogueAI(BaseAI):
         # 5) Backstab — сильный удар по самой опасной цели
         bs = "Backstab"
         bs_cfg = skills_cfg[bs]
-        if bs_cfg["enabled"] and user.can_use(bs, primary):
-            power = CONFIG["skills"][bs]["power"]
+        if bs_cfg.enabled and user.can_use(bs, primary):
+            power = skills[bs].power
             utils[bs] = user.strength * power * cdf(bs)
         else:
             utils[bs] = 0.0
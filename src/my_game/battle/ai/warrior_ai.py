@@ -5,7 +5,7 @@ from typing import Tuple, Union, List, Optional
 
 from my_game.battle.ai.base_ai import BaseAI
 from my_game.base.combatant import Combatant
-from my_game.config import CONFIG
+from my_game.config_defs import AIConfig
 
 logger = logging.getLogger(__name__)
 
@@ -18,11 +18,18 @@ class WarriorAI(BaseAI):
         "Taunt",
         "Whirlwind Slash",
     ]
-
-    def __init__(self, actor: Combatant, cfg: dict):
+    REQUIRES = {
+        "Battle Roar": ("strength_pct",),
+        "Iron Will": ("hp_pct", "big_hit_pct", "shield_pct"),
+        "Shield Bash": ("base_str_pct", "danger_dps_thresh", "danger_mult"),
+        "Taunt": ("acc_threshold",),
+        "Whirlwind Slash": ("whirl_str_pct",),
+    }
+
+    def __init__(self, actor: Combatant, cfg: AIConfig):
         """
         actor — Combatant, от имени которого играет ИИ.
-        cfg — содержимое секции CONFIG["ai"]["warrior"], загруженное из ai_warrior.yaml.
+        cfg — AIConfig роли warrior, собранный из ai_warrior.yaml.
         """
         super().__init__(actor, cfg)
 
@@ -32,15 +39,14 @@ class WarriorAI(BaseAI):
         enemies: List[Combatant],
     ) -> Tuple[Optional[str], Union[Combatant, List[Combatant]]]:
         user = self.actor
+        skills = user.battle.config.skills
         cfg_ai = self.cfg
-        skills_cfg = cfg_ai["skills"]
-        # секция threat и глобальные веса тегов
-        tag_weights = cfg_ai.get("tag_weights", {})
+        skills_cfg = cfg_ai.skills
 
         # утилити-функции
         cdf = lambda name: self.cd_factor(name)
         mana_future = user.mana + (
-            user.mana_regen if cfg_ai["resource"]["consider_mana_regen"] else 0.0
+            user.mana_regen if cfg_ai.consider_mana_regen else 0.0
         )
 
         utils: dict[str, float] = {}
@@ -49,17 +55,17 @@ class WarriorAI(BaseAI):
         name = "Battle Roar"
         scfg = skills_cfg[name]
         if (
-            scfg["enabled"]
+            scfg.enabled
             and user.can_use(name, primary)
             and not user.has_effect("increase_strength")
         ):
-            min_enemies = scfg.get("min_enemies", 0)
-            boss_pct = scfg.get("boss_hp_pct", float("inf"))
+            min_enemies = scfg.min_enemies
+            boss_pct = scfg.boss_hp_pct
             is_boss = any(e.max_health > user.max_health * boss_pct for e in enemies)
             if len(enemies) >= min_enemies or is_boss:
                 allies = user.get_allies()
                 utils[name] = (
-                    user.strength * scfg["strength_pct"] * len(allies) * cdf(name)
+                    user.strength * scfg.strength_pct * len(allies) * cdf(name)
                 )
             else:
                 utils[name] = 0.0
@@ -69,12 +75,12 @@ class WarriorAI(BaseAI):
         # 2) Iron Will
         name = "Iron Will"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
+        if scfg.enabled and user.can_use(name, primary):
             hp_pct = user.health / user.max_health if user.max_health else 0.0
             last_dmg = user._last_incoming_damage
-            big_hit = last_dmg >= scfg["big_hit_pct"] * user.max_health
-            if hp_pct < scfg["hp_pct"] or big_hit:
-                utils[name] = user.max_health * scfg["shield_pct"] * cdf(name)
+            big_hit = last_dmg >= scfg.big_hit_pct * user.max_health
+            if hp_pct < scfg.hp_pct or big_hit:
+                utils[name] = user.max_health * scfg.shield_pct * cdf(name)
             else:
                 utils[name] = 0.0
         else:
@@ -83,12 +89,12 @@ class WarriorAI(BaseAI):
         # 3) Shield Bash
         name = "Shield Bash"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
+        if scfg.enabled and user.can_use(name, primary):
             danger = any(
-                self.compute_threat(e) >= scfg["danger_dps_thresh"] for e in enemies
+                self.compute_threat(e) >= scfg.danger_dps_thresh for e in enemies
             )
-            base = user.strength * scfg["base_str_pct"]
-            mult = scfg["danger_mult"] if danger else 1.0
+            base = user.strength * scfg.base_str_pct
+            mult = scfg.danger_mult if danger else 1.0
             utils[name] = base * mult * cdf(name)
         else:
             utils[name] = 0.0
@@ -96,12 +102,12 @@ class WarriorAI(BaseAI):
         # 4) Taunt
         name = "Taunt"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
+        if scfg.enabled and user.can_use(name, primary):
             viable = [
                 e
                 for e in enemies
-                if not e.has_effect(scfg["provoke_effect"])
-                and getattr(e, "accuracy", 0.0) > scfg["acc_threshold"]
+                if not e.has_effect(scfg.provoke_effect)
+                and getattr(e, "accuracy", 0.0) > scfg.acc_threshold
             ]
             if viable:
                 avg = sum(self.compute_threat(e) for e in viable) / len(viable)
@@ -114,13 +120,13 @@ class WarriorAI(BaseAI):
         # 5) Whirlwind Slash
         name = "Whirlwind Slash"
         scfg = skills_cfg[name]
-        if scfg["enabled"] and user.can_use(name, primary):
-            if len(enemies) >= scfg.get("min_enemies", 0):
-                mana_cost = CONFIG["skills"][name].get("mana_cost", 0)
+        if scfg.enabled and user.can_use(name, primary):
+            if len(enemies) >= scfg.min_enemies:
+                mana_cost = skills[name].mana_cost
                 if mana_future >= mana_cost:
-                    aoe = user.strength * scfg["whirl_str_pct"] * len(enemies)
+                    aoe = user.strength * scfg.whirl_str_pct * len(enemies)
                     bash_base = (
-                        user.strength * skills_cfg["Shield Bash"]["base_str_pct"]
+                        user.strength * skills_cfg["Shield Bash"].base_str_pct
                     )
                     utils[name] = max(0.0, aoe - bash_base) * cdf(name)
                 else:
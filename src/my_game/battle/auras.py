@@ -0,0 +1,67 @@
+# src/my_game/battle/auras.py
+"""
+Ауры и синергии отряда (battle_rules.auras.synergy_rules).
+
+Правила проверяются по живому составу команды один раз в начале боя, и
+их модификаторы кладутся в слой auras статов каждого живого участника.
+Дальше в бою ауры ничего не стоят: урон читает обычный атрибут стата.
+Состав пересматривается только когда он меняется — кто‑то погиб или
+присоединился (призыв): PartyAuras.update() сравнивает размер команды и
+число живых и пересчитывает правила лишь при их изменении.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from typing import TYPE_CHECKING, List, Sequence, Tuple
+
+from ..base.stats import Modifier
+from ..config_defs import AuraRule, GameConfig
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+
+def active_rules(team: Sequence["Combatant"], config: GameConfig) -> List[AuraRule]:
+    """Правила, выполненные живым составом команды."""
+    counts = Counter(
+        c.char_class.name
+        for c in team
+        if c.is_alive and getattr(c, "char_class", None) is not None
+    )
+    return [rule for rule in config.auras if rule.holds(counts)]
+
+
+def resolve_auras(team: Sequence["Combatant"], config: GameConfig) -> List[AuraRule]:
+    """Пересчитать слой auras у всей команды; вернуть действующие правила."""
+    rules = active_rules(team, config) if config.auras else []
+    for c in team:
+        if not rules and c._stats is None:
+            continue  # нечего ни ставить, ни снимать
+        mods = [
+            Modifier(rule.stat, rule.value, "auras", rule.percent, rule) for rule in rules
+        ]
+        c.stats.replace_layer("auras", mods if c.is_alive else ())
+    return rules
+
+
+class PartyAuras:
+    """Ауры одной команды на время боя."""
+
+    __slots__ = ("team", "config", "rules", "_shape")
+
+    def __init__(self, team: Sequence["Combatant"], config: GameConfig) -> None:
+        self.team = team
+        self.config = config
+        self.rules: List[AuraRule] = []
+        self._shape: Tuple[int, int] = (-1, -1)
+        self.update()
+
+    def update(self) -> bool:
+        """Пересчитать, если состав изменился. True — если пересчитали."""
+        shape = (len(self.team), sum(1 for c in self.team if c.is_alive))
+        if shape == self._shape:
+            return False
+        self._shape = shape
+        self.rules = resolve_auras(self.team, self.config)
+        return True
@@ -0,0 +1,62 @@
+# src/my_game/battle/context.py
+"""
+Контекст боя — всё, что разделяют участники одного сражения.
+Каждый бой получает свой контекст, поэтому параллельные бои не мешают друг другу.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import TYPE_CHECKING, Callable, Optional
+
+from .events import BattleEvent, EventSink, NULL_SINK
+from ..config import current, on_reload
+from ..config_defs import GameConfig
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+
+class BattleContext:
+    """
+    • `sink` — приёмник событий боя
+    • `emit` — sink.emit или None, если приёмник выключен. Движок проверяет
+      `if emit:` перед созданием события, так что NullSink почти ничего не стоит.
+    • `seed`, `rng` — собственный генератор боя. Все броски боя идут через
+      него, поэтому бой воспроизводится бит‑в‑бит по `seed`.
+    • `config` — снимок конфига, взятый при создании. Горячая перезагрузка
+      его не трогает: бой доигрывается по тем правилам, с которыми начался.
+    """
+
+    __slots__ = ("sink", "emit", "seed", "rng", "config")
+
+    def __init__(
+        self,
+        sink: Optional[EventSink] = None,
+        seed: Optional[int] = None,
+        config: Optional[GameConfig] = None,
+    ) -> None:
+        self.sink: EventSink = sink if sink is not None else NULL_SINK
+        self.emit: Optional[Callable[[BattleEvent], None]] = (
+            self.sink.emit if self.sink.enabled else None
+        )
+        # без явного зерна берём случайное, но запоминаем его для повтора
+        self.seed: int = seed if seed is not None else random.getrandbits(64)
+        self.rng = random.Random(self.seed)
+        self.config: GameConfig = config if config is not None else current()
+
+    def join(self, *combatants: "Combatant") -> None:
+        """Привязать участников к этому бою."""
+        for c in combatants:
+            c.battle = self
+
+
+# Контекст «вне боя»: события никуда не идут, конфиг всегда текущий
+DEFAULT_CONTEXT = BattleContext()
+
+
+def _follow_reload(snap: GameConfig) -> None:
+    DEFAULT_CONTEXT.config = snap
+
+
+on_reload(_follow_reload)
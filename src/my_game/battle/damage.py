@@ -5,26 +5,16 @@
 """
 
 import math
-import random
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence, Tuple
 
 from .enums import Element, DamageSource, CritType
-from ..config import CONFIG
+from ..config_defs import BattleRules, GameConfig
 
 if TYPE_CHECKING:
     from ..base.combatant import Combatant
 
-# — кешируем нужные конфиги
-_cfg = CONFIG["battle_rules"]
-_hit_cfg = _cfg["hit_chance"]
-_dmg_cfg = _cfg["damage_rules"]
-_def_cfg = _cfg["defense"]
-_elem_cfg = _cfg["elements"]
-_level_coeff = _dmg_cfg["level_coeff"]
-_variance = _dmg_cfg["variance"]
-_crit_mul = _dmg_cfg["crit"]["multiplier"]
-_min_floor = _dmg_cfg["min_damage"]
-_MON_COEFFS = CONFIG["monsters"]["coeffs"]
+# Все числа берутся из снимка конфига боя (attacker.battle.config), поэтому
+# горячая перезагрузка не задевает уже идущие бои.
 
 
 def _logistic(x: float, x0: float, k: float) -> float:
@@ -38,20 +28,216 @@ def hit_chance(attacker: "Combatant", defender: "Combatant") -> float:
       - умножение на accuracy и (1 − dodge_chance)
       - ограничение [min, max]
     """
-    delta = (attacker.agility - defender.agility) / _hit_cfg["scale"]
-    p = _logistic(delta, _hit_cfg["logistic"]["x0"], _hit_cfg["logistic"]["k"])
+    r = attacker.battle.config.rules
+    delta = (attacker.agility - defender.agility) / r.hit_scale
+    p = _logistic(delta, r.hit_x0, r.hit_k)
     p *= attacker.accuracy * (1.0 - defender.dodge_chance)
-    return max(_hit_cfg["clamp"]["min"], min(p, _hit_cfg["clamp"]["max"]))
+    return max(r.hit_min, min(p, r.hit_max))
 
 
 def check_hit(attacker: "Combatant", defender: "Combatant") -> bool:
     """
     Функция-обёртка: сохраняет последний шанс в attacker._last_hit
-    и возвращает True/False по случайному броску.
+    и возвращает True/False по броску генератора боя.
     """
-    chance = hit_chance(attacker, defender)
+    chance = matchup(attacker, defender).hit
     attacker._last_hit = chance
-    return random.random() < chance
+    return attacker.battle.rng.random() < chance
+
+
+def damage_coeffs(
+    attacker: "Combatant", config: Optional[GameConfig] = None
+) -> Tuple[float, float, float]:
+    """(phys_coeff, mag_coeff, level_coeff) атакующего — класса или вида монстра."""
+    cfg = config or attacker.battle.config
+    species = getattr(attacker, "species", None)
+    if species:
+        tpl = cfg.monsters.get(species)
+        return (
+            tpl.phys_coeff if tpl else 1.0,
+            tpl.mag_coeff if tpl else 1.0,
+            cfg.rules.level_coeff_monster,
+        )
+    cc = getattr(attacker, "char_class", None)
+    cdef = cfg.classes.get(cc.name) if cc else None
+    return (
+        cdef.phys_coeff if cdef else 1.0,
+        cdef.mag_coeff if cdef else 1.0,
+        cfg.rules.level_coeff_player,
+    )
+
+
+def offense_rating(
+    attacker: "Combatant", power: float = 1.0, config: Optional[GameConfig] = None
+) -> float:
+    """Offense атакующего с масштабом по уровню (шаги 1–3 calc_damage)."""
+    cfg = config or attacker.battle.config
+    r = cfg.rules
+    phys_cm, mag_cm, lvl_coeff = damage_coeffs(attacker, cfg)
+
+    # Offensive rating
+    phys = attacker.strength * r.coeff_phys * phys_cm
+    mag = attacker.intelligence * r.coeff_mag * mag_cm
+    base = getattr(attacker, "base_damage", 0) * power
+    offense = phys + mag + base
+
+    # Level scaling
+    return offense * (1.0 + attacker.level * lvl_coeff)
+
+
+def mitigate(offense: float, defense: float, rules: BattleRules) -> float:
+    """ELO‑mitigation (шаг 4 calc_damage): off * off / (off + DEF)."""
+    def_val = defense * rules.reduction_per_point
+    if offense + def_val > 0:
+        factor = offense / (offense + def_val)
+    else:
+        factor = 0.0
+    return offense * factor
+
+
+class Matchup:
+    """
+    Части расчёта для пары атакующий → защитник, не зависящие от бросков:
+    шанс попадания и урон до variance (шаги 1–4) по силе навыка. Годен,
+    пока у обоих не сменились статы (Combatant._stat_version) и конфиг боя.
+    """
+
+    __slots__ = (
+        "defender",
+        "att_version",
+        "def_version",
+        "config",
+        "hit",
+        "_pm",
+        "_base",
+        "_scale",
+        "_damage",
+    )
+
+    def __init__(self, attacker: "Combatant", defender: "Combatant") -> None:
+        cfg = attacker.battle.config
+        r = cfg.rules
+        self.defender = defender
+        self.att_version = attacker._stat_version
+        self.def_version = defender._stat_version
+        self.config = cfg
+        self.hit = hit_chance(attacker, defender)
+
+        # offense = (STR·phys + INT·mag + base_damage·power) × масштаб уровня
+        phys_cm, mag_cm, lvl_coeff = damage_coeffs(attacker, cfg)
+        self._pm = (
+            attacker.strength * r.coeff_phys * phys_cm
+            + attacker.intelligence * r.coeff_mag * mag_cm
+        )
+        self._base = getattr(attacker, "base_damage", 0)
+        self._scale = 1.0 + attacker.level * lvl_coeff
+        self._damage: Dict[float, float] = {}
+
+    def damage(self, power: float = 1.0) -> float:
+        """Урон до случайных бросков при силе навыка power."""
+        dmg = self._damage.get(power)
+        if dmg is None:
+            offense = (self._pm + self._base * power) * self._scale
+            dmg = self._damage[power] = mitigate(
+                offense, self.defender.defense, self.config.rules
+            )
+        return dmg
+
+
+def matchup(attacker: "Combatant", defender: "Combatant") -> Matchup:
+    """Кэшированный Matchup пары (пересобирается при смене статов или конфига)."""
+    m = attacker._matchups.get(id(defender))
+    if (
+        m is None
+        or m.defender is not defender
+        or m.att_version != attacker._stat_version
+        or m.def_version != defender._stat_version
+        or m.config is not attacker.battle.config
+    ):
+        m = attacker._matchups[id(defender)] = Matchup(attacker, defender)
+    return m
+
+
+def base_damage(
+    attacker: "Combatant", defender: "Combatant", *, power: float = 1.0
+) -> float:
+    """Урон до случайных бросков (шаги 1–4 calc_damage)."""
+    cfg = attacker.battle.config
+    return mitigate(offense_rating(attacker, power, cfg), defender.defense, cfg.rules)
+
+
+class _Swing:
+    """
+    Атакующая сторона броска урона (шаги 5–9 calc_damage): правила, крит,
+    стихия и хуки пассивок — считаются один раз на действие, а не на цель.
+    """
+
+    __slots__ = (
+        "attacker",
+        "rules",
+        "rng",
+        "sigma",
+        "crit_chance",
+        "crit_mult",
+        "element",
+        "elem_name",
+        "magic_bonus",
+        "hooks",
+    )
+
+    def __init__(
+        self,
+        attacker: "Combatant",
+        element: Element,
+        source: DamageSource,
+        crit_type: CritType,
+    ) -> None:
+        r = attacker.battle.config.rules
+        self.attacker = attacker
+        self.rules = r
+        self.rng = attacker.battle.rng
+        self.sigma = (r.variance_max - 1.0) / 3.0
+        self.crit_chance = attacker.crit_chance
+        self.crit_mult = r.crit_multiplier[crit_type.name.lower()]
+        self.element = element
+        # TRUE‑урон не смотрит на резисты/слабости
+        self.elem_name = None if source is DamageSource.TRUE else element.name.lower()
+        # стат magic_damage (ауры) — только для нефизического урона
+        self.magic_bonus = 0.0 if element is Element.PHYSICAL else attacker.magic_damage
+        self.hooks = attacker.passives.outgoing_damage
+
+    def damage(self, raw: float, defender: "Combatant") -> Tuple[int, bool, bool, bool]:
+        """(урон, крит, слабость, резист) из урона до бросков raw."""
+        r = self.rules
+
+        # 5) Variance (truncated Gaussian)
+        v = self.rng.gauss(1.0, self.sigma)
+        raw *= max(r.variance_min, min(r.variance_max, v))
+
+        # 6) Critical
+        crit = self.rng.random() < self.crit_chance
+        if crit:
+            raw *= self.crit_mult
+
+        # 7) Elemental resist/weak
+        weak = resist = False
+        nm = self.elem_name
+        if nm is not None:
+            if nm in getattr(defender, "weaknesses", ()):
+                raw *= r.weak_multiplier
+                weak = True
+            elif nm in getattr(defender, "resistances", ()):
+                raw *= r.resist_multiplier
+                resist = True
+
+        # 8) Бонус магического урона и пассивки (Arcane Mastery)
+        if self.magic_bonus:
+            raw *= 1.0 + self.magic_bonus
+        for hook in self.hooks:
+            raw = hook(self.attacker, raw, self.element)
+
+        # 9) Floor & round
+        return max(int(round(raw)), r.min_damage), crit, weak, resist
 
 
 def calc_damage(
@@ -72,71 +258,60 @@ def calc_damage(
       5) Вносим variance (усечённый норм. шум)
       6) Проверяем криты
       7) Учитываем элементальные резисты/слабости
-      8) PASSIVE: Arcane Mastery — усиливаем магический урон
+      8) Бонус magic_damage и пассивки outgoing_damage (Arcane Mastery)
       9) Обрезаем до min_damage
     """
-    # 1) Определяем коэффициенты
-    species = getattr(attacker, "species", None)
-    if species:
-        mc = _MON_COEFFS.get(species, {})
-        phys_cm = mc.get("phys_coeff", 1.0)
-        mag_cm = mc.get("mag_coeff", 1.0)
-    else:
-        cc = getattr(attacker, "char_class", None)
-        phys_cm = cc.phys_coeff if cc else 1.0
-        mag_cm = cc.mag_coeff if cc else 1.0
+    # 1–4) Коэффициенты, offense, уровень и mitigation — из кэша пары
+    raw = matchup(attacker, defender).damage(power)
+    # 5–9) броски и модификаторы
+    dmg, crit, weak, resist = _Swing(attacker, element, source, crit_type).damage(raw, defender)
+    attacker._last_crit = crit
+    attacker._last_weak = weak
+    attacker._last_resist = resist
+    return dmg
 
-    # 2) Offensive rating
-    phys = attacker.strength * _dmg_cfg["coeffs"]["phys"] * phys_cm
-    mag = attacker.intelligence * _dmg_cfg["coeffs"]["mag"] * mag_cm
-    base = getattr(attacker, "base_damage", 0) * power
-    offense = phys + mag + base
 
-    # 3) Level scaling
-    kind = "monster" if species else "player"
-    offense *= 1.0 + attacker.level * _level_coeff[kind]
+class Strike(NamedTuple):
+    """Итог действия по одной цели (roll_strikes)."""
 
-    # 4) Mitigation (ELO-style)
-    def_val = defender.defense * _def_cfg["reduction_per_point"]
-    if offense + def_val > 0:
-        factor = offense / (offense + def_val)
-    else:
-        factor = 0.0
-    raw = offense * factor
-
-    # 5) Variance (truncated Gaussian)
-    μ, σ = 1.0, (_variance["max"] - 1.0) / 3.0
-    v = random.gauss(μ, σ)
-    v = max(_variance["min"], min(_variance["max"], v))
-    raw *= v
-
-    # 6) Critical
-    if random.random() < attacker.crit_chance:
-        raw *= _crit_mul[crit_type.name.lower()]
-        attacker._last_crit = True
-    else:
-        attacker._last_crit = False
-
-    # 7) Elemental resist/weak
-    attacker._last_weak = attacker._last_resist = False
-    if source is not DamageSource.TRUE:
-        nm = element.name.lower()
-        if nm in getattr(defender, "weaknesses", []):
-            raw *= _elem_cfg["weak_multiplier"]
-            attacker._last_weak = True
-        elif nm in getattr(defender, "resistances", []):
-            raw *= _elem_cfg["resist_multiplier"]
-            attacker._last_resist = True
-
-    # 8) PASSIVE: Arcane Mastery — усиливаем магический урон
-    if (
-        element is not Element.PHYSICAL
-        and hasattr(attacker, "skills")
-        and "Arcane Mastery" in attacker.skills
-    ):
-        bonus = CONFIG["skills"]["Arcane Mastery"]["power"]
-        raw *= 1.0 + bonus
+    target: "Combatant"
+    chance: float  # шанс успеха навыка (failed) или попадания
+    failed: bool = False  # навык не сработал (success_chance)
+    hit: bool = False
+    damage: int = 0
+    crit: bool = False
+    weak: bool = False
+    resist: bool = False
 
-    # 9) Floor & round
-    dmg = int(round(raw))
-    return max(dmg, _min_floor)
+
+def roll_strikes(
+    attacker: "Combatant",
+    defenders: Sequence["Combatant"],
+    *,
+    element: Element = Element.PHYSICAL,
+    source: DamageSource = DamageSource.NORMAL,
+    crit_type: CritType = CritType.NORMAL,
+    power: float = 1.0,
+    success_chance: Optional[float] = None,
+) -> List[Strike]:
+    """
+    Броски по всем целям за один проход (AoE‑навыки): атакующая сторона
+    считается один раз, по каждой цели — кэш пары и сами броски. Порядок
+    бросков на цель тот же, что у [успех навыка] → check_hit → calc_damage,
+    поэтому итог совпадает с поцелевым циклом. Урон не наносится — это
+    делает вызывающий, пакетом по готовому списку.
+    """
+    swing = _Swing(attacker, element, source, crit_type)
+    rand = swing.rng.random
+    strikes: List[Strike] = []
+    for d in defenders:
+        if success_chance is not None and rand() > success_chance:
+            strikes.append(Strike(d, success_chance, failed=True))
+            continue
+        m = matchup(attacker, d)
+        if not rand() < m.hit:
+            strikes.append(Strike(d, m.hit))
+            continue
+        dmg, crit, weak, resist = swing.damage(m.damage(power), d)
+        strikes.append(Strike(d, m.hit, False, True, dmg, crit, weak, resist))
+    return strikes
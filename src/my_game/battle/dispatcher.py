@@ -4,22 +4,52 @@ import logging
 from typing import Union, Sequence, List
 
 from my_game.base.combatant import Combatant
-from my_game.config import CONFIG
+from my_game.config import add_validator
+from my_game.config_defs import ConfigError, GameConfig
 from my_game.battle.skill_executor import execute_skill, TargetSelector
 from my_game.battle.ai import warrior_ai, mage_ai, rogue_ai
 from my_game.battle.ai.base_ai import BaseAI
+from my_game.characters.character_class import CharacterClass
 from my_game.battle.status import start_of_turn, end_of_turn
 
 logger = logging.getLogger(__name__)
 
-# Сопоставление display_name → (AI‑класс, ключ в CONFIG["ai"])
+# Класс персонажа → (AI‑класс, ключ в GameConfig.ai)
 AI_MAP = {
-    "Воин": (warrior_ai.WarriorAI, "warrior"),
-    "Маг": (mage_ai.MageAI, "mage"),
-    "Разбойник": (rogue_ai.RogueAI, "rogue"),
+    CharacterClass.WARRIOR: (warrior_ai.WarriorAI, "warrior"),
+    CharacterClass.MAGE: (mage_ai.MageAI, "mage"),
+    CharacterClass.ROGUE: (rogue_ai.RogueAI, "rogue"),
 }
 
 
+def _check_ai_configs(cfg: GameConfig) -> None:
+    for ai_cls, role in AI_MAP.values():
+        if role not in cfg.ai:
+            raise ConfigError(f"Нет AI‑конфига для роли {role!r}")
+        ai_cls.check_config(cfg.ai[role])
+
+
+# Конфиги ИИ проверяем сразу при импорте (и при каждой перезагрузке),
+# а не на первом ходу
+add_validator(_check_ai_configs)
+
+
+def ai_for(user: Combatant) -> BaseAI:
+    """
+    AI участника на текущий бой. Создаётся на первом ходу и живёт до
+    конца боя (вместе с кэшем угроз); новый бой — новый AI.
+    """
+    ai = user._ai
+    if ai is not None and ai.battle is user.battle:
+        return ai
+    try:
+        ai_cls, role_key = AI_MAP[user.char_class]
+    except KeyError:
+        raise ValueError(f"Нет AI для класса {user.char_class.name!r}")
+    ai = user._ai = ai_cls(user, user.battle.config.ai[role_key])
+    return ai
+
+
 def take_turn(
     user: Combatant,
     opponents: Union[Combatant, Sequence[Combatant]],
@@ -33,13 +63,11 @@ def take_turn(
     # 2) Сохраняем visible для пассивок (Cleave)
     user._visible_enemies = pool
 
-    # 3) PASSIVE: Last Stand — накладываем эффект survive_one_turn один раз
-    if "Last Stand" in getattr(user, "skills", []):
-        if not user.has_effect("survive_one_turn"):
-            user.apply_effect({"effect": "survive_one_turn"})
+    # 3) Пассивки начала хода (Last Stand — survive_one_turn, если его нет)
+    for hook in user.passives.turn_start:
+        hook(user)
 
-    # ── Подготовка хода: кулдауны и реген маны ──
-    user.tick_cooldowns()
+    # ── Подготовка хода: реген маны (кулдауны считаются по user.turn_clock) ──
     user.tick_mana()
     start_of_turn(user)
 
@@ -51,19 +79,8 @@ def take_turn(
             user.attack(target)
             return
 
-        # 5) Инстанцируем нужный AI с его конфигом
-        display = user.char_class.display_name
-        try:
-            ai_cls, role_key = AI_MAP[display]
-        except KeyError:
-            raise ValueError(f"Нет AI для класса {display!r}")
-
-        try:
-            cfg = CONFIG["ai"][role_key]
-        except KeyError:
-            raise ValueError(f"Нет AI‑конфига для роли {role_key!r}")
-
-        ai: BaseAI = ai_cls(user, cfg)
+        # 5) AI участника на этот бой (с его конфигом)
+        ai = ai_for(user)
 
         # 6) Primary & выбор действия AI
         primary = ai.select_primary(pool)
@@ -80,23 +97,16 @@ def take_turn(
             return
 
         # 8) Собираем цели и исполняем навык
-        skill_cfg = CONFIG["skills"][skill_name]
-        mode = skill_cfg.get("target", "enemy")
+        skill = user.battle.config.skills[skill_name]
+        mode = skill.target
         selector = TargetSelector(user, pool, getattr(user, "team", [user]))
         targets = selector.collect(mode, chosen, primary)
         logger.debug(f"{user.name} uses {skill_name} on {[t.name for t in targets]}")
-        execute_skill(user, targets, skill_name)
-
-        # 9) Если utility с extra_turn — сразу даём дополнительный ход
-        if (
-            skill_cfg.get("type") == "utility"
-            and skill_cfg.get("effect") == "extra_turn"
-        ):
-            logger.debug(
-                f"{user.name} получает немедленный дополнительный ход от {skill_name!r}"
-            )
-            return take_turn(user, opponents)
+        # utility с extra_turn накладывает эффект extra_turn; сам
+        # дополнительный ход ставит в очередь движок боя (engine.run_battle)
+        execute_skill(user, targets, skill)
 
     finally:
-        # ── Конец хода: периодический урон и снятие duration ──
+        # ── Конец хода: периодический урон, часы хода и снятие эффектов ──
         end_of_turn(user)
+        user._has_acted = True
@@ -0,0 +1,188 @@
+# src/my_game/battle/effects.py
+"""
+Хранилище статус‑эффектов участника.
+
+Эффекты — те же словари {"effect": имя, "duration": …, "power": …}, но
+лежат по имени, а у хранилища есть битовая маска имён, на которых сейчас
+есть хотя бы один эффект. Поэтому «есть ли stun», «есть ли хоть что‑то из
+evade/reduce_damage/magic_shield» — одна проверка маски, без обхода списка.
+
+Длительность — по часам хода владельца (Combatant.turn_clock, число его
+завершённых ходов): эффект с duration получает "expires" — значение часов,
+на котором он снимается, и попадает в корзину колеса таймеров под этим
+номером. Конец хода снимает только свою корзину, а не обходит все эффекты.
+
+Повторное наложение того же эффекта — по buff_rules из battle_rules.yaml:
+  • refresh     — новый эффект заменяет старый (длительность обновляется);
+  • independent — каждый эффект живёт и тикает сам по себе;
+  • stack       — как independent, но не больше max_stacks; лишний
+                  вытесняет самый старый.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ..config_defs import BattleRules
+
+# Эффекты, которые движок проверяет сам, — их биты одинаковы в любом процессе
+_BUILTIN = (
+    "evade",
+    "extra_turn",
+    "magic_shield",
+    "provoke",
+    "reduce_damage",
+    "stun",
+    "survive_one_turn",
+)
+
+# имя эффекта → бит; новые имена — только под замком (бои идут и в потоках)
+_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(_BUILTIN)}
+_LOCK = threading.Lock()
+
+
+def register_effects(names: Iterable[str]) -> None:
+    """
+    Раздать биты именам из конфига (compile_config) — в отсортированном
+    порядке, так что при одном конфиге биты совпадают во всех процессах.
+    """
+    with _LOCK:
+        for name in sorted(set(names)):
+            if name not in _BITS:
+                _BITS[name] = 1 << len(_BITS)
+
+
+def effect_bit(name: str) -> int:
+    """Бит эффекта в EffectStore.mask."""
+    bit = _BITS.get(name)
+    if bit is None:
+        # имя не из конфига (эффект в коде или в свежем YAML)
+        with _LOCK:
+            bit = _BITS.get(name)
+            if bit is None:
+                bit = _BITS[name] = 1 << len(_BITS)
+    return bit
+
+
+def effect_mask(names: Iterable[str]) -> int:
+    """Маска из нескольких эффектов — для проверки «хоть один из»."""
+    mask = 0
+    for name in names:
+        mask |= effect_bit(name)
+    return mask
+
+
+class EffectStore:
+    """Эффекты по имени + маска присутствия."""
+
+    __slots__ = ("_by_name", "mask", "_wheel")
+
+    def __init__(self, effects: Iterable[Dict] = ()) -> None:
+        self._by_name: Dict[str, List[Dict]] = {}
+        self.mask = 0
+        # expires → эффекты; снятые раньше срока остаются в корзине и
+        # пропускаются при срабатывании (ленивое удаление)
+        self._wheel: Dict[int, List[Dict]] = {}
+        for eff in effects:
+            self._push(eff)
+
+    # ───────────────────────
+    #  Запросы
+    # ───────────────────────
+    def has(self, name: str) -> bool:
+        return bool(self.mask & effect_bit(name))
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Самый старый из эффектов с этим именем (или None)."""
+        group = self._by_name.get(name)
+        return group[0] if group else None
+
+    def instances(self, name: str) -> List[Dict]:
+        return self._by_name.get(name, [])
+
+    def __iter__(self) -> Iterator[Dict]:
+        for group in self._by_name.values():
+            yield from group
+
+    def __len__(self) -> int:
+        return sum(len(g) for g in self._by_name.values())
+
+    def __bool__(self) -> bool:
+        return bool(self.mask)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, EffectStore):
+            return NotImplemented
+        return self._by_name == other._by_name
+
+    def __repr__(self) -> str:
+        return f"EffectStore({list(self)!r})"
+
+    # ───────────────────────
+    #  Изменение
+    # ───────────────────────
+    def add(self, effect: Dict, rules: "BattleRules") -> None:
+        """Наложить эффект с учётом buff_rules.stacking / max_stacks."""
+        name = effect["effect"]
+        group = self._by_name.get(name)
+        if not group:
+            self._push(effect)
+            return
+        self._schedule(effect)
+        mode = rules.buff_stacking
+        if mode == "refresh":
+            group[:] = [effect]
+        elif mode == "stack" and len(group) >= rules.max_stacks:
+            del group[: len(group) - rules.max_stacks + 1]
+            group.append(effect)
+        else:
+            group.append(effect)
+
+    def remove(self, effect: Dict) -> None:
+        """Убрать конкретный эффект (по идентичности словаря)."""
+        name = effect["effect"]
+        group = self._by_name.get(name)
+        if not group:
+            return
+        for i, eff in enumerate(group):
+            if eff is effect:
+                del group[i]
+                break
+        if not group:
+            del self._by_name[name]
+            self.mask &= ~effect_bit(name)
+
+    def discard(self, name: str) -> None:
+        """Убрать все эффекты с этим именем."""
+        if self._by_name.pop(name, None):
+            self.mask &= ~effect_bit(name)
+
+    def expire(self, now: int) -> List[Dict]:
+        """Снять и вернуть эффекты, чей срок — `now` (корзина колеса)."""
+        bucket = self._wheel.pop(now, None)
+        if not bucket:
+            return []
+        fired = []
+        for eff in bucket:
+            group = self._by_name.get(eff["effect"], ())
+            if any(e is eff for e in group):
+                self.remove(eff)
+                fired.append(eff)
+        return fired
+
+    def _schedule(self, effect: Dict) -> None:
+        expires = effect.get("expires")
+        if expires is not None:
+            self._wheel.setdefault(expires, []).append(effect)
+
+    def _push(self, effect: Dict) -> None:
+        name = effect["effect"]
+        group = self._by_name.get(name)
+        if group is None:
+            self._by_name[name] = [effect]
+            self.mask |= effect_bit(name)
+        else:
+            group.append(effect)
+        self._schedule(effect)
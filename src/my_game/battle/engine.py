@@ -0,0 +1,79 @@
+# src/my_game/battle/engine.py
+"""
+Единый цикл боя «герои против врагов» для бота, CLI и симуляций.
+Очередь ходов — TurnScheduler, правила — снимок конфига боя, ауры
+отряда — PartyAuras (считаются в начале и при смене состава).
+"""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Optional, Sequence
+
+from .auras import PartyAuras
+from .context import BattleContext
+from .dispatcher import take_turn
+from .events import RoundStarted, RoundEnded
+from .scheduler import TurnScheduler
+from .status import apply_extra_turn
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+
+def run_battle(
+    ctx: BattleContext,
+    heroes: Sequence["Combatant"],
+    enemies: Sequence["Combatant"],
+    *,
+    max_rounds: Optional[int] = None,
+) -> bool:
+    """
+    Провести бой до гибели одной из сторон (или до max_rounds).
+    Герои бьют всех живых врагов (цель выбирает ИИ), враг — случайного
+    живого героя. Возвращает True, если герои победили.
+    """
+    heroes = list(heroes)
+    enemies = list(enemies)
+    for h in heroes:
+        h.team = heroes
+    for m in enemies:
+        m.team = enemies
+    ctx.join(*heroes, *enemies)
+    # синергии отряда — один раз на старте; дальше только при смене состава
+    auras = (PartyAuras(heroes, ctx.config), PartyAuras(enemies, ctx.config))
+
+    hero_ids = {id(h) for h in heroes}
+    rng = ctx.rng
+    emit = ctx.emit
+    sched = TurnScheduler(heroes + enemies, ctx.config.rules, rng)
+    current = 0
+
+    while any(h.is_alive for h in heroes) and any(m.is_alive for m in enemies):
+        actor = sched.pop()
+        if actor is None:
+            break
+        if sched.round != current:
+            if max_rounds is not None and sched.round > max_rounds:
+                break
+            if emit:
+                if current:
+                    emit(RoundEnded(current))
+                emit(RoundStarted(sched.round))
+            current = sched.round
+
+        if id(actor) in hero_ids:
+            take_turn(actor, [m for m in enemies if m.is_alive])
+        else:
+            targets = [h for h in heroes if h.is_alive]
+            take_turn(actor, targets[0] if len(targets) == 1 else rng.choice(targets))
+
+        # дополнительный ход — в голову очереди
+        if actor.is_alive and apply_extra_turn(actor):
+            sched.push_extra(actor)
+
+        for party in auras:
+            party.update()
+
+    if emit and current:
+        emit(RoundEnded(current))
+    return any(h.is_alive for h in heroes) and not any(m.is_alive for m in enemies)
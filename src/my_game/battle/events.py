@@ -0,0 +1,274 @@
+# src/my_game/battle/events.py
+"""
+Типизированные события боя.
+
+Движок ничего не печатает сам: каждое попадание, промах, эффект или
+повышение уровня превращается в событие и уходит в приёмник (sink),
+привязанный к бою. Текстовый лог — лишь один из приёмников (см. log.py).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, List, Optional, Protocol, Tuple
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+# (имя, уровень, HP, max HP) — «портрет» участника на момент события
+Portrait = Tuple[str, int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class BattleEvent:
+    """Базовый класс всех событий боя."""
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Ход боя
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class BattleStarted(BattleEvent):
+    tier: int
+    tier_name: str
+    enemies: Tuple[Portrait, ...]
+    heroes: Tuple[Portrait, ...]
+
+
+@dataclass(frozen=True, slots=True)
+class RoundStarted(BattleEvent):
+    number: int
+
+
+@dataclass(frozen=True, slots=True)
+class RoundEnded(BattleEvent):
+    number: int
+
+
+@dataclass(frozen=True, slots=True)
+class BattleEnded(BattleEvent):
+    win: bool
+    xp: float
+    gold: int
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Атаки и навыки
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class Hit(BattleEvent):
+    """Попадание: обычной атакой (skill=None) или навыком."""
+
+    attacker: "Combatant"
+    target: "Combatant"
+    damage: int
+    crit: bool = False
+    weak: bool = False
+    resist: bool = False
+    skill: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Miss(BattleEvent):
+    attacker: "Combatant"
+    target: "Combatant"
+    chance: float
+    skill: Optional[str] = None
+
+
+@dataclass(frozen=True, slots=True)
+class Splash(BattleEvent):
+    """Побочный урон пассивки (Cleave)."""
+
+    attacker: "Combatant"
+    target: "Combatant"
+    damage: int
+    skill: str
+
+
+@dataclass(frozen=True, slots=True)
+class SkillUsed(BattleEvent):
+    user: "Combatant"
+    skill: str
+
+
+@dataclass(frozen=True, slots=True)
+class SkillFailed(BattleEvent):
+    user: "Combatant"
+    skill: str
+    chance: float
+
+
+@dataclass(frozen=True, slots=True)
+class ManaSpent(BattleEvent):
+    user: "Combatant"
+    amount: float
+    mana: float
+
+
+@dataclass(frozen=True, slots=True)
+class ManaRestored(BattleEvent):
+    user: "Combatant"
+    amount: float
+    mana: float
+    skill: str
+
+
+@dataclass(frozen=True, slots=True)
+class Stunned(BattleEvent):
+    actor: "Combatant"
+
+
+@dataclass(frozen=True, slots=True)
+class ExtraTurn(BattleEvent):
+    actor: "Combatant"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Урон и смерть
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class DamageTaken(BattleEvent):
+    target: "Combatant"
+    amount: int
+    health: int
+    max_health: int
+
+
+@dataclass(frozen=True, slots=True)
+class PeriodicDamage(BattleEvent):
+    target: "Combatant"
+    effect: str
+    amount: int
+    health: int
+    max_health: int
+
+
+@dataclass(frozen=True, slots=True)
+class Evaded(BattleEvent):
+    target: "Combatant"
+
+
+@dataclass(frozen=True, slots=True)
+class DamageReduced(BattleEvent):
+    target: "Combatant"
+    multiplier: float
+
+
+@dataclass(frozen=True, slots=True)
+class ShieldAbsorbed(BattleEvent):
+    target: "Combatant"
+    absorbed: int
+    remaining: int
+
+
+@dataclass(frozen=True, slots=True)
+class LastStand(BattleEvent):
+    target: "Combatant"
+
+
+@dataclass(frozen=True, slots=True)
+class Death(BattleEvent):
+    target: "Combatant"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Статус‑эффекты
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class EffectApplied(BattleEvent):
+    target: "Combatant"
+    effect: str
+    duration: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class EffectExpired(BattleEvent):
+    """
+    Снятие эффекта. reason:
+      • "expired"  — истекла длительность
+      • "cured"    — закончился периодический урон
+      • "depleted" — исчерпан (щит)
+    """
+
+    target: "Combatant"
+    effect: str
+    reason: str = "expired"
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Прогресс
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class ExpGained(BattleEvent):
+    hero: "Combatant"
+    amount: float
+    exp: float
+    exp_next: int
+
+
+@dataclass(frozen=True, slots=True)
+class LevelUp(BattleEvent):
+    hero: "Combatant"
+    level: int
+    exp_next: int
+
+
+@dataclass(frozen=True, slots=True)
+class SkillLearned(BattleEvent):
+    hero: "Combatant"
+    skill: str
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Приёмники
+# ──────────────────────────────────────────────────────────────────────────────
+class EventSink(Protocol):
+    """
+    Приёмник событий. enabled=False означает, что события можно не создавать
+    вовсе — BattleContext в этом случае не отдаёт движку emit.
+    """
+
+    enabled: bool
+
+    def emit(self, event: BattleEvent) -> None: ...
+
+
+class NullSink:
+    """Отбрасывает всё. Для массовых симуляций, где лог не нужен."""
+
+    enabled = False
+
+    def emit(self, event: BattleEvent) -> None:
+        return None
+
+
+class ListSink:
+    """Копит события в список — удобно для тестов и анализа боя."""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events: List[BattleEvent] = []
+
+    def emit(self, event: BattleEvent) -> None:
+        self.events.append(event)
+
+    def of_type(self, *types: type) -> List[BattleEvent]:
+        return [e for e in self.events if isinstance(e, types)]
+
+
+class TeeSink:
+    """Рассылает каждое событие нескольким приёмникам."""
+
+    enabled = True
+
+    def __init__(self, *sinks: EventSink) -> None:
+        self.sinks = [s for s in sinks if s.enabled]
+
+    def emit(self, event: BattleEvent) -> None:
+        for sink in self.sinks:
+            sink.emit(event)
+
+
+NULL_SINK = NullSink()
@@ -0,0 +1,259 @@
+# src/my_game/battle/log.py
+"""
+Текстовый (русский) лог боя — приёмник событий из events.py.
+"""
+
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional, TextIO
+
+from .events import (
+    BattleEvent,
+    BattleStarted,
+    RoundStarted,
+    RoundEnded,
+    BattleEnded,
+    Hit,
+    Miss,
+    Splash,
+    SkillUsed,
+    SkillFailed,
+    ManaSpent,
+    ManaRestored,
+    Stunned,
+    ExtraTurn,
+    DamageTaken,
+    PeriodicDamage,
+    Evaded,
+    DamageReduced,
+    ShieldAbsorbed,
+    LastStand,
+    Death,
+    EffectApplied,
+    EffectExpired,
+    ExpGained,
+    LevelUp,
+    SkillLearned,
+)
+
+_RENDERERS: Dict[type, Callable[[BattleEvent], str]] = {}
+
+
+def _renders(event_type: type):
+    def deco(fn):
+        _RENDERERS[event_type] = fn
+        return fn
+
+    return deco
+
+
+def _label(c) -> str:
+    """Класс героя или вид монстра — для строки попадания."""
+    cc = getattr(c, "char_class", None)
+    if cc is not None:
+        return cc.display_name
+    return c.monster_type.name
+
+
+@_renders(BattleStarted)
+def _battle_started(e: BattleStarted) -> str:
+    lines = [f"\n⚔️  Начало боя (тир {e.tier} — {e.tier_name})"]
+    for name, level, hp, max_hp in e.enemies:
+        lines.append(f"   • {name} (ур. {level}) — HP {hp}/{max_hp}")
+    for name, level, hp, max_hp in e.heroes:
+        lines.append(f"🔹 {name} (lvl {level}) — HP {hp}/{max_hp}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+@_renders(RoundStarted)
+def _round_started(e: RoundStarted) -> str:
+    return f"=== Раунд {e.number} ==="
+
+
+@_renders(RoundEnded)
+def _round_ended(e: RoundEnded) -> str:
+    return ""
+
+
+@_renders(BattleEnded)
+def _battle_ended(e: BattleEnded) -> str:
+    if e.win:
+        return f"🎉 Победа! Отряд получает {e.xp} XP и {e.gold} золота"
+    return "☠️  Отряд пал в бою."
+
+
+@_renders(Hit)
+def _hit(e: Hit) -> str:
+    if e.skill is not None:
+        return f"{e.attacker.name} использует {e.skill}! Наносит {e.damage} урона."
+    msg = f"{e.attacker.display_name} ({_label(e.attacker)}) "
+    if e.crit:
+        msg += "НАНОСИТ КРИТ! "
+    msg += f"наносит {e.damage} урона"
+    if e.weak:
+        msg += " (слабость)"
+    elif e.resist:
+        msg += " (резист)"
+    return msg + "."
+
+
+@_renders(Miss)
+def _miss(e: Miss) -> str:
+    if e.skill is not None:
+        return (
+            f"{e.attacker.name} использует {e.skill}, но промахивается! "
+            f"(шанс {e.chance:.1%})"
+        )
+    return f"{e.attacker.name} промахивается! (шанс {e.chance:.1%})"
+
+
+@_renders(Splash)
+def _splash(e: Splash) -> str:
+    return f"{e.attacker.name} ({e.skill}) наносит {e.damage} урона {e.target.name}."
+
+
+@_renders(SkillUsed)
+def _skill_used(e: SkillUsed) -> str:
+    return f"{e.user.name} использует {e.skill}!"
+
+
+@_renders(SkillFailed)
+def _skill_failed(e: SkillFailed) -> str:
+    return f"{e.user.name} пытается {e.skill}, но не удаётся! (шанс {e.chance:.0%})"
+
+
+@_renders(ManaSpent)
+def _mana_spent(e: ManaSpent) -> str:
+    return f"{e.user.name} тратит {e.amount} маны (осталось {e.mana})."
+
+
+@_renders(ManaRestored)
+def _mana_restored(e: ManaRestored) -> str:
+    return (
+        f"{e.user.name} восстанавливает {e.amount} маны от {e.skill}! "
+        f"(теперь {e.mana})"
+    )
+
+
+@_renders(Stunned)
+def _stunned(e: Stunned) -> str:
+    return f"{e.actor.name} не может действовать — оглушён!"
+
+
+@_renders(ExtraTurn)
+def _extra_turn(e: ExtraTurn) -> str:
+    return f"{e.actor.name} получает дополнительный ход!"
+
+
+@_renders(DamageTaken)
+def _damage_taken(e: DamageTaken) -> str:
+    return (
+        f"{e.target.display_name} получает {e.amount} урона, "
+        f"осталось {e.health}/{e.max_health} HP."
+    )
+
+
+@_renders(PeriodicDamage)
+def _periodic(e: PeriodicDamage) -> str:
+    return (
+        f"{e.target.name} страдает от {e.effect}: –{e.amount} HP.\n"
+        f"{e.target.name}: {e.health}/{e.max_health} HP."
+    )
+
+
+@_renders(Evaded)
+def _evaded(e: Evaded) -> str:
+    return f"{e.target.name} уклоняется от атаки!"
+
+
+@_renders(DamageReduced)
+def _reduced(e: DamageReduced) -> str:
+    return f"{e.target.name} снижает урон ×{e.multiplier:.2f}."
+
+
+@_renders(ShieldAbsorbed)
+def _shield(e: ShieldAbsorbed) -> str:
+    return (
+        f"{e.target.name} щит поглотил {e.absorbed} урона "
+        f"(осталось {e.remaining})."
+    )
+
+
+@_renders(LastStand)
+def _last_stand(e: LastStand) -> str:
+    return f"{e.target.display_name} активирует Last Stand и остаётся с 1 HP!"
+
+
+@_renders(Death)
+def _death(e: Death) -> str:
+    return f"💀 {e.target.display_name} повержен."
+
+
+@_renders(EffectApplied)
+def _effect_applied(e: EffectApplied) -> str:
+    duration = e.duration if e.duration is not None else "?"
+    return (
+        f"{e.target.display_name} получает эффект: {e.effect} "
+        f"на {duration} ходов."
+    )
+
+
+@_renders(EffectExpired)
+def _effect_expired(e: EffectExpired) -> str:
+    if e.reason == "cured":
+        return f"{e.target.name} излечивается от {e.effect}."
+    if e.reason == "depleted":
+        return f"{e.target.name} теряет эффект {e.effect}."
+    return f"{e.target.name} теряет эффект: {e.effect}"
+
+
+@_renders(ExpGained)
+def _exp_gained(e: ExpGained) -> str:
+    return f"🏅 {e.hero.name} получает {e.amount} XP (итого {e.exp}/{e.exp_next})."
+
+
+@_renders(LevelUp)
+def _level_up(e: LevelUp) -> str:
+    return (
+        f"🔺 {e.hero.name} достиг уровня {e.level}! "
+        f"Следующий уровень за {e.exp_next} XP."
+    )
+
+
+@_renders(SkillLearned)
+def _skill_learned(e: SkillLearned) -> str:
+    return f"🔓 {e.hero.name} изучил навык {e.skill}!"
+
+
+def render(event: BattleEvent) -> Optional[str]:
+    """Текст для события или None, если событие не отображается."""
+    fn = _RENDERERS.get(type(event))
+    return fn(event) if fn else None
+
+
+class TextLogRenderer:
+    """
+    Приёмник, превращающий события в русский текстовый лог.
+
+    Без `stream` строки копятся в памяти (см. getvalue), со `stream` —
+    сразу пишутся в поток (например, sys.stdout для CLI).
+    """
+
+    enabled = True
+
+    def __init__(self, stream: Optional[TextIO] = None) -> None:
+        self.stream = stream
+        self._chunks: List[str] = []
+
+    def emit(self, event: BattleEvent) -> None:
+        text = render(event)
+        if text is None:
+            return
+        if self.stream is not None:
+            self.stream.write(text + "\n")
+        else:
+            self._chunks.append(text + "\n")
+
+    def getvalue(self) -> str:
+        return "".join(self._chunks)
@@ -0,0 +1,106 @@
+# src/my_game/battle/passives.py
+"""
+Пассивные навыки как хуки.
+
+Пассивка регистрируется декоратором @passive(навык, точка). У каждого
+участника есть готовый набор хуков (Combatant.passives), собранный по его
+списку навыков, так что бой не проверяет `"Cleave" in skills` и т.п.:
+он просто вызывает хуки своей точки (пустой кортеж для большинства).
+
+Точки:
+  • ready           — персонаж собран (PlayerCharacter.from_config): hook(user)
+  • turn_start      — начало хода, до действия: hook(user)
+  • after_attack    — после попадания обычной атакой: hook(user, target, dmg)
+  • outgoing_damage — шаг 8 calc_damage: hook(user, raw, element) → raw
+
+Пассивки, меняющие только статы (Evasion Mastery), применяются ещё при
+сборке таблицы уровней — см. config_defs.stat_passive.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Tuple
+
+from .enums import Element
+from .events import Splash
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+HOOK_POINTS = ("ready", "turn_start", "after_attack", "outgoing_damage")
+
+# точка → навык → хук
+_HOOKS: Dict[str, Dict[str, Callable]] = {point: {} for point in HOOK_POINTS}
+# набор навыков → собранные хуки
+_CACHE: Dict[Tuple[str, ...], "PassiveHooks"] = {}
+
+
+@dataclass(frozen=True, slots=True)
+class PassiveHooks:
+    """Хуки пассивок одного набора навыков, по точкам."""
+
+    ready: Tuple[Callable, ...] = ()
+    turn_start: Tuple[Callable, ...] = ()
+    after_attack: Tuple[Callable, ...] = ()
+    outgoing_damage: Tuple[Callable, ...] = ()
+
+
+NO_PASSIVES = PassiveHooks()
+
+
+def passive(skill: str, point: str):
+    """Зарегистрировать хук пассивки skill в точке point."""
+    if point not in _HOOKS:
+        raise ValueError(f"Неизвестная точка пассивки {point!r}")
+
+    def register(hook):
+        _HOOKS[point][skill] = hook
+        _CACHE.clear()
+        return hook
+
+    return register
+
+
+def hooks_for(skills: Iterable[str]) -> PassiveHooks:
+    """Хуки пассивок для списка навыков (в порядке навыков)."""
+    key = tuple(skills)
+    hooks = _CACHE.get(key)
+    if hooks is None:
+        by_point = {
+            point: tuple(reg[s] for s in key if s in reg)
+            for point, reg in _HOOKS.items()
+        }
+        hooks = PassiveHooks(**by_point) if any(by_point.values()) else NO_PASSIVES
+        _CACHE[key] = hooks
+    return hooks
+
+
+# ───────────────────────
+#  Пассивки навыков
+# ───────────────────────
+@passive("Last Stand", "ready")
+@passive("Last Stand", "turn_start")
+def _last_stand(user: "Combatant") -> None:
+    # эффект survive_one_turn; сработает один раз за бой (take_damage)
+    if not user.has_effect("survive_one_turn"):
+        user.apply_effect({"effect": "survive_one_turn"})
+
+
+@passive("Cleave", "after_attack")
+def _cleave(user: "Combatant", target: "Combatant", dmg: int) -> None:
+    splash_pct = user.battle.config.skills["Cleave"].power
+    splash_dmg = max(1, int(dmg * splash_pct + 0.5))
+    emit = user.battle.emit
+    for other in getattr(user, "_visible_enemies", []):
+        if other is not target and other.is_alive:
+            if emit:
+                emit(Splash(user, other, splash_dmg, "Cleave"))
+            other.take_damage(splash_dmg)
+
+
+@passive("Arcane Mastery", "outgoing_damage")
+def _arcane_mastery(user: "Combatant", raw: float, element: Element) -> float:
+    if element is Element.PHYSICAL:
+        return raw
+    return raw * (1.0 + user.battle.config.skills["Arcane Mastery"].power)
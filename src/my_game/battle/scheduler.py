@@ -0,0 +1,87 @@
+# src/my_game/battle/scheduler.py
+"""
+Очередь ходов боя по battle_rules.turn_order.
+
+Все ожидающие действия лежат в одной куче (время, приоритет, №, участник).
+Отходивший участник сразу ставит в очередь свой следующий ход, погибшие
+просто выбрасываются при извлечении — пересортировки всех каждый раунд нет.
+
+Алгоритмы (random_weight = w):
+  • agility_priority — раунды; внутри раунда по agility + w·U
+                       (при w = 0.1 — прежний порядок «ловкость + шум»);
+  • random           — раунды; порядок внутри раунда случайный;
+  • speed            — шкала времени: интервал между ходами обратно
+                       пропорционален ловкости (средний участник ходит раз
+                       в раунд), w размывает интервал: ×((1 − w) + 2w·U).
+Дополнительный ход (extra_turn) — действие в голове очереди, а не рекурсия.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import random
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
+
+from ..config_defs import BattleRules
+
+if TYPE_CHECKING:
+    from ..base.combatant import Combatant
+
+
+class TurnScheduler:
+    __slots__ = ("_heap", "_seq", "_rng", "_mode", "_w", "_base", "time")
+
+    def __init__(
+        self,
+        combatants: Sequence["Combatant"],
+        rules: BattleRules,
+        rng: random.Random,
+    ) -> None:
+        self._heap: List[Tuple[float, float, int, "Combatant", bool]] = []
+        self._seq = 0
+        self._rng = rng
+        self._mode = rules.turn_order
+        self._w = rules.turn_random_weight
+        # средняя ловкость — «раунд» шкалы speed
+        alive = [c for c in combatants if c.is_alive]
+        self._base = sum(max(c.agility, 1) for c in alive) / max(len(alive), 1)
+        self.time = 0.0
+        for c in alive:
+            self._schedule(c, 0.0)
+
+    @property
+    def round(self) -> int:
+        """Номер текущего раунда (с 1)."""
+        return max(1, math.ceil(self.time))
+
+    def _schedule(self, c: "Combatant", now: float) -> None:
+        rng = self._rng
+        if self._mode == "speed":
+            interval = self._base / max(c.agility, 1)
+            interval *= (1.0 - self._w) + 2.0 * self._w * rng.random()
+            entry = (now + interval, -c.agility)
+        elif self._mode == "random":
+            entry = (math.floor(now) + 1.0, -rng.random())
+        else:  # agility_priority
+            entry = (math.floor(now) + 1.0, -(c.agility + self._w * rng.random()))
+        self._seq += 1
+        heapq.heappush(self._heap, entry + (self._seq, c, True))
+
+    def push_extra(self, c: "Combatant") -> None:
+        """Дополнительный ход: сразу следующим, без смены раунда."""
+        self._seq += 1
+        heapq.heappush(self._heap, (self.time, -math.inf, self._seq, c, False))
+
+    def pop(self) -> Optional["Combatant"]:
+        """Следующий живой участник (или None, если ходить некому)."""
+        heap = self._heap
+        while heap:
+            when, _, _, c, regular = heapq.heappop(heap)
+            if not c.is_alive:
+                continue  # погибший выпадает из очереди насовсем
+            self.time = when
+            if regular:
+                self._schedule(c, when)
+            return c
+        return None
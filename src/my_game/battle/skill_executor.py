@@ -1,11 +1,11 @@
 # src/my_game/battle/skill_executor.py
 
-import random
 from typing import List, Union, Sequence, Optional
-from my_game.battle.enums import Element, DamageSource, CritType
-from my_game.battle.damage import calc_damage, check_hit
+from my_game.battle.enums import DamageSource
+from my_game.battle.damage import roll_strikes
 from my_game.battle.status import before_action
-from my_game.config import CONFIG
+from my_game.battle.events import Hit, Miss, SkillUsed, SkillFailed, ManaSpent, ManaRestored
+from my_game.config_defs import ALLY_TARGET_MODES, DamageSkill, EffectSkill, SkillDef, UtilitySkill
 from my_game.base.combatant import Combatant
 
 
@@ -39,7 +39,7 @@ class TargetSelector:
             return self.enemies
         if mode == "two_random_enemies":
             cnt = min(2, len(self.enemies))
-            return random.sample(self.enemies, cnt)
+            return self.user.battle.rng.sample(self.enemies, cnt)
         if mode == "team":
             return self.allies
         if mode == "ally":
@@ -54,113 +54,125 @@ class TargetSelector:
 def execute_skill(
     user: Combatant,
     targets: Union[Combatant, Sequence[Combatant]],
-    skill_name: str,
+    skill: Union[SkillDef, str],
 ) -> None:
+    """
+    Применить навык: мана, действие по типу (skill.handler), кулдаун.
+    skill — скомпилированный SkillDef (или имя навыка в конфиге боя).
+    """
     # normalize targets to list
     if isinstance(targets, Combatant):
         targets = [targets]
     else:
         targets = [t for t in targets if isinstance(t, Combatant)]
 
+    if isinstance(skill, str):
+        skill = user.battle.config.skills[skill]
+
     visible = getattr(user, "_visible_enemies", targets)
     allowed = before_action(user, visible)
     if not allowed:
         return
-    targets = [t for t in targets if t in allowed] or allowed
+    # stun/provoke ограничивают только цели‑врагов; баффы на своих идут как есть
+    if skill.target not in ALLY_TARGET_MODES:
+        targets = [t for t in targets if t in allowed] or allowed
+
+    handler = skill.handler
+    if handler is None:
+        raise ValueError(f"Unknown skill type {skill.type!r} for {skill.name!r}")
 
-    cfg = CONFIG["skills"][skill_name]
-    mana_cost = cfg.get("mana_cost", cfg.get("cost", {}).get("mana", 0))
+    mana_cost = skill.mana_cost
     # 1) тратим ману
     if mana_cost and hasattr(user, "mana"):
         user.mana = max(user.mana - mana_cost, 0)
-        print(f"{user.name} тратит {mana_cost} маны (осталось {user.mana}).")
-
-    kind = cfg["type"]
-    if kind == "damage":
-        _exec_damage(user, targets, skill_name, cfg)
-    elif kind in ("buff", "debuff"):
-        _exec_buff_debuff(user, targets, skill_name, cfg)
-    elif kind == "utility":
-        _exec_utility(user, targets, skill_name, cfg)
-    else:
-        raise ValueError(f"Unknown skill type {kind!r} for {skill_name!r}")
+        emit = user.battle.emit
+        if emit:
+            emit(ManaSpent(user, mana_cost, user.mana))
+
+    # 2) действие навыка по его типу
+    handler(user, targets, skill)
 
     # 3) ставим кулдаун
-    cd = cfg.get("cooldown", 0)
+    cd = skill.cooldown
     if cd:
-        user.cooldowns[skill_name] = cd
+        # готов через cd своих ходов (часы идут в end_of_turn)
+        user.start_cooldown(skill.name, cd)
 
 
-def _apply_effect(tgt: Combatant, cfg: dict) -> None:
-    payload = {"effect": cfg["effect"]}
-    if "duration" in cfg:
-        payload["duration"] = cfg["duration"]
-    if "power" in cfg:
-        payload["power"] = cfg["power"]
-    tgt.apply_effect(payload)
+def _handles(*skill_classes):
+    """Привязать исполнитель к типам навыков (SkillDef.handler)."""
 
+    def bind(fn):
+        for cls in skill_classes:
+            cls.handler = staticmethod(fn)
+        return fn
 
-def _exec_damage(user, targets, skill_name, cfg):
-    success_chance = cfg.get("success_chance", 1.0)
-    power = cfg.get("power", 1.0)
-    elem = Element[cfg.get("element", "PHYSICAL")]
+    return bind
 
-    for tgt in targets:
-        if random.random() > success_chance:
-            print(
-                f"{user.name} пытается {skill_name}, но не удаётся! (шанс {success_chance:.0%})"
-            )
+
+def _apply_effect(tgt: Combatant, skill: SkillDef) -> None:
+    tgt.apply_effect(skill.effect_payload())
+
+
+@_handles(DamageSkill)
+def _exec_damage(user, targets, skill: SkillDef):
+    skill_name = skill.name
+    emit = user.battle.emit
+
+    # 1) все броски по всем целям за один проход (Heavy‑крит для
+    #    if_first / if_enemy_low_hp выбран при загрузке — skill.crit)
+    strikes = roll_strikes(
+        user,
+        targets,
+        element=skill.element,
+        source=DamageSource.NORMAL,
+        crit_type=skill.crit,
+        power=skill.power,
+        success_chance=skill.success_chance,
+    )
+
+    # 2) применяем результаты пакетом
+    for s in strikes:
+        tgt = s.target
+        if s.failed:
+            if emit:
+                emit(SkillFailed(user, skill_name, s.chance))
             continue
-        if not check_hit(user, tgt):
-            print(
-                f"{user.name} использует {skill_name}, но промахивается! (шанс {user._last_hit:.1%})"
-            )
+        if not s.hit:
+            if emit:
+                emit(Miss(user, tgt, s.chance, skill_name))
             continue
+        if emit:
+            emit(Hit(user, tgt, s.damage, s.crit, s.weak, s.resist, skill_name))
+        tgt.take_damage(s.damage)
 
-        # Heavy‑крит только для навыков с триггером if_first / if_enemy_low_hp
-        trig = cfg.get("trigger", "")
-        if trig in ("if_first", "if_enemy_low_hp"):
-            crit = CritType.HEAVY
-        else:
-            crit = CritType.NORMAL
-
-        base = calc_damage(
-            user,
-            tgt,
-            element=elem,
-            source=DamageSource.NORMAL,
-            crit_type=crit,
-            power=power,
-        )
-        dmg = int(base)
-        print(f"{user.name} использует {skill_name}! Наносит {dmg} урона.")
-        tgt.take_damage(dmg)
-
-        if cfg.get("effect") and tgt.is_alive:
-            _apply_effect(tgt, cfg)
+        if skill.effect and tgt.is_alive:
+            _apply_effect(tgt, skill)
 
 
-def _exec_buff_debuff(user, targets, skill_name, cfg):
-    print(f"{user.name} использует {skill_name}!")
+@_handles(EffectSkill)
+def _exec_buff_debuff(user, targets, skill: SkillDef):
+    emit = user.battle.emit
+    if emit:
+        emit(SkillUsed(user, skill.name))
     for tgt in targets:
-        _apply_effect(tgt, cfg)
-    if cfg.get("effect") == "steal_intelligence":
+        _apply_effect(tgt, skill)
+    if skill.effect == "steal_intelligence":
         recover = int(
-            user.base_mana
-            * CONFIG["battle_rules"]["status_effects"]["steal_intelligence"][
-                "mana_recover"
-            ]
+            user.base_mana * user.battle.config.status_effects["steal_intelligence"].mana_recover
         )
         user.mana = min(user.base_mana, user.mana + recover)
-        print(
-            f"{user.name} восстанавливает {recover} маны от {skill_name}! (теперь {user.mana})"
-        )
-
-
-def _exec_utility(user, targets, skill_name, cfg):
-    print(f"{user.name} использует {skill_name}!")
-    eff = cfg.get("effect")
-    if eff == "extra_turn":
-        user.apply_effect({"effect": "extra_turn", "duration": cfg.get("duration", 1)})
+        if emit:
+            emit(ManaRestored(user, recover, user.mana, skill.name))
+
+
+@_handles(UtilitySkill)
+def _exec_utility(user, targets, skill: SkillDef):
+    emit = user.battle.emit
+    if emit:
+        emit(SkillUsed(user, skill.name))
+    if skill.effect == "extra_turn":
+        duration = skill.duration if skill.duration is not None else 1
+        user.apply_effect({"effect": "extra_turn", "duration": duration})
     else:
-        _apply_effect(user if cfg.get("target") == "self" else targets[0], cfg)
+        _apply_effect(user if skill.target == "self" else targets[0], skill)
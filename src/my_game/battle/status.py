@@ -2,13 +2,28 @@
 
 from typing import List, TYPE_CHECKING
 
-from my_game.config import CONFIG
+from my_game.battle.effects import effect_bit, effect_mask
+from my_game.battle.events import (
+    PeriodicDamage,
+    Death,
+    EffectExpired,
+    Stunned,
+    Evaded,
+    DamageReduced,
+    ShieldAbsorbed,
+    ExtraTurn,
+)
 
 if TYPE_CHECKING:
     from my_game.base.combatant import Combatant  # только для аннотаций
 
-# Конфиг статус‑эффектов
-_STATUS_CFG = CONFIG["battle_rules"]["status_effects"]
+_STUN = effect_bit("stun")
+_PROVOKE = effect_bit("provoke")
+_EXTRA_TURN = effect_bit("extra_turn")
+_EVADE = effect_bit("evade")
+_REDUCE = effect_bit("reduce_damage")
+_SHIELD = effect_bit("magic_shield")
+_DEFENSIVE = effect_mask(("evade", "reduce_damage", "magic_shield"))
 
 
 def start_of_turn(combatant: "Combatant") -> None:
@@ -19,31 +34,41 @@ def start_of_turn(combatant: "Combatant") -> None:
 def _apply_periodic_damage(combatant: "Combatant") -> None:
     """
     Наносит урон за ход от эффектов типа burn, poison и т.п.
-    Уменьшает duration, если оно задано под end_of_turn.
+    Снимает их по истечении tick_effects (колесо таймеров).
     """
-    for eff in list(combatant.status_effects):
-        cfg = _STATUS_CFG.get(eff["effect"], {})
-        if "periodic_damage" not in cfg:
-            continue
+    store = combatant.effects
+    if not store:
+        return
+    config = combatant.battle.config
+    periodic = [
+        eff
+        for name in config.periodic_effects
+        if store.has(name)
+        for eff in store.instances(name)
+    ]
+    for eff in periodic:
+        cfg = config.effect_rules(eff["effect"])
 
-        dmg = int(combatant.max_health * cfg["periodic_damage"])
+        dmg = int(combatant.max_health * cfg.periodic_damage)
         if dmg <= 0:
             continue
 
-        print(f"{combatant.name} страдает от {eff['effect']}: –{dmg} HP.")
         # уменьшаем напрямую, чтобы Last Stand не срабатывал повторно
+        was_alive = combatant.health > 0
         combatant.health = max(combatant.health - dmg, 0)
-        print(f"{combatant.name}: {combatant.health}/{combatant.max_health} HP.")
-
-        # по окончании хода убираем duration
-        if (
-            eff.get("duration") is not None
-            and cfg.get("duration_decrement") == "end_of_turn"
-        ):
-            eff["duration"] -= 1
-            if eff["duration"] <= 0:
-                combatant.status_effects.remove(eff)
-                print(f"{combatant.name} излечивается от {eff['effect']}.")
+        emit = combatant.battle.emit
+        if emit:
+            emit(
+                PeriodicDamage(
+                    combatant,
+                    eff["effect"],
+                    dmg,
+                    combatant.health,
+                    combatant.max_health,
+                )
+            )
+            if was_alive and combatant.health == 0:
+                emit(Death(combatant))
 
 
 def before_action(
@@ -53,14 +78,14 @@ def before_action(
     Блокирует ход stun, перенаправляет цель по provoke.
     """
     # 1) stun отбирает весь ход
-    if any(e["effect"] == "stun" for e in attacker.status_effects):
-        print(f"{attacker.name} не может действовать — оглушён!")
+    if attacker.effects.mask & _STUN:
+        emit = attacker.battle.emit
+        if emit:
+            emit(Stunned(attacker))
         return []
 
     # 2) если есть provoke на ком-то из целей, бить только их
-    provoked = [
-        t for t in targets if any(e["effect"] == "provoke" for e in t.status_effects)
-    ]
+    provoked = [t for t in targets if t.effects.mask & _PROVOKE]
     return provoked or targets
 
 
@@ -70,40 +95,45 @@ def modify_incoming_damage(defender: "Combatant", damage: int) -> int:
     2) reduce_damage
     3) magic_shield
     """
+    store = defender.effects
+    mask = store.mask
+    if not mask & _DEFENSIVE:
+        return damage
+
     # 1) Evade: 100% уклонение от одного удара
-    for eff in list(defender.status_effects):
-        if eff["effect"] == "evade":
-            print(f"{defender.name} уклоняется от атаки!")
-            defender.status_effects.remove(eff)
-            return 0
+    if mask & _EVADE:
+        emit = defender.battle.emit
+        if emit:
+            emit(Evaded(defender))
+        store.remove(store.get("evade"))
+        return 0
 
     # 2) reduce_damage — уменьшение входящего урона
-    for eff in defender.status_effects:
-        if eff["effect"] == "reduce_damage":
-            raw = eff.get("power", _STATUS_CFG["reduce_damage"]["damage_multiplier"])
-            mult = 1.0 - raw if raw <= 1.0 else raw
-            print(f"{defender.name} снижает урон ×{mult:.2f}.")
-            damage = int(damage * mult)
-            break
+    if mask & _REDUCE:
+        eff = store.get("reduce_damage")
+        raw = eff.get("power", defender.battle.config.status_effects["reduce_damage"].damage_multiplier)
+        mult = 1.0 - raw if raw <= 1.0 else raw
+        emit = defender.battle.emit
+        if emit:
+            emit(DamageReduced(defender, mult))
+        damage = int(damage * mult)
 
     # 3) magic_shield — поглощение щитом
-    for eff in list(defender.status_effects):
-        if eff["effect"] != "magic_shield":
-            continue
-        frac = eff.get("power", _STATUS_CFG["magic_shield"]["absorb_amount"])
+    if mask & _SHIELD:
+        eff = store.get("magic_shield")
+        frac = eff.get("power", defender.battle.config.status_effects["magic_shield"].absorb_amount)
         max_absorb = int(defender.max_health * frac)
         used = eff.get("used", 0)
         to_absorb = min(max_absorb - used, damage)
         damage -= to_absorb
         eff["used"] = used + to_absorb
-        print(
-            f"{defender.name} щит поглотил {to_absorb} урона "
-            f"(осталось {max_absorb - eff['used']})."
-        )
+        emit = defender.battle.emit
+        if emit:
+            emit(ShieldAbsorbed(defender, to_absorb, max_absorb - eff["used"]))
         if eff["used"] >= max_absorb:
-            defender.status_effects.remove(eff)
-            print(f"{defender.name} теряет эффект magic_shield.")
-        break
+            store.remove(eff)
+            if emit:
+                emit(EffectExpired(defender, "magic_shield", "depleted"))
 
     return damage
 
@@ -112,17 +142,20 @@ def apply_extra_turn(combatant: "Combatant") -> bool:
     """
     Проверяет эффект extra_turn и даёт дополнительный ход.
     """
-    for eff in list(combatant.status_effects):
-        if eff["effect"] == "extra_turn":
-            combatant.status_effects.remove(eff)
-            print(f"{combatant.name} получает дополнительный ход!")
-            return True
-    return False
+    store = combatant.effects
+    if not store.mask & _EXTRA_TURN:
+        return False
+    store.remove(store.get("extra_turn"))
+    emit = combatant.battle.emit
+    if emit:
+        emit(ExtraTurn(combatant))
+    return True
 
 
 def end_of_turn(combatant: "Combatant") -> None:
     """
-    В конце хода наносим периодический урон и снимаем duration.
+    В конце хода наносим периодический урон, двигаем часы хода и снимаем
+    истёкшие эффекты.
     """
     _apply_periodic_damage(combatant)
     combatant.tick_effects()
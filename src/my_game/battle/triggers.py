@@ -0,0 +1,108 @@
+# src/my_game/battle/triggers.py
+"""
+Индекс триггеров навыков и битсет готовых навыков.
+
+Триггер навыка сводится к одному биту состояния участника:
+  • always          — ALWAYS (есть всегда);
+  • on_low_hp       — SELF_LOW: своё HP ниже порога;
+  • if_enemy_low_hp — ENEMY_LOW: HP цели ниже порога;
+  • on_fatal_hit    — FATAL: последний входящий удар не меньше HP;
+  • if_first        — FIRST: участник ещё не ходил.
+Неизвестный триггер не даёт бита — навык с ним никогда не готов.
+
+SkillBook — навыки участника по одному конфигу: бит каждого навыка, маска
+готовых по триггерам для каждого из 32 состояний, маски «хватает маны» по
+отсортированным ценам. Готовность навыка — AND трёх масок и маски
+кулдаунов (Combatant.ready_skills), без обхода навыков и строк триггеров.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from typing import Dict, Iterable, Tuple
+
+from ..config_defs import GameConfig
+
+ALWAYS = 1
+SELF_LOW = 2
+ENEMY_LOW = 4
+FATAL = 8
+FIRST = 16
+
+TRIGGER_BITS: Dict[str, int] = {
+    "always": ALWAYS,
+    "on_low_hp": SELF_LOW,
+    "if_enemy_low_hp": ENEMY_LOW,
+    "on_fatal_hit": FATAL,
+    "if_first": FIRST,
+}
+_STATES = 32
+
+
+def _threshold(config: GameConfig, trigger: str) -> float:
+    tdef = config.triggers.get(trigger)
+    return tdef.threshold if tdef is not None and tdef.threshold is not None else 0.0
+
+
+class SkillBook:
+    """Скомпилированные навыки участника (по снимку конфига)."""
+
+    __slots__ = (
+        "config",
+        "bits",
+        "by_state",
+        "costs",
+        "cost_masks",
+        "low_hp",
+        "enemy_low_hp",
+    )
+
+    def __init__(self, config: GameConfig, skills: Iterable[str]) -> None:
+        self.config = config
+        self.bits: Dict[str, int] = {}
+        by_trigger: Dict[int, int] = {}
+        by_cost: Dict[int, int] = {}
+        for name in skills:
+            sdef = config.skills.get(name)
+            if sdef is None or name in self.bits:
+                continue
+            bit = self.bits[name] = 1 << len(self.bits)
+            tbit = TRIGGER_BITS.get(sdef.trigger, 0)
+            by_trigger[tbit] = by_trigger.get(tbit, 0) | bit
+            by_cost[sdef.mana_cost] = by_cost.get(sdef.mana_cost, 0) | bit
+
+        # состояние (набор битов триггеров) → навыки, чей триггер выполнен
+        self.by_state: Tuple[int, ...] = tuple(
+            sum(mask for tbit, mask in by_trigger.items() if tbit & state)
+            for state in range(_STATES)
+        )
+
+        # цена → навыки не дороже неё (накопительно по возрастанию цены)
+        self.costs: Tuple[int, ...] = tuple(sorted(by_cost))
+        masks, acc = [], 0
+        for cost in self.costs:
+            acc |= by_cost[cost]
+            masks.append(acc)
+        self.cost_masks: Tuple[int, ...] = tuple(masks)
+
+        self.low_hp = _threshold(config, "on_low_hp")
+        self.enemy_low_hp = _threshold(config, "if_enemy_low_hp")
+
+    def affordable(self, mana: float) -> int:
+        """Маска навыков, на которые хватает маны."""
+        i = bisect_right(self.costs, mana)
+        return self.cost_masks[i - 1] if i else 0
+
+
+# (конфиг, навыки) → книга; у героев одного класса и уровня она общая
+_BOOKS: Dict[Tuple[int, Tuple[str, ...]], SkillBook] = {}
+
+
+def skill_book(config: GameConfig, skills: Iterable[str]) -> SkillBook:
+    key = (id(config), tuple(skills))
+    book = _BOOKS.get(key)
+    if book is None or book.config is not config:
+        if len(_BOOKS) > 256:
+            _BOOKS.clear()  # старые снимки конфига после перезагрузок
+        book = _BOOKS[key] = SkillBook(config, key[1])
+    return book
@@ -1,7 +1,10 @@
 # src/my_game/characters/character_class.py
 
 from enum import Enum, auto
-from ..config import CONFIG
+from typing import Mapping, Tuple
+
+from ..config import current
+from ..config_defs import ClassDef
 
 
 class CharacterClass(Enum):
@@ -9,71 +12,77 @@ class CharacterClass(Enum):
     MAGE = auto()
     ROGUE = auto()
 
+    @property
+    def defn(self) -> ClassDef:
+        """Скомпилированное определение класса."""
+        return current().classes[self.name]
+
     @property
     def data(self) -> dict:
-        return CONFIG["characters"][self.name]
+        """Сырой раздел characters.yaml (для отладки и старого кода)."""
+        return current().raw["characters"][self.name]
 
     @property
     def display_name(self) -> str:
-        return self.data["display_name"]
+        return self.defn.display_name
 
     # — базовые статы
     @property
-    def base_health(self) -> int:
-        return self.data["base_health"]
+    def base_health(self) -> float:
+        return self.defn.base_health
 
     @property
-    def base_strength(self) -> int:
-        return self.data["base_strength"]
+    def base_strength(self) -> float:
+        return self.defn.base_strength
 
     @property
-    def base_agility(self) -> int:
-        return self.data["base_agility"]
+    def base_agility(self) -> float:
+        return self.defn.base_agility
 
     @property
-    def base_intelligence(self) -> int:
-        return self.data["base_intelligence"]
+    def base_intelligence(self) -> float:
+        return self.defn.base_intelligence
 
     @property
-    def base_defense(self) -> int:
-        return self.data.get("base_defense", 0)
+    def base_defense(self) -> float:
+        return self.defn.base_defense
 
     @property
     def base_accuracy(self) -> float:
-        return self.data.get("base_accuracy", 0.8)
+        return self.defn.base_accuracy
 
     @property
     def base_crit_chance(self) -> float:
-        return self.data.get("base_crit_chance", 0.05)
+        return self.defn.base_crit_chance
 
     @property
     def base_dodge_chance(self) -> float:
-        return self.data.get("base_dodge_chance", 0.03)
+        return self.defn.base_dodge_chance
 
     # — мана
     @property
-    def base_mana(self) -> int:
-        return self.data.get("base_mana", 0)
+    def base_mana(self) -> float:
+        return self.defn.base_mana
 
     @property
-    def mana_regen(self) -> int:
-        return self.data.get("mana_regen", 0)
+    def mana_regen(self) -> float:
+        return self.defn.mana_regen
 
     # — рост
     @property
-    def stat_growth(self) -> dict:
-        return CONFIG["growth"][self.name]
+    def stat_growth(self) -> Mapping[str, float]:
+        return self.defn.growth
 
     # — навыки
     @property
-    def skills_by_level(self) -> dict:
-        return self.data.get("skills", {})
+    def skills_by_level(self) -> Mapping[int, Tuple[str, ...]]:
+        return self.defn.skills_by_level
 
     # — коэффициенты урона
     @property
     def phys_coeff(self) -> float:
-        return self.data.get("phys_coeff", 1.0)
+        return self.defn.phys_coeff
 
     @property
     def mag_coeff(self) -> float:
-        return self.data.get("mag_coeff", 1.0)
+        return self.defn.mag_coeff
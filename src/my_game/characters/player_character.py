@@ -3,11 +3,13 @@ from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Optional
 
 from ..base.combatant import Combatant
-from ..config import CONFIG
+from ..base.stats import STATS, Modifier
+from ..config import current
 from .character_class import CharacterClass
 from ..battle.enums import Element, DamageSource, CritType
 from ..battle.damage import check_hit, calc_damage
 from ..battle.status import before_action
+from ..battle.events import Hit, Miss, ExpGained, LevelUp, SkillLearned
 from ..items.item import GearItem, PotionItem
 from ..items.enums import ItemSlot, ItemClass
 
@@ -15,6 +17,24 @@ if TYPE_CHECKING:
     from .player import Player
 
 
+# стат → (ключ в growth, целый ли прирост) — порядок как в прежнем level_up
+_GROWTH = (
+    ("max_health", "health", True),
+    ("strength", "strength", True),
+    ("agility", "agility", True),
+    ("intelligence", "intelligence", True),
+    ("defense", "defense", True),
+    ("base_mana", "mana", True),
+    ("mana_regen", "mana_regen", False),
+    ("accuracy", "accuracy", False),
+    ("crit_chance", "crit_chance", False),
+    ("dodge_chance", "dodge_chance", False),
+)
+
+# имена статов экипировки → атрибуты участника
+_GEAR_STATS = {"health": "max_health", "mana": "base_mana"}
+
+
 @dataclass
 class PlayerCharacter(Combatant):
     """
@@ -40,12 +60,12 @@ class PlayerCharacter(Combatant):
     def __post_init__(self):
         super().__post_init__()
         if self.char_class:
-            self._growth = self.char_class.stat_growth.copy()
-            data = self.char_class.data
+            d = self.char_class.defn
+            self._growth = dict(d.growth)
             # initial mana из класса
-            self.base_mana = float(data.get("base_mana", 0))
+            self.base_mana = d.base_mana
             self.mana = self.base_mana
-            self.mana_regen = float(data.get("mana_regen", 0))
+            self.mana_regen = d.mana_regen
 
     @staticmethod
     def from_config(
@@ -55,102 +75,49 @@ class PlayerCharacter(Combatant):
         name_override: str | None = None,
     ) -> PlayerCharacter:
         cls = CharacterClass[class_name]
-        growth = cls.stat_growth
-        data = cls.data
-
-        def sanitize(val) -> str:
-            if isinstance(val, str):
-                return val.split("#", 1)[0].strip()
-            return val
-
-        def get_num(key: str, default: float = 0.0) -> float:
-            raw = data.get(key, default)
-            raw = sanitize(raw)
-            return float(raw)
-
-        def get_growth(key: str, default: float = 0.0) -> float:
-            raw = growth.get(key, default)
-            raw = sanitize(raw)
-            return float(raw)
-
-        def calc(base: float, per: float) -> float:
-            return base + per * (level - 1)
-
-        # читаем базовые характеристики
-        base_health = get_num("base_health")
-        base_strength = get_num("base_strength")
-        base_agility = get_num("base_agility")
-        base_intelligence = get_num("base_intelligence")
-        base_defense = get_num("base_defense", 0.0)
-        base_accuracy = get_num("base_accuracy", 0.8)
-        base_crit = get_num("base_crit_chance", 0.05)
-        base_dodge = get_num("base_dodge_chance", 0.03)
-
-        # читаем приросты
-        h_growth = get_growth("health")
-        s_growth = get_growth("strength")
-        a_growth = get_growth("agility")
-        i_growth = get_growth("intelligence")
-        d_growth = get_growth("defense")
-        acc_growth = get_growth("accuracy")
-        crit_growth = get_growth("crit_chance")
-        dodge_growth = get_growth("dodge_chance")
-        mana_growth = get_growth("mana")
-        mana_regen_growth = get_growth("mana_regen")
+        # статы, мана и умения уже посчитаны при загрузке конфига
+        # (вместе с пассивкой Evasion Mastery) — здесь только заполнение
+        st = current().level_stats(class_name, level)
 
-        # создаём персонажа
         pc = PlayerCharacter(
             name=name_override or cls.display_name,
             level=level,
-            max_health=int(calc(base_health, h_growth)),
-            strength=int(calc(base_strength, s_growth)),
-            agility=int(calc(base_agility, a_growth)),
-            intelligence=int(calc(base_intelligence, i_growth)),
-            defense=calc(base_defense, d_growth),
-            accuracy=calc(base_accuracy, acc_growth),
-            crit_chance=calc(base_crit, crit_growth),
-            dodge_chance=calc(base_dodge, dodge_growth),
+            max_health=st.max_health,
+            strength=st.strength,
+            agility=st.agility,
+            intelligence=st.intelligence,
+            defense=st.defense,
+            accuracy=st.accuracy,
+            crit_chance=st.crit_chance,
+            dodge_chance=st.dodge_chance,
+            skills=list(st.skills),
             char_class=cls,
             owner=owner,
         )
 
         # ресурсы по формуле роста
-        base_mana_val = calc(get_num("base_mana", 0), mana_growth)
-        pc.base_mana = int(base_mana_val)
+        pc.base_mana = st.base_mana
         pc.mana = pc.base_mana
-        pc.mana_regen = calc(get_num("mana_regen", 0), mana_regen_growth)
+        pc.mana_regen = st.mana_regen
 
-        # активные и пассивные умения
-        pc.skills = [
-            skill
-            for lvl_req, skills in cls.skills_by_level.items()
-            if level >= lvl_req
-            for skill in skills
-        ]
-
-        # ───── PASSIVE: Evasion Mastery ─────
-        if "Evasion Mastery" in pc.skills:
-            bonus = CONFIG["skills"]["Evasion Mastery"]["power"]
-            # добавляем округлённо
-            add = int(pc.agility * bonus + 0.5)
-            pc.agility += add
-
-        # ───── PASSIVE: Last Stand ─────
-        if "Last Stand" in pc.skills:
-            pc.apply_effect({"effect": "survive_one_turn"})
+        # пассивки, срабатывающие при сборке (Last Stand)
+        for hook in pc.passives.ready:
+            hook(pc)
 
         return pc
 
     def attack(self, target: Combatant) -> None:
-        """Обычная атака с учётом пассивки Cleave."""
+        """Обычная атака; после попадания — хуки after_attack (Cleave)."""
         visible = getattr(self, "_visible_enemies", [target])
         allowed = before_action(self, visible)
         if not allowed:
             return
         if target not in allowed:
             target = allowed[0]
+        emit = self.battle.emit
         if not check_hit(self, target):
-            print(f"{self.name} промахивается! (шанс {self._last_hit:.1%})")
+            if emit:
+                emit(Miss(self, target, self._last_hit))
             return
 
         dmg = calc_damage(
@@ -159,68 +126,56 @@ class PlayerCharacter(Combatant):
             element=Element.PHYSICAL,
             source=DamageSource.NORMAL,
         )
-        self._log_hit(target, dmg)
+        if emit:
+            emit(
+                Hit(
+                    self,
+                    target,
+                    dmg,
+                    self._last_crit,
+                    self._last_weak,
+                    self._last_resist,
+                )
+            )
         target.take_damage(dmg)
 
-        # PASSIVE: Cleave
-        if "Cleave" in self.skills:
-            splash_pct = CONFIG["skills"]["Cleave"]["power"]
-            raw = dmg * splash_pct
-            splash_dmg = max(1, int(raw + 0.5))
-            for other in getattr(self, "_visible_enemies", []):
-                if other is not target and other.is_alive:
-                    print(
-                        f"{self.name} (Cleave) наносит {splash_dmg} урона {other.name}."
-                    )
-                    other.take_damage(splash_dmg)
-
-    def _log_hit(self, target: Combatant, dmg: int) -> None:
-        msg = f"{self.display_name} ({self.char_class.display_name}) "
-        if getattr(self, "_last_crit", False):
-            msg += "НАНОСИТ КРИТ! "
-        msg += f"наносит {dmg} урона"
-        if getattr(self, "_last_weak", False):
-            msg += " (слабость)"
-        elif getattr(self, "_last_resist", False):
-            msg += " (резист)"
-        print(msg + ".")
+        for hook in self.passives.after_attack:
+            hook(self, target, dmg)
 
     def exp_to_next(self) -> int:
-        curve = CONFIG["growth"]["exp_curve"]
-        return int(curve["base"] * (self.level ** curve["exponent"]))
+        cfg = current()
+        return int(cfg.exp_base * (self.level ** cfg.exp_exponent))
 
     def level_up(self) -> None:
         g = self._growth
         self.level += 1
-        self.max_health += int(g.get("health", 0))
-        self.strength += int(g.get("strength", 0))
-        self.agility += int(g.get("agility", 0))
-        self.intelligence += int(g.get("intelligence", 0))
-        self.defense += int(g.get("defense", 0))
-        self.base_mana += int(g.get("mana", 0))
-        self.mana_regen += g.get("mana_regen", 0.0)
-        self.accuracy += g.get("accuracy", 0.0)
-        self.crit_chance += g.get("crit_chance", 0.0)
-        self.dodge_chance += g.get("dodge_chance", 0.0)
-        self.health = self.max_health
-        print(
-            f"🔺 {self.name} достиг уровня {self.level}! "
-            f"Следующий уровень за {self.exp_to_next()} XP."
+        # рост уровня — слой growth (целые статы растут на целое)
+        self.stats.add(
+            *(
+                Modifier(stat, int(g.get(key, 0)) if integral else g.get(key, 0.0), "growth")
+                for stat, key, integral in _GROWTH
+            )
         )
+        self.health = self.max_health
+        emit = self.battle.emit
+        if emit:
+            emit(LevelUp(self, self.level, self.exp_to_next()))
 
         # Новые умения на этом уровне
         new_skills = self.char_class.skills_by_level.get(self.level, [])
         for skill in new_skills:
             if skill not in self.skills:
                 self.skills.append(skill)
-                print(f"🔓 {self.name} изучил навык {skill}!")
+                if emit:
+                    emit(SkillLearned(self, skill))
+        if new_skills:
+            self.refresh_skills()
 
     def add_exp(self, amount: int) -> None:
         self.exp += amount
-        print(
-            f"🏅 {self.name} получает {amount} XP "
-            f"(итого {self.exp}/{self.exp_to_next()})."
-        )
+        emit = self.battle.emit
+        if emit:
+            emit(ExpGained(self, amount, self.exp, self.exp_to_next()))
         while self.exp >= self.exp_to_next():
             self.exp -= self.exp_to_next()
             self.level_up()
@@ -238,17 +193,17 @@ class PlayerCharacter(Combatant):
         if item.allowed_classes and cls not in item.allowed_classes:
             raise ValueError("Item cannot be equipped by this class")
 
+        # модификаторы предмета — слой gear; прежний предмет снимается
+        # тем же пересчётом
         prev = self.equipment.get(item.slot)
-        if prev:
-            for stat, val in prev.stats.items():
-                attr = "max_health" if stat == "health" else stat
-                if hasattr(self, attr):
-                    setattr(self, attr, getattr(self, attr) - val)
-
-        for stat, val in item.stats.items():
-            attr = "max_health" if stat == "health" else stat
-            if hasattr(self, attr):
-                setattr(self, attr, getattr(self, attr) + val)
+        self.stats.replace(
+            prev,
+            (
+                Modifier(_GEAR_STATS.get(stat, stat), val, "gear", source=item)
+                for stat, val in item.stats.items()
+                if _GEAR_STATS.get(stat, stat) in STATS
+            ),
+        )
         self.equipment[item.slot] = item
         return prev
 
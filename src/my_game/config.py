@@ -1,7 +1,12 @@
 # src/my_game/config.py
 
-import yaml
+import hashlib
+import marshal
+import os
+import sys
+import threading
 from pathlib import Path
+from typing import Any, Callable, List, Mapping, Optional
 
 # Путь к папке src/ — две папки выше текущего файла, затем в config/
 _CONFIG_DIR = Path(__file__).parent.parent / "config"
@@ -16,45 +21,225 @@ _STATIC_FILES = {
     "gear": "gear.yaml",
 }
 
-CONFIG: dict[str, dict] = {}
-
-# 1) Загружаем статические файлы
-for key, fname in _STATIC_FILES.items():
-    path = _CONFIG_DIR / fname
-    if not path.exists():
-        raise FileNotFoundError(f"Cannot find config file: {path}")
-    if key == "skills":
-        # skills.yaml может содержать несколько документов
-        merged: dict = {}
-        with open(path, encoding="utf-8") as f:
-            for doc in yaml.safe_load_all(f):
-                if isinstance(doc, dict):
-                    merged.update(doc)
-        data = merged
-    else:
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f) or {}
-
-    # Распаковываем {key: {...}} → {...}
-    if isinstance(data, dict) and key in data and len(data) == 1:
-        CONFIG[key] = data[key]
-    else:
-        CONFIG[key] = data
-
-# 2) Загружаем все AI‑конфиги ai_*.yaml
-ai_configs: dict[str, dict] = {}
-for ai_file in _CONFIG_DIR.glob("ai_*.yaml"):
-    with open(ai_file, encoding="utf-8") as f:
-        doc = yaml.safe_load(f) or {}
-    # Ожидаем структуру {role: {...}}
-    if isinstance(doc, dict) and len(doc) == 1:
-        role, cfg = next(iter(doc.items()))
-        ai_configs[role] = cfg
-    else:
-        # На случай если в файле список документов
-        for sub in doc if isinstance(doc, list) else [doc]:
-            if isinstance(sub, dict) and len(sub) == 1:
-                role, cfg = next(iter(sub.items()))
-                ai_configs[role] = cfg
-
-CONFIG["ai"] = ai_configs
+# Скомпилированный кеш: marshal слитого CONFIG рядом с YAML (в __pycache__,
+# который не попадает в git). Ключ — хеш содержимого всех исходных файлов.
+# Меняйте _CACHE_VERSION, если меняется способ сборки CONFIG.
+_CACHE_VERSION = 1
+_CACHE_FILE = "__pycache__/config.marshal"
+# RPG_CONFIG_CACHE=0 — всегда читать YAML
+_CACHE_ENABLED = os.environ.get("RPG_CONFIG_CACHE", "1") != "0"
+
+
+def _source_files(config_dir: Path) -> list[Path]:
+    """Все YAML, из которых собирается CONFIG, в стабильном порядке."""
+    files = []
+    for fname in _STATIC_FILES.values():
+        path = config_dir / fname
+        if not path.exists():
+            raise FileNotFoundError(f"Cannot find config file: {path}")
+        files.append(path)
+    files.extend(sorted(config_dir.glob("ai_*.yaml")))
+    return files
+
+
+def _fingerprint(files: list[Path]) -> str:
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{_CACHE_VERSION}:{sys.version_info[:2]}".encode())
+    for path in files:
+        h.update(path.name.encode())
+        h.update(b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def _parse_yaml(config_dir: Path) -> dict[str, dict]:
+    """Разобрать все YAML в один словарь (медленный путь)."""
+    # PyYAML импортируем только здесь: при тёплом кеше он не нужен вовсе.
+    # libyaml, если PyYAML собран с ним, — в разы быстрее чистого Python.
+    import yaml
+
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    config: dict[str, dict] = {}
+
+    # 1) Загружаем статические файлы
+    for key, fname in _STATIC_FILES.items():
+        path = config_dir / fname
+        if key == "skills":
+            # skills.yaml может содержать несколько документов
+            merged: dict = {}
+            with open(path, encoding="utf-8") as f:
+                for doc in yaml.load_all(f, Loader=loader):
+                    if isinstance(doc, dict):
+                        merged.update(doc)
+            data = merged
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = yaml.load(f, Loader=loader) or {}
+
+        # Распаковываем {key: {...}} → {...}
+        if isinstance(data, dict) and key in data and len(data) == 1:
+            config[key] = data[key]
+        else:
+            config[key] = data
+
+    # 2) Загружаем все AI‑конфиги ai_*.yaml
+    ai_configs: dict[str, dict] = {}
+    for ai_file in sorted(config_dir.glob("ai_*.yaml")):
+        with open(ai_file, encoding="utf-8") as f:
+            doc = yaml.load(f, Loader=loader) or {}
+        # Ожидаем структуру {role: {...}}
+        if isinstance(doc, dict) and len(doc) == 1:
+            role, cfg = next(iter(doc.items()))
+            ai_configs[role] = cfg
+        else:
+            # На случай если в файле список документов
+            for sub in doc if isinstance(doc, list) else [doc]:
+                if isinstance(sub, dict) and len(sub) == 1:
+                    role, cfg = next(iter(sub.items()))
+                    ai_configs[role] = cfg
+
+    config["ai"] = ai_configs
+    return config
+
+
+def _read_cache(path: Path, key: str):
+    try:
+        with open(path, "rb") as f:
+            cached_key, data = marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        return None
+    return data if cached_key == key else None
+
+
+def _write_cache(path: Path, key: str, data: dict) -> None:
+    # пишем во временный файл и подменяем — параллельные процессы не увидят
+    # недописанный кеш; если папка только для чтения, просто работаем без кеша
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        path.parent.mkdir(exist_ok=True)
+        with open(tmp, "wb") as f:
+            marshal.dump((key, data), f)
+        os.replace(tmp, path)
+    except (OSError, ValueError):
+        tmp.unlink(missing_ok=True)
+
+
+def config_fingerprint(config_dir: Path = _CONFIG_DIR) -> str:
+    """Хеш текущего содержимого YAML‑файлов."""
+    return _fingerprint(_source_files(config_dir))
+
+
+def load_config(
+    config_dir: Path = _CONFIG_DIR,
+    use_cache: bool = _CACHE_ENABLED,
+    key: Optional[str] = None,
+) -> dict:
+    """
+    Собрать CONFIG из YAML. С кешем: если хеш исходников совпадает с
+    сохранённым — marshal.load за миллисекунды, иначе разбор YAML и
+    перезапись кеша. `key` — уже посчитанный config_fingerprint().
+    """
+    if not use_cache:
+        _source_files(config_dir)
+        return _parse_yaml(config_dir)
+
+    key = key or config_fingerprint(config_dir)
+    cache_path = config_dir / _CACHE_FILE
+    data = _read_cache(cache_path, key)
+    if data is None:
+        data = _parse_yaml(config_dir)
+        _write_cache(cache_path, key, data)
+    return data
+
+
+# 3) Компилируем в типизированные определения (ошибки конфига — здесь, при загрузке)
+from .config_defs import GameConfig, _thawed, compile_config  # noqa: E402
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Снимки конфига и горячая перезагрузка
+# ──────────────────────────────────────────────────────────────────────────────
+# Текущий снимок — один неизменяемый GameConfig. reload() собирает новый и
+# подменяет ссылку одним присваиванием: кто уже взял снимок (BattleContext
+# берёт его при создании), доигрывает на нём, новые бои видят новый.
+
+_reload_lock = threading.Lock()
+_validators: List[Callable[[GameConfig], None]] = []
+_listeners: List[Callable[[GameConfig], None]] = []
+
+
+def _build(config_dir: Path, version: int) -> GameConfig:
+    key = config_fingerprint(config_dir)
+    raw = load_config(config_dir, key=key)
+    return compile_config(raw, version=version, fingerprint=key)
+
+
+_current: GameConfig = _build(_CONFIG_DIR, version=1)
+
+# Снимок на момент импорта. Долгоживущий код (бот) должен брать current()
+# или battle.config — эти имена после reload() не меняются. CONFIG — сырой
+# YAML того же снимка (только для чтения), без повторной загрузки.
+DEFS: GameConfig = _current
+CONFIG: Mapping[str, Any] = _current.raw
+
+
+def current() -> GameConfig:
+    """Текущий снимок конфига."""
+    return _current
+
+
+def add_validator(fn: Callable[[GameConfig], None]) -> None:
+    """
+    Дополнительная проверка снимка (например, конфиги ИИ). Вызывается для
+    текущего снимка сразу и для каждого нового до подмены; ConfigError
+    отменяет перезагрузку.
+    """
+    fn(_current)
+    _validators.append(fn)
+
+
+def on_reload(fn: Callable[[GameConfig], None]) -> None:
+    """Подписаться на подмену снимка."""
+    _listeners.append(fn)
+
+
+def reload(config_dir: Path = _CONFIG_DIR, force: bool = False) -> Optional[GameConfig]:
+    """
+    Перечитать конфиг, если YAML изменился. Возвращает новый снимок или None,
+    если менять нечего. При ошибке в YAML бросает исключение, а текущий снимок
+    остаётся прежним.
+    """
+    with _reload_lock:
+        if not force and config_fingerprint(config_dir) == _current.fingerprint:
+            return None
+        snap = _build(config_dir, version=_current.version + 1)
+        _swap(snap)
+    for fn in _listeners:
+        fn(snap)
+    return snap
+
+
+def dump_snapshot(snap: GameConfig) -> bytes:
+    """Сырой YAML снимка в marshal — чтобы передать снимок в другой процесс."""
+    return marshal.dumps(_thawed(snap.raw))
+
+
+def install(payload: bytes, *, version: int, fingerprint: str) -> GameConfig:
+    """
+    Сделать текущим снимок из dump_snapshot() другого процесса — без чтения
+    YAML с диска. Проверки те же, что у reload(); при ошибке бросает
+    исключение, а текущий снимок остаётся прежним.
+    """
+    snap = compile_config(marshal.loads(payload), version=version, fingerprint=fingerprint)
+    with _reload_lock:
+        _swap(snap)
+    for fn in _listeners:
+        fn(snap)
+    return snap
+
+
+def _swap(snap: GameConfig) -> None:
+    global _current
+    for check in _validators:
+        check(snap)
+    _current = snap
@@ -0,0 +1,969 @@
+# src/my_game/config_defs.py
+"""
+Типизированные определения из YAML: навыки, статус‑эффекты, шаблоны монстров,
+классы героев и настройки ИИ.
+
+compile_config() один раз собирает их из сырого CONFIG и сразу проверяет:
+неизвестный ключ, нечисловое значение или ссылка на несуществующий навык
+падают при загрузке с ConfigError, а не KeyError посреди боя. Горячий код
+держит прямые ссылки на эти объекты вместо цепочек CONFIG[...][...].
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Any, Callable, ClassVar, Dict, Mapping, Optional, Tuple
+
+from .base.stats import STATS
+from .battle.effects import register_effects
+from .battle.enums import CritType, Element
+from .monsters.monster_type import MonsterType
+
+
+class ConfigError(ValueError):
+    """Ошибка в YAML‑конфиге, найденная при загрузке."""
+
+
+SKILL_TYPES = frozenset({"damage", "buff", "debuff", "utility", "passive"})
+TARGET_MODES = frozenset(
+    {"enemy", "single_target", "all_enemies", "two_random_enemies", "team", "ally", "self"}
+)
+# режимы, целящие в своих: provoke их не перенаправляет
+ALLY_TARGET_MODES = frozenset({"team", "ally", "self"})
+DECREMENT_MODES = frozenset({"end_of_turn", "none"})
+TURN_ORDER_MODES = frozenset({"agility_priority", "speed", "random"})
+STACKING_MODES = frozenset({"refresh", "independent", "stack"})
+GROWTH_STATS = frozenset(
+    {
+        "health",
+        "strength",
+        "agility",
+        "intelligence",
+        "defense",
+        "accuracy",
+        "crit_chance",
+        "dodge_chance",
+        "mana",
+        "mana_regen",
+    }
+)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Помощники разбора
+# ──────────────────────────────────────────────────────────────────────────────
+def _num(value: Any, where: str) -> float:
+    """Число из YAML; строки вида "0.015# 1.5 %" (комментарий без пробела) тоже."""
+    if isinstance(value, str):
+        value = value.split("#", 1)[0].strip()
+    if isinstance(value, bool):
+        raise ConfigError(f"{where}: ожидалось число, получено {value!r}")
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        raise ConfigError(f"{where}: ожидалось число, получено {value!r}") from None
+
+
+def _opt_num(value: Any, where: str) -> Optional[float]:
+    return None if value is None else _num(value, where)
+
+
+def _int(value: Any, where: str) -> int:
+    num = _num(value, where)
+    if num != int(num):
+        raise ConfigError(f"{where}: ожидалось целое, получено {value!r}")
+    return int(num)
+
+
+def _section(data: Any, where: str) -> Dict[str, Any]:
+    if not isinstance(data, dict):
+        raise ConfigError(f"{where}: ожидался словарь, получено {type(data).__name__}")
+    return data
+
+
+def _check_keys(data: Mapping, allowed: frozenset, where: str) -> None:
+    extra = set(data) - allowed
+    if extra:
+        raise ConfigError(f"{where}: неизвестные ключи {sorted(extra)}")
+
+
+def _require(data: Mapping, keys: Tuple[str, ...], where: str) -> None:
+    missing = [k for k in keys if k not in data]
+    if missing:
+        raise ConfigError(f"{where}: нет обязательных ключей {missing}")
+
+
+def _frozen(d: Dict) -> Mapping:
+    return MappingProxyType(d)
+
+
+def _deep_frozen(obj: Any) -> Any:
+    """Сырой YAML только для чтения: dict → mappingproxy, list → tuple."""
+    if isinstance(obj, dict):
+        return MappingProxyType({k: _deep_frozen(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return tuple(_deep_frozen(v) for v in obj)
+    return obj
+
+
+def _thawed(obj: Any) -> Any:
+    """Обратно к обычному YAML: mappingproxy → dict, tuple → list."""
+    if isinstance(obj, Mapping):
+        return {k: _thawed(v) for k, v in obj.items()}
+    if isinstance(obj, tuple):
+        return [_thawed(v) for v in obj]
+    return obj
+
+
+def _path(data: Mapping, where: str, *keys: str) -> Any:
+    """data[k1][k2]… с понятной ошибкой вместо KeyError."""
+    for i, key in enumerate(keys):
+        data = _section(data, ".".join((where,) + keys[:i]))
+        if key not in data:
+            raise ConfigError(f"{'.'.join((where,) + keys[:i])}: нет ключа {key!r}")
+        data = data[key]
+    return data
+
+
+def _names(value: Any, where: str) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if not isinstance(value, list):
+        raise ConfigError(f"{where}: ожидался список, получено {value!r}")
+    return tuple(str(v) for v in value)
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Навыки и статус‑эффекты
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class SkillDef:
+    """
+    Навык из skills.yaml. Тип навыка — подкласс (DamageSkill, EffectSkill,
+    UtilitySkill, PassiveSkill); исполнитель типа — handler(user, targets,
+    skill), его привязывает battle.skill_executor.
+    """
+
+    handler: ClassVar[Optional[Callable[..., None]]] = None
+
+    name: str
+    type: str
+    target: str = "enemy"
+    trigger: str = "always"
+    power: Optional[float] = None
+    secondary_power: float = 0.0
+    element: Element = Element.PHYSICAL
+    mana_cost: int = 0
+    effect: Optional[str] = None
+    duration: Optional[int] = None
+    cooldown: int = 0
+    success_chance: float = 1.0
+    description: str = ""
+    # тип крита при попадании (HEAVY для if_first / if_enemy_low_hp)
+    crit: CritType = CritType.NORMAL
+
+    def effect_payload(self) -> Dict[str, Any]:
+        """Новый словарь эффекта для Combatant.apply_effect."""
+        payload: Dict[str, Any] = {"effect": self.effect}
+        if self.duration is not None:
+            payload["duration"] = self.duration
+        if self.power is not None:
+            payload["power"] = self.power
+        return payload
+
+
+class DamageSkill(SkillDef):
+    __slots__ = ()
+
+
+class EffectSkill(SkillDef):
+    """buff / debuff — накладывают эффект на цели."""
+
+    __slots__ = ()
+
+
+class UtilitySkill(SkillDef):
+    __slots__ = ()
+
+
+class PassiveSkill(SkillDef):
+    """Не применяется — работает через хуки (battle.passives)."""
+
+    __slots__ = ()
+
+
+_SKILL_CLASSES = {
+    "damage": DamageSkill,
+    "buff": EffectSkill,
+    "debuff": EffectSkill,
+    "utility": UtilitySkill,
+    "passive": PassiveSkill,
+}
+
+# триггеры, при которых навык урона критует «тяжело»
+_HEAVY_CRIT_TRIGGERS = frozenset({"if_first", "if_enemy_low_hp"})
+
+
+_SKILL_KEYS = frozenset(
+    {
+        "type",
+        "target",
+        "trigger",
+        "power",
+        "secondary_power",
+        "element",
+        "mana_cost",
+        "cost",
+        "effect",
+        "duration",
+        "cooldown",
+        "success_chance",
+        "description",
+    }
+)
+
+
+def _compile_skill(name: str, data: Any, triggers: Mapping) -> SkillDef:
+    where = f"skills.{name}"
+    data = _section(data, where)
+    _check_keys(data, _SKILL_KEYS, where)
+    _require(data, ("type",), where)
+
+    kind = data["type"]
+    if kind not in SKILL_TYPES:
+        raise ConfigError(f"{where}.type: неизвестный тип {kind!r}")
+    target = data.get("target", "enemy")
+    if target not in TARGET_MODES:
+        raise ConfigError(f"{where}.target: неизвестный режим {target!r}")
+    trigger = data.get("trigger", "always")
+    if trigger not in triggers:
+        raise ConfigError(f"{where}.trigger: нет триггера {trigger!r} в skill_triggers")
+    try:
+        element = Element[data.get("element", "PHYSICAL")]
+    except KeyError:
+        raise ConfigError(f"{where}.element: неизвестная стихия {data['element']!r}") from None
+    if kind == "damage" and "power" not in data:
+        raise ConfigError(f"{where}: у навыка урона нет power")
+
+    mana_cost = data.get("mana_cost", (data.get("cost") or {}).get("mana", 0))
+    duration = data.get("duration")
+    return _SKILL_CLASSES[kind](
+        name=name,
+        type=kind,
+        target=target,
+        trigger=trigger,
+        power=_opt_num(data.get("power"), f"{where}.power"),
+        secondary_power=_num(data.get("secondary_power", 0.0), f"{where}.secondary_power"),
+        element=element,
+        mana_cost=_int(mana_cost, f"{where}.mana_cost"),
+        effect=data.get("effect"),
+        duration=None if duration is None else _int(duration, f"{where}.duration"),
+        cooldown=_int(data.get("cooldown", 0), f"{where}.cooldown"),
+        success_chance=_num(data.get("success_chance", 1.0), f"{where}.success_chance"),
+        description=data.get("description", ""),
+        crit=CritType.HEAVY if trigger in _HEAVY_CRIT_TRIGGERS else CritType.NORMAL,
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class StatusEffectDef:
+    """Правила статус‑эффекта из battle_rules.status_effects."""
+
+    name: str
+    prevents_action: bool = False
+    force_target: Optional[str] = None
+    periodic_damage: Optional[float] = None
+    duration_decrement: Optional[str] = None
+    damage_multiplier: Optional[float] = None
+    absorb_amount: Optional[float] = None
+    mana_recover: Optional[float] = None
+    grants_turn: bool = False
+    # модификатор стата на время эффекта (слой buffs): величина — power
+    # эффекта, а без него stat_value; stat_percent — доля, а не прибавка
+    stat: Optional[str] = None
+    stat_value: Optional[float] = None
+    stat_percent: bool = False
+
+
+# Эффекты без записи в status_effects (evade, survive_one_turn, …) ведут себя так
+NO_EFFECT_RULES = StatusEffectDef(name="")
+
+_EFFECT_NUMS = (
+    "periodic_damage",
+    "damage_multiplier",
+    "absorb_amount",
+    "mana_recover",
+    "stat_value",
+)
+_EFFECT_KEYS = frozenset(
+    _EFFECT_NUMS
+    + ("prevents_action", "force_target", "duration_decrement", "grants_turn")
+    + ("stat", "stat_percent")
+)
+
+
+def _compile_effect(name: str, data: Any) -> StatusEffectDef:
+    where = f"battle_rules.status_effects.{name}"
+    data = _section(data or {}, where)
+    _check_keys(data, _EFFECT_KEYS, where)
+    decrement = data.get("duration_decrement")
+    if decrement is not None and decrement not in DECREMENT_MODES:
+        raise ConfigError(f"{where}.duration_decrement: неизвестный режим {decrement!r}")
+    stat = data.get("stat")
+    if stat is not None and stat not in STATS:
+        raise ConfigError(f"{where}.stat: неизвестный стат {stat!r}")
+    return StatusEffectDef(
+        name=name,
+        prevents_action=bool(data.get("prevents_action", False)),
+        force_target=data.get("force_target"),
+        duration_decrement=decrement,
+        grants_turn=bool(data.get("grants_turn", False)),
+        stat=stat,
+        stat_percent=bool(data.get("stat_percent", False)),
+        **{k: _opt_num(data.get(k), f"{where}.{k}") for k in _EFFECT_NUMS},
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class AuraRule:
+    """Синергия отряда из battle_rules.auras.synergy_rules."""
+
+    name: str
+    requires: Mapping[str, int]  # класс → сколько живых нужно
+    stat: str
+    value: float
+    effect: str = ""
+    percent: bool = False
+
+    def holds(self, counts: Mapping[str, int]) -> bool:
+        return all(counts.get(cls, 0) >= n for cls, n in self.requires.items())
+
+
+def _compile_aura(name: str, data: Any, classes: Mapping) -> AuraRule:
+    where = f"battle_rules.auras.synergy_rules.{name}"
+    data = _section(data, where)
+    _check_keys(data, frozenset({"requires", "effect", "stat", "value", "percent"}), where)
+    _require(data, ("requires", "stat", "value"), where)
+    requires = {}
+    for cls, n in _section(data["requires"], f"{where}.requires").items():
+        if cls not in classes:
+            raise ConfigError(f"{where}.requires: нет класса {cls!r}")
+        requires[cls] = _int(n, f"{where}.requires.{cls}")
+    if data["stat"] not in STATS:
+        raise ConfigError(f"{where}.stat: неизвестный стат {data['stat']!r}")
+    return AuraRule(
+        name=name,
+        requires=_frozen(requires),
+        stat=data["stat"],
+        value=_num(data["value"], f"{where}.value"),
+        effect=str(data.get("effect", "")),
+        percent=bool(data.get("percent", False)),
+    )
+
+
+@dataclass(frozen=True, slots=True)
+class TriggerDef:
+    """Триггер навыка из battle_rules.skill_triggers."""
+
+    name: str
+    event: str
+    threshold: Optional[float] = None
+    condition: Optional[str] = None
+
+
+def _compile_trigger(name: str, data: Any) -> TriggerDef:
+    where = f"battle_rules.skill_triggers.{name}"
+    data = _section(data, where)
+    _check_keys(data, frozenset({"event", "threshold", "condition"}), where)
+    _require(data, ("event",), where)
+    if name in ("on_low_hp", "if_enemy_low_hp"):
+        _require(data, ("threshold",), where)
+    return TriggerDef(
+        name=name,
+        event=data["event"],
+        threshold=_opt_num(data.get("threshold"), f"{where}.threshold"),
+        condition=data.get("condition"),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Монстры
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class MonsterTemplate:
+    """Шаблон монстра: templates + coeffs + base_damage из monsters.yaml."""
+
+    name: str
+    base_health: int
+    base_strength: int
+    base_agility: int
+    base_intelligence: int
+    defense: float = 0.0
+    tags: Tuple[str, ...] = ()
+    resistances: Tuple[str, ...] = ()
+    weaknesses: Tuple[str, ...] = ()
+    phys_coeff: float = 1.0
+    mag_coeff: float = 1.0
+    base_damage: int = 0
+
+    @property
+    def monster_type(self) -> MonsterType:
+        return MonsterType[self.name]
+
+
+_MONSTER_KEYS = frozenset(
+    {
+        "base_health",
+        "base_strength",
+        "base_agility",
+        "base_intelligence",
+        "defense",
+        "tags",
+        "resistances",
+        "weaknesses",
+    }
+)
+
+
+def _compile_monster(name: str, data: Any, coeffs: Mapping, base_damage: Mapping) -> MonsterTemplate:
+    where = f"monsters.templates.{name}"
+    if name not in MonsterType.__members__:
+        raise ConfigError(f"{where}: нет такого MonsterType")
+    data = _section(data, where)
+    _check_keys(data, _MONSTER_KEYS, where)
+    stats = ("base_health", "base_strength", "base_agility", "base_intelligence")
+    _require(data, stats, where)
+    mc = _section(coeffs.get(name, {}), f"monsters.coeffs.{name}")
+    return MonsterTemplate(
+        name=name,
+        **{k: _int(data[k], f"{where}.{k}") for k in stats},
+        defense=_num(data.get("defense", 0), f"{where}.defense"),
+        tags=_names(data.get("tags"), f"{where}.tags"),
+        resistances=_names(data.get("resistances"), f"{where}.resistances"),
+        weaknesses=_names(data.get("weaknesses"), f"{where}.weaknesses"),
+        phys_coeff=_num(mc.get("phys_coeff", 1.0), f"monsters.coeffs.{name}.phys_coeff"),
+        mag_coeff=_num(mc.get("mag_coeff", 1.0), f"monsters.coeffs.{name}.mag_coeff"),
+        base_damage=_int(base_damage.get(name, 0), f"monsters.base_damage.{name}"),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Классы героев
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class ClassDef:
+    """Класс героя: characters.yaml + рост из growth.yaml."""
+
+    name: str
+    display_name: str
+    base_health: float
+    base_strength: float
+    base_agility: float
+    base_intelligence: float
+    base_defense: float = 0.0
+    base_accuracy: float = 0.8
+    base_crit_chance: float = 0.05
+    base_dodge_chance: float = 0.03
+    base_mana: float = 0.0
+    mana_regen: float = 0.0
+    phys_coeff: float = 1.0
+    mag_coeff: float = 1.0
+    skills_by_level: Mapping[int, Tuple[str, ...]] = field(
+        default_factory=lambda: _frozen({})
+    )
+    growth: Mapping[str, float] = field(default_factory=lambda: _frozen({}))
+
+
+@dataclass(frozen=True, slots=True)
+class LevelStats:
+    """Готовые статы героя класса на уровне — со стат‑пассивками (stat_passive)."""
+
+    level: int
+    max_health: int
+    strength: int
+    agility: int
+    intelligence: int
+    defense: float
+    accuracy: float
+    crit_chance: float
+    dodge_chance: float
+    base_mana: int
+    mana_regen: float
+    skills: Tuple[str, ...]
+
+
+# Пассивки, меняющие статы героя: навык → hook(stats, skill). Применяются
+# при сборке level_table, поэтому в бою их проверять не нужно.
+_STAT_PASSIVES: Dict[str, Callable[[Dict[str, Any], SkillDef], None]] = {}
+
+
+def stat_passive(name: str):
+    """Зарегистрировать пассивку навыка name, меняющую статы уровня."""
+
+    def register(hook):
+        _STAT_PASSIVES[name] = hook
+        return hook
+
+    return register
+
+
+@stat_passive("Evasion Mastery")
+def _evasion_mastery(stats: Dict[str, Any], skill: SkillDef) -> None:
+    # добавляем округлённо
+    stats["agility"] += int(stats["agility"] * skill.power + 0.5)
+
+
+def _level_stats(cdef: ClassDef, level: int, skills: Mapping[str, SkillDef]) -> LevelStats:
+    """Формулы PlayerCharacter.from_config: база + рост × (level − 1)."""
+    growth = cdef.growth
+
+    def calc(base: float, stat: str) -> float:
+        return base + growth.get(stat, 0.0) * (level - 1)
+
+    unlocked = tuple(
+        skill
+        for lvl_req, names in cdef.skills_by_level.items()
+        if level >= lvl_req
+        for skill in names
+    )
+    stats: Dict[str, Any] = dict(
+        max_health=int(calc(cdef.base_health, "health")),
+        strength=int(calc(cdef.base_strength, "strength")),
+        agility=int(calc(cdef.base_agility, "agility")),
+        intelligence=int(calc(cdef.base_intelligence, "intelligence")),
+        defense=calc(cdef.base_defense, "defense"),
+        accuracy=calc(cdef.base_accuracy, "accuracy"),
+        crit_chance=calc(cdef.base_crit_chance, "crit_chance"),
+        dodge_chance=calc(cdef.base_dodge_chance, "dodge_chance"),
+        base_mana=int(calc(cdef.base_mana, "mana")),
+        mana_regen=calc(cdef.mana_regen, "mana_regen"),
+    )
+    for skill in unlocked:
+        hook = _STAT_PASSIVES.get(skill)
+        if hook is not None:
+            hook(stats, skills[skill])
+
+    return LevelStats(level=level, skills=unlocked, **stats)
+
+
+_CLASS_NUMS = {
+    "base_health": None,
+    "base_strength": None,
+    "base_agility": None,
+    "base_intelligence": None,
+    "base_defense": 0.0,
+    "base_accuracy": 0.8,
+    "base_crit_chance": 0.05,
+    "base_dodge_chance": 0.03,
+    "base_mana": 0.0,
+    "mana_regen": 0.0,
+    "phys_coeff": 1.0,
+    "mag_coeff": 1.0,
+}
+_CLASS_KEYS = frozenset(_CLASS_NUMS) | {"display_name", "skills"}
+
+
+def _compile_class(name: str, data: Any, growth: Any, skills: Mapping) -> ClassDef:
+    where = f"characters.{name}"
+    data = _section(data, where)
+    _check_keys(data, _CLASS_KEYS, where)
+    _require(data, ("display_name",) + tuple(k for k, d in _CLASS_NUMS.items() if d is None), where)
+
+    by_level: Dict[int, Tuple[str, ...]] = {}
+    for lvl, names in _section(data.get("skills") or {}, f"{where}.skills").items():
+        lvl_where = f"{where}.skills.{lvl}"
+        names = _names(names, lvl_where)
+        for skill in names:
+            if skill not in skills:
+                raise ConfigError(f"{lvl_where}: нет навыка {skill!r} в skills.yaml")
+        by_level[_int(lvl, lvl_where)] = names
+
+    g_where = f"growth.{name}"
+    growth = _section(growth if growth is not None else {}, g_where)
+    _check_keys(growth, GROWTH_STATS, g_where)
+
+    return ClassDef(
+        name=name,
+        display_name=data["display_name"],
+        **{
+            k: _num(data.get(k, d), f"{where}.{k}")
+            for k, d in _CLASS_NUMS.items()
+        },
+        skills_by_level=_frozen(by_level),
+        growth=_frozen({k: _num(v, f"{g_where}.{k}") for k, v in growth.items()}),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  ИИ
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class ThreatConfig:
+    """Секция threat из ai_*.yaml."""
+
+    use_accuracy: bool = False
+    use_interval: bool = False
+    big_dps_threshold: Optional[float] = None
+    resist_modifier: float = 1.0
+    weak_modifier: float = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class AISkillConfig:
+    """
+    Параметры утилиты одного навыка. Поля, которых нет в YAML, остаются None;
+    какие из них обязательны, объявляет сам ИИ (BaseAI.REQUIRES).
+    """
+
+    enabled: bool = True
+    cd_weight: float = 1.0
+    hp_pct: Optional[float] = None
+    min_enemies: int = 0
+    boss_hp_pct: float = float("inf")
+    strength_pct: Optional[float] = None
+    big_hit_pct: Optional[float] = None
+    shield_pct: Optional[float] = None
+    base_str_pct: Optional[float] = None
+    danger_dps_thresh: Optional[float] = None
+    danger_mult: Optional[float] = None
+    acc_threshold: Optional[float] = None
+    provoke_effect: str = "provoke"
+    whirl_str_pct: Optional[float] = None
+    compare_to_skill: Optional[str] = None
+    mana_threshold: Optional[float] = None
+    utility_weight: float = 1.0
+
+
+DEFAULT_AI_SKILL = AISkillConfig()
+
+
+@dataclass(frozen=True, slots=True)
+class AIConfig:
+    """Настройки ИИ одной роли (ai_<role>.yaml)."""
+
+    role: str
+    threat: ThreatConfig = ThreatConfig()
+    tag_weights: Mapping[str, float] = field(default_factory=lambda: _frozen({}))
+    consider_mana_regen: bool = False
+    skills: Mapping[str, AISkillConfig] = field(default_factory=lambda: _frozen({}))
+
+    def tag_weight(self, tag: str) -> float:
+        tw = self.tag_weights
+        return tw.get(tag, tw.get("default", 1.0))
+
+
+_AI_SKILL_STR = frozenset({"provoke_effect", "compare_to_skill"})
+_AI_SKILL_BOOL = frozenset({"enabled"})
+_AI_SKILL_INT = frozenset({"min_enemies"})
+_AI_SKILL_KEYS = frozenset(AISkillConfig.__dataclass_fields__)
+_THREAT_BOOL = frozenset({"use_accuracy", "use_interval"})
+_THREAT_KEYS = frozenset(ThreatConfig.__dataclass_fields__)
+
+
+def _compile_ai(role: str, data: Any, skills: Mapping) -> AIConfig:
+    where = f"ai.{role}"
+    data = _section(data, where)
+    _check_keys(data, frozenset({"threat", "tag_weights", "resource", "skills"}), where)
+
+    t_where = f"{where}.threat"
+    threat = _section(data.get("threat") or {}, t_where)
+    _check_keys(threat, _THREAT_KEYS, t_where)
+    threat_cfg = ThreatConfig(
+        **{
+            k: bool(v) if k in _THREAT_BOOL else _num(v, f"{t_where}.{k}")
+            for k, v in threat.items()
+        }
+    )
+
+    tag_weights = {
+        str(tag): _num(w, f"{where}.tag_weights.{tag}")
+        for tag, w in _section(data.get("tag_weights") or {}, f"{where}.tag_weights").items()
+    }
+    resource = _section(data.get("resource") or {}, f"{where}.resource")
+    _check_keys(resource, frozenset({"consider_mana_regen"}), f"{where}.resource")
+
+    compiled: Dict[str, AISkillConfig] = {}
+    for name, scfg in _section(data.get("skills") or {}, f"{where}.skills").items():
+        s_where = f"{where}.skills.{name}"
+        if name not in skills:
+            raise ConfigError(f"{s_where}: нет навыка {name!r} в skills.yaml")
+        scfg = _section(scfg or {}, s_where)
+        _check_keys(scfg, _AI_SKILL_KEYS, s_where)
+        values: Dict[str, Any] = {}
+        for k, v in scfg.items():
+            if k in _AI_SKILL_STR:
+                values[k] = str(v)
+            elif k in _AI_SKILL_BOOL:
+                values[k] = bool(v)
+            elif k in _AI_SKILL_INT:
+                values[k] = _int(v, f"{s_where}.{k}")
+            else:
+                values[k] = _num(v, f"{s_where}.{k}")
+        if values.get("compare_to_skill") and values["compare_to_skill"] not in skills:
+            raise ConfigError(f"{s_where}.compare_to_skill: нет навыка {values['compare_to_skill']!r}")
+        compiled[name] = AISkillConfig(**values)
+
+    return AIConfig(
+        role=role,
+        threat=threat_cfg,
+        tag_weights=_frozen(tag_weights),
+        consider_mana_regen=bool(resource.get("consider_mana_regen", False)),
+        skills=_frozen(compiled),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Правила боя, тиры и опыт
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class BattleRules:
+    """Числа из battle_rules.yaml, которые движок читает на каждом ударе."""
+
+    hit_x0: float
+    hit_k: float
+    hit_scale: float
+    hit_min: float
+    hit_max: float
+    coeff_phys: float
+    coeff_mag: float
+    level_coeff_player: float
+    level_coeff_monster: float
+    variance_min: float
+    variance_max: float
+    crit_multiplier: Mapping[str, float]
+    min_damage: int
+    reduction_per_point: float
+    resist_multiplier: float
+    weak_multiplier: float
+    turn_order: str = "agility_priority"
+    turn_random_weight: float = 0.1
+    buff_stacking: str = "refresh"
+    max_stacks: int = 1
+
+
+def _compile_rules(rules: Mapping) -> BattleRules:
+    w = "battle_rules"
+    crit = _section(_path(rules, w, "damage_rules", "crit", "multiplier"), f"{w}.damage_rules.crit.multiplier")
+    crit_mul = {str(k): _num(v, f"{w}.damage_rules.crit.multiplier.{k}") for k, v in crit.items()}
+    for ct in CritType:
+        if ct.name.lower() not in crit_mul:
+            raise ConfigError(f"{w}.damage_rules.crit.multiplier: нет множителя {ct.name.lower()!r}")
+
+    turn = _section(rules.get("turn_order") or {}, f"{w}.turn_order")
+    algorithm = turn.get("algorithm", "agility_priority")
+    if algorithm not in TURN_ORDER_MODES:
+        raise ConfigError(f"{w}.turn_order.algorithm: неизвестный режим {algorithm!r}")
+    buffs = _section(rules.get("buff_rules") or {}, f"{w}.buff_rules")
+    stacking = buffs.get("stacking", "refresh")
+    if stacking not in STACKING_MODES:
+        raise ConfigError(f"{w}.buff_rules.stacking: неизвестный режим {stacking!r}")
+
+    def num(*keys: str) -> float:
+        return _num(_path(rules, w, *keys), ".".join((w,) + keys))
+
+    out = BattleRules(
+        hit_x0=num("hit_chance", "logistic", "x0"),
+        hit_k=num("hit_chance", "logistic", "k"),
+        hit_scale=num("hit_chance", "scale"),
+        hit_min=num("hit_chance", "clamp", "min"),
+        hit_max=num("hit_chance", "clamp", "max"),
+        coeff_phys=num("damage_rules", "coeffs", "phys"),
+        coeff_mag=num("damage_rules", "coeffs", "mag"),
+        level_coeff_player=num("damage_rules", "level_coeff", "player"),
+        level_coeff_monster=num("damage_rules", "level_coeff", "monster"),
+        variance_min=num("damage_rules", "variance", "min"),
+        variance_max=num("damage_rules", "variance", "max"),
+        crit_multiplier=_frozen(crit_mul),
+        min_damage=_int(_path(rules, w, "damage_rules", "min_damage"), f"{w}.damage_rules.min_damage"),
+        reduction_per_point=num("defense", "reduction_per_point"),
+        resist_multiplier=num("elements", "resist_multiplier"),
+        weak_multiplier=num("elements", "weak_multiplier"),
+        turn_order=algorithm,
+        turn_random_weight=_num(turn.get("random_weight", 0.1), f"{w}.turn_order.random_weight"),
+        buff_stacking=stacking,
+        max_stacks=_int(buffs.get("max_stacks", 1), f"{w}.buff_rules.max_stacks"),
+    )
+    if out.max_stacks < 1:
+        raise ConfigError(f"{w}.buff_rules.max_stacks: должно быть ≥ 1")
+    if out.hit_k <= 0 or out.hit_scale <= 0:
+        raise ConfigError(f"{w}.hit_chance: k и scale должны быть > 0")
+    if not out.variance_min <= out.variance_max:
+        raise ConfigError(f"{w}.damage_rules.variance: min > max")
+    return out
+
+
+@dataclass(frozen=True, slots=True)
+class TierDef:
+    """Тир монстров из monsters.monster_tiers."""
+
+    tier: int
+    name: str
+    description: str
+    monsters: Tuple[str, ...]
+
+
+def _tier_number(key: Any, where: str) -> int:
+    text = str(key)
+    if not text.startswith("tier") or not text[4:].isdigit():
+        raise ConfigError(f"{where}: ключ тира должен быть вида tierN, получено {key!r}")
+    return int(text[4:])
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Всё вместе
+# ──────────────────────────────────────────────────────────────────────────────
+@dataclass(frozen=True, slots=True)
+class GameConfig:
+    """
+    Скомпилированный конфиг игры — неизменяемый снимок.
+    `version` растёт при каждой горячей перезагрузке, `fingerprint` — хеш YAML,
+    `raw` — исходный CONFIG только для чтения (gear и прочее без типов).
+    """
+
+    skills: Mapping[str, SkillDef]
+    status_effects: Mapping[str, StatusEffectDef]
+    triggers: Mapping[str, TriggerDef]
+    monsters: Mapping[str, MonsterTemplate]
+    classes: Mapping[str, ClassDef]
+    ai: Mapping[str, AIConfig]
+    rules: BattleRules
+    tiers: Mapping[int, TierDef]
+    xp_rewards: Mapping[int, int]
+    exp_base: float
+    exp_exponent: float
+    # эффекты с periodic_damage (burn, poison, …) — их ищем в конце хода
+    periodic_effects: Tuple[str, ...] = ()
+    # синергии отряда (battle.auras) в порядке YAML
+    auras: Tuple[AuraRule, ...] = ()
+    # статы героев по уровням: level_table[класс][level − 1], уровни 1..max_level
+    level_table: Mapping[str, Tuple[LevelStats, ...]] = field(
+        default_factory=lambda: _frozen({})
+    )
+    version: int = 0
+    fingerprint: str = ""
+    raw: Mapping[str, Any] = field(default_factory=lambda: _frozen({}))
+
+    def effect_rules(self, name: str) -> StatusEffectDef:
+        """Правила эффекта; для эффектов без записи — NO_EFFECT_RULES."""
+        return self.status_effects.get(name, NO_EFFECT_RULES)
+
+    def level_stats(self, class_name: str, level: int) -> LevelStats:
+        """Статы класса на уровне: из таблицы, а выше её предела — расчётом."""
+        table = self.level_table.get(class_name, ())
+        if 0 < level <= len(table):
+            return table[level - 1]
+        return _level_stats(self.classes[class_name], level, self.skills)
+
+    def tier(self, tier: int) -> TierDef:
+        try:
+            return self.tiers[tier]
+        except KeyError:
+            raise ValueError(f"Не найдена конфигурация для тира 'tier{tier}'") from None
+
+
+def compile_config(
+    raw: Mapping[str, Any], *, version: int = 0, fingerprint: str = ""
+) -> GameConfig:
+    """Собрать и проверить GameConfig из сырого CONFIG."""
+    rules = _section(raw.get("battle_rules"), "battle_rules")
+
+    triggers = {
+        name: _compile_trigger(name, data)
+        for name, data in _section(rules.get("skill_triggers") or {}, "battle_rules.skill_triggers").items()
+    }
+    effects = {
+        name: _compile_effect(name, data)
+        for name, data in _section(rules.get("status_effects") or {}, "battle_rules.status_effects").items()
+    }
+    skills = {
+        name: _compile_skill(name, data, triggers)
+        for name, data in _section(raw.get("skills"), "skills").items()
+    }
+
+    mon = _section(raw.get("monsters"), "monsters")
+    coeffs = _section(mon.get("coeffs") or {}, "monsters.coeffs")
+    base_damage = _section(mon.get("base_damage") or {}, "monsters.base_damage")
+    monsters = {
+        name: _compile_monster(name, data, coeffs, base_damage)
+        for name, data in _section(mon.get("templates"), "monsters.templates").items()
+    }
+    tiers: Dict[int, TierDef] = {}
+    for key, info in _section(mon.get("monster_tiers") or {}, "monsters.monster_tiers").items():
+        where = f"monsters.monster_tiers.{key}"
+        info = _section(info, where)
+        names = _names(info.get("monsters"), f"{where}.monsters")
+        if not names:
+            raise ConfigError(f"{where}.monsters: пустой список")
+        for name in names:
+            if name not in monsters:
+                raise ConfigError(f"{where}: нет шаблона монстра {name!r}")
+        number = _tier_number(key, where)
+        tiers[number] = TierDef(
+            tier=number,
+            name=str(info.get("name", key)),
+            description=str(info.get("description", "")),
+            monsters=names,
+        )
+
+    growth = _section(raw.get("growth") or {}, "growth")
+    xp_rewards = {
+        _tier_number(k, "growth.xp_rewards"): _int(v, f"growth.xp_rewards.{k}")
+        for k, v in _section(growth.get("xp_rewards") or {}, "growth.xp_rewards").items()
+    }
+    for number in tiers:
+        if number not in xp_rewards:
+            raise ConfigError(f"growth.xp_rewards: нет награды для tier{number}")
+    classes = {
+        name: _compile_class(name, data, growth.get(name), skills)
+        for name, data in _section(raw.get("characters"), "characters").items()
+    }
+    max_level = _int(
+        _section(growth.get("stat_table") or {}, "growth.stat_table").get("max_level", 100),
+        "growth.stat_table.max_level",
+    )
+    level_table = {
+        name: tuple(_level_stats(cdef, lvl, skills) for lvl in range(1, max_level + 1))
+        for name, cdef in classes.items()
+    }
+    ai = {
+        role: _compile_ai(role, data, skills)
+        for role, data in _section(raw.get("ai") or {}, "ai").items()
+    }
+    aura_sec = _section(rules.get("auras") or {}, "battle_rules.auras")
+    auras = tuple(
+        _compile_aura(name, data, classes)
+        for name, data in _section(
+            aura_sec.get("synergy_rules") or {}, "battle_rules.auras.synergy_rules"
+        ).items()
+    )
+
+    # биты эффектов — сразу для всех имён конфига, а не по ходу боёв
+    register_effects(
+        [*effects, *(s.effect for s in skills.values() if s.effect)]
+        + [a.effect for a in auras if a.effect]
+    )
+
+    return GameConfig(
+        skills=_frozen(skills),
+        status_effects=_frozen(effects),
+        triggers=_frozen(triggers),
+        monsters=_frozen(monsters),
+        classes=_frozen(classes),
+        ai=_frozen(ai),
+        rules=_compile_rules(rules),
+        tiers=_frozen(tiers),
+        xp_rewards=_frozen(xp_rewards),
+        exp_base=_num(_path(growth, "growth", "exp_curve", "base"), "growth.exp_curve.base"),
+        exp_exponent=_num(
+            _path(growth, "growth", "exp_curve", "exponent"), "growth.exp_curve.exponent"
+        ),
+        level_table=_frozen(level_table),
+        periodic_effects=tuple(
+            name for name, eff in effects.items() if eff.periodic_damage is not None
+        ),
+        auras=auras,
+        version=version,
+        fingerprint=fingerprint,
+        raw=_deep_frozen(dict(raw)),
+    )
@@ -1,16 +1,18 @@
 from __future__ import annotations
 import random
-from typing import Dict, List
+from typing import Dict, List, Optional
 
-from ..config import CONFIG
+from ..config import current
 from .item import GearItem, PotionItem
 from .enums import ItemSlot, ItemClass, ItemQuality
 
 
 class Store:
-    def __init__(self) -> None:
+    def __init__(self, rng: Optional[random.Random] = None) -> None:
+        # собственный генератор: случайные бонусы не зависят от чужих бросков
+        self.rng = rng if rng is not None else random.Random()
         # грузим новую структуру из gear.yaml
-        cfg = CONFIG.get("gear", {})
+        cfg = current().raw.get("gear", {})
         self.templates: Dict[str, dict] = cfg.get("items", {})
         self.potions_cfg: List[dict] = cfg.get("potions", [])
         # строим маппинг качества → число случайных статов
@@ -48,7 +50,7 @@ class Store:
         pool = data.get("random_stats_pool", [])
         # сколько рандомных бонусов выдавать
         count = self.rand_by_quality.get(quality.name, 0)
-        picks = random.sample(pool, min(count, len(pool))) if pool else []
+        picks = self.rng.sample(pool, min(count, len(pool))) if pool else []
         # собираем итоговые статы
         stats = static.copy()
         for bonus in picks:
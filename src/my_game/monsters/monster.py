@@ -3,29 +3,16 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field
-from typing import ClassVar, Dict, List, Tuple
+from typing import Dict, Optional, Tuple
 
 from ..base.combatant import Combatant
-from ..config import CONFIG
+from ..config import current, on_reload
+from ..config_defs import GameConfig, MonsterTemplate
 from .monster_type import MonsterType
 from ..battle.damage import check_hit, calc_damage
 from ..battle.enums import Element
 from ..battle.status import before_action
-
-# ──────────────────────────────────────────────────────────────────────────────
-#  Константы из YAML
-# ──────────────────────────────────────────────────────────────────────────────
-_MON_TEMPLATES = CONFIG["monsters"]["templates"]
-
-_BASE_DAMAGE: Dict[MonsterType, int] = {
-    MonsterType[key]: val for key, val in CONFIG["monsters"]["base_damage"].items()
-}
-
-_COEFFS: Dict[MonsterType, Tuple[float, float]] = {
-    MonsterType[key]: (c["phys_coeff"], c["mag_coeff"])
-    for key, c in CONFIG["monsters"]["coeffs"].items()
-}
-
+from ..battle.events import Hit, Miss
 
 # ──────────────────────────────────────────────────────────────────────────────
 #  Класс Monster
@@ -42,13 +29,14 @@ class Monster(Combatant):
     monster_type: MonsterType
     base_damage: int = 0
 
-    resistances: List[str] = field(default_factory=list)
-    weaknesses: List[str] = field(default_factory=list)
+    # неизменяемые: клоны одного прототипа делят эти кортежи
+    resistances: Tuple[str, ...] = ()
+    weaknesses: Tuple[str, ...] = ()
     loot_table: Dict[str, float] = field(default_factory=dict)
-
-    # Классовые справочники
-    BASE_DAMAGE: ClassVar[Dict[MonsterType, int]] = _BASE_DAMAGE
-    COEFFS: ClassVar[Dict[MonsterType, Tuple[float, float]]] = _COEFFS
+    # шаблон, из которого собран монстр (ИИ читает из него теги и урон)
+    template: Optional[MonsterTemplate] = field(
+        default=None, repr=False, compare=False
+    )
 
     # ───────────────────────
     #  Dunder‑hooks
@@ -58,7 +46,9 @@ class Monster(Combatant):
         self.species = self.monster_type.name  # для damage.calc_damage
 
         # Кэшируем коэффициенты (может пригодиться для логов/AI)
-        self.phys_coeff, self.mag_coeff = self.COEFFS.get(self.monster_type, (1.0, 1.0))
+        tpl = self.template or current().monsters.get(self.species)
+        self.phys_coeff = tpl.phys_coeff if tpl else 1.0
+        self.mag_coeff = tpl.mag_coeff if tpl else 1.0
 
     # ───────────────────────
     #  Боевое API
@@ -71,48 +61,88 @@ class Monster(Combatant):
         if target not in allowed:
             target = allowed[0]
 
+        emit = self.battle.emit
         if not check_hit(self, target):
-            print(f"{self.name} промахивается! (шанс {self._last_hit:.1%})")
+            if emit:
+                emit(Miss(self, target, self._last_hit))
             return
 
         dmg = calc_damage(self, target, element=Element.PHYSICAL)
-        self._log_hit(target, dmg)
+        if emit:
+            emit(
+                Hit(
+                    self,
+                    target,
+                    dmg,
+                    self._last_crit,
+                    self._last_weak,
+                    self._last_resist,
+                )
+            )
         target.take_damage(dmg)
 
     # ───────────────────────
-    #  Служебное
+    #  Прототипы и клоны
     # ───────────────────────
-    def _log_hit(self, target: Combatant, dmg: int) -> None:
-        msg = f"{self.display_name} ({self.monster_type.name}) "
-        if getattr(self, "_last_crit", False):
-            msg += "НАНОСИТ КРИТ! "
-        msg += f"наносит {dmg} урона"
+    def spawn(self) -> "Monster":
+        """
+        Свежий монстр из прототипа: поля копируются одним update, общие
+        неизменяемые данные (шаблон, резисты, коэффициенты) не копируются,
+        изменяемое боевое состояние создаётся заново.
+        """
+        m = object.__new__(type(self))
+        m.__dict__.update(self.__dict__)
+        m.skills = []
+        m.loot_table = dict(self.loot_table)  # своя добыча у каждого клона
+        if self._stats is not None:
+            m._stats = self._stats.copy_for(m)
+        m.reset_combat_state()
+        cls = type(self)
+        cls._uid_counter += 1
+        m._uid = cls._uid_counter
+        return m
 
-        if getattr(self, "_last_weak", False):
-            msg += " (слабость)"
-        elif getattr(self, "_last_resist", False):
-            msg += " (резист)"
-
-        print(msg + ".")
+    @staticmethod
+    def prototype(
+        monster_type: str, level: int, config: Optional[GameConfig] = None
+    ) -> "Monster":
+        """Прототип (тип, уровень) — собирается один раз на шаблон. Не изменять."""
+        tpl = (config or current()).monsters[monster_type]
+        key = (tpl, level)
+        proto = _PROTOTYPES.get(key)
+        if proto is None:
+            proto = _PROTOTYPES[key] = Monster._build(tpl, level)
+        return proto
 
     # ───────────────────────
     #  Фабрика из YAML
     # ───────────────────────
     @staticmethod
-    def from_config(monster_type: str, level: int) -> "Monster":
-        data = _MON_TEMPLATES[monster_type]
-        mtype = MonsterType[monster_type]
+    def from_config(
+        monster_type: str, level: int, config: Optional[GameConfig] = None
+    ) -> "Monster":
+        return Monster.prototype(monster_type, level, config).spawn()
 
+    @staticmethod
+    def _build(tpl: MonsterTemplate, level: int) -> "Monster":
         return Monster(
-            name=monster_type.capitalize(),
+            name=tpl.name.capitalize(),
             level=level,
-            max_health=data["base_health"],
-            strength=data["base_strength"],
-            agility=data["base_agility"],
-            intelligence=data["base_intelligence"],
-            defense=data.get("defense", 0),
-            monster_type=mtype,
-            base_damage=_BASE_DAMAGE.get(mtype, 0),
-            resistances=data.get("resistances", []),
-            weaknesses=data.get("weaknesses", []),
+            max_health=tpl.base_health,
+            strength=tpl.base_strength,
+            agility=tpl.base_agility,
+            intelligence=tpl.base_intelligence,
+            defense=tpl.defense,
+            monster_type=tpl.monster_type,
+            base_damage=tpl.base_damage,
+            resistances=tpl.resistances,
+            weaknesses=tpl.weaknesses,
+            template=tpl,
         )
+
+
+# Прототипы по (шаблон, уровень). Шаблон — неизменяемый и хешируемый, так что
+# правка монстра в YAML даёт новый ключ; при перезагрузке кеш просто очищаем.
+_PROTOTYPES: Dict[Tuple[MonsterTemplate, int], Monster] = {}
+
+on_reload(lambda _snap: _PROTOTYPES.clear())
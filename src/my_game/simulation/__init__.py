@@ -0,0 +1,16 @@
+# src/my_game/simulation/__init__.py
+
+"""
+Массовые симуляции боёв для балансировки.
+"""
+
+from .trials import TrialStats, simulate_group_battle, run_trials
+from .runner import derive_seed, run_series_parallel
+
+__all__ = [
+    "TrialStats",
+    "simulate_group_battle",
+    "run_trials",
+    "derive_seed",
+    "run_series_parallel",
+]
@@ -0,0 +1,66 @@
+# src/my_game/simulation/runner.py
+"""
+Параллельный Монте‑Карло прогон независимых серий run_trials по ядрам.
+
+Внутри серии герой растёт от боя к бою, поэтому сама серия остаётся
+последовательной. Параллельно идут только независимые серии (тиры, классы,
+повторы полного прогона): каждая получает свою копию героя и своё зерно,
+выведенное из одного мастер‑зерна, поэтому итог зависит только от seed, но не
+от числа воркеров.
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from .trials import run_trials
+
+
+def derive_seed(master_seed: int, index: int) -> int:
+    """Независимое 64‑битное зерно серии `index` из мастер‑зерна."""
+    digest = hashlib.blake2b(
+        f"{master_seed}:{index}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big")
+
+
+def _run_series(hero, seed: int, kwargs: Mapping) -> Dict:
+    return run_trials(hero, seed=seed, **kwargs)
+
+
+def run_series_parallel(
+    hero,
+    series: Sequence[Mapping],
+    *,
+    seed: int = 0,
+    workers: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Несколько независимых серий run_trials на пуле процессов.
+
+    • `series` — аргументы run_trials для каждой серии (tier, trials,
+      group_min, group_max); каждая начинается с копии исходного `hero`
+    • серия `i` получает зерно derive_seed(seed, i): она совпадает с
+      run_trials(копия hero, seed=derive_seed(seed, i), **series[i])
+    • результаты — в порядке `series`; workers=1 считает всё в текущем
+      процессе, результат тот же
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [(derive_seed(seed, i), dict(kwargs)) for i, kwargs in enumerate(series)]
+
+    if workers == 1 or len(jobs) <= 1:
+        # копия героя ровно как при передаче в воркер
+        return [
+            _run_series(copy.deepcopy(hero), job_seed, kwargs)
+            for job_seed, kwargs in jobs
+        ]
+
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        futures = [
+            pool.submit(_run_series, hero, job_seed, kwargs) for job_seed, kwargs in jobs
+        ]
+        return [fut.result() for fut in futures]
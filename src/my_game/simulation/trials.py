@@ -0,0 +1,167 @@
+# src/my_game/simulation/trials.py
+"""
+Серии боёв «герой против группы монстров» и сливаемая статистика по ним.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from ..config import current
+from ..config_defs import GameConfig
+from ..monsters.monster import Monster
+from ..battle.context import BattleContext
+from ..battle.engine import run_battle
+
+
+def simulate_group_battle(
+    pc, monsters, tier, seed: Optional[int] = None, config: Optional[GameConfig] = None
+):
+    """
+    Симуляция группового боя. Возвращает (win: bool, remaining_hp: int).
+    С тем же `seed` и теми же участниками бой повторяется в точности.
+    `config` — снимок конфига боя (по умолчанию текущий).
+    """
+    # Полное восстановление: здоровье, мана, эффекты, кулдауны и флаги
+    # (в т.ч. Last Stand), иначе состояние копится от боя к бою
+    pc.reset_combat_state()
+    for m in monsters:
+        m.reset_combat_state()
+
+    # Лог не нужен — события боя уходят в NullSink
+    ctx = BattleContext(seed=seed, config=config)
+    win = run_battle(ctx, [pc], monsters)
+    xp = ctx.config.xp_rewards[tier]
+    pc.add_exp(xp if win else xp // 2)
+
+    return win, pc.health
+
+
+@dataclass
+class TrialStats:
+    """Статистика непрерывной серии боёв [first, first + trials) одного героя."""
+
+    tier: int
+    first: int = 1  # номер первого боя серии (с 1)
+    first_level: int = 1  # уровень героя перед первым боем серии
+
+    trials: int = 0
+    wins: int = 0
+    losses: int = 0
+    hp_after_sum: float = 0.0
+    hero_max_hp: int = 0
+    group_size_sum: int = 0
+    total_monsters: int = 0
+    wins_by_group: Counter = field(default_factory=Counter)
+
+    # полосы побед: текущая (в конце серии) и лучшая
+    tail_streak: int = 0
+    tail_start: int = 0
+    tail_start_level: int = 0
+    max_streak: int = 0
+    max_streak_start: int = 0
+    max_streak_level: int = 0
+
+    def record(
+        self, win: bool, hp_after: int, group: Tuple[str, ...], level: int
+    ) -> None:
+        """Добавить очередной бой (level — уровень героя перед боем)."""
+        i = self.first + self.trials
+        self.trials += 1
+        self.hp_after_sum += hp_after
+        self.group_size_sum += len(group)
+        self.total_monsters += len(group)
+
+        if not win:
+            self.losses += 1
+            self.tail_streak = 0
+            return
+
+        self.wins += 1
+        self.wins_by_group[group] += 1
+        if self.tail_streak == 0:
+            self.tail_start = i
+            self.tail_start_level = level
+        self.tail_streak += 1
+        if self.tail_streak > self.max_streak:
+            self.max_streak = self.tail_streak
+            self.max_streak_start = self.tail_start
+            self.max_streak_level = self.tail_start_level
+
+    def as_dict(self) -> Dict:
+        """Словарь в формате, который понимает format_stats_text."""
+        total = self.wins + self.losses
+        return {
+            "tier": self.tier,
+            "trials": total,
+            "wins": self.wins,
+            "losses": self.losses,
+            "win_rate": self.wins / total * 100 if total else 0,
+            "avg_hp_after": self.hp_after_sum / self.trials if self.trials else 0,
+            "hero_max_hp": self.hero_max_hp,
+            "avg_group_size": (
+                self.group_size_sum / self.trials if self.trials else 0
+            ),
+            "total_monsters": self.total_monsters,
+            "max_streak": self.max_streak,
+            "max_streak_start_battle": self.max_streak_start,
+            "max_streak_start_level": (
+                self.max_streak_level if self.max_streak else self.first_level
+            ),
+            "wins_by_group": dict(self.wins_by_group),
+        }
+
+
+def run_trial_block(
+    hero,
+    tier: int = 3,
+    trials: int = 1000,
+    group_min: int = 1,
+    group_max: int = 3,
+    first: int = 1,
+    level_offset: int = 4,
+    rng: Optional[random.Random] = None,
+) -> TrialStats:
+    """
+    Серия из `trials` боёв подряд для одного героя (герой растёт от боя к бою).
+    `first` — номер первого боя (для отчёта о полосах побед).
+    `rng` выбирает составы групп и выдаёт зерно каждому бою.
+    """
+    rng = rng or random.Random()
+    cfg = current()  # вся серия — на одном снимке конфига
+    tier_list = cfg.tier(tier).monsters
+
+    stats = TrialStats(tier=tier, first=first, first_level=hero.level)
+    for _ in range(trials):
+        group_size = rng.randint(group_min, group_max)
+        group_types = tuple(sorted(rng.choices(tier_list, k=group_size)))
+        level = hero.level
+
+        # Можно варьировать уровень монстров относительно героя
+        monsters = [
+            Monster.from_config(t, level=level + level_offset, config=cfg)
+            for t in group_types
+        ]
+        win, hp_after = simulate_group_battle(
+            hero, monsters, tier=tier, seed=rng.getrandbits(64), config=cfg
+        )
+        stats.record(win, hp_after, group_types, level)
+
+    stats.hero_max_hp = hero.max_health
+    return stats
+
+
+def run_trials(
+    hero,
+    tier=3,
+    trials=1000,
+    group_min=1,
+    group_max=3,
+    seed: Optional[int] = None,
+):
+    """Запускает серию боёв и возвращает словарь со статистикой."""
+    rng = random.Random(seed)
+    return run_trial_block(hero, tier, trials, group_min, group_max, rng=rng).as_dict()
@@ -0,0 +1,271 @@
+# src/my_game/simulation/vectorized.py
+"""
+Векторный движок автоатак: N независимых дуэлей «A против B» на массивах NumPy.
+
+Модель — обычная атака (`Monster.attack` / `PlayerCharacter.attack`) без навыков
+и ИИ: каждый раунд порядок хода по ловкости + U·0.1, как в simulate_group_battle,
+затем попадание по hit_chance, урон по формулам damage.py (variance, крит,
+физическая слабость/резист, min_damage) и Last Stand у цели.
+
+Все броски делаются пачкой на все ещё идущие бои, поэтому раунд стоит несколько
+вызовов NumPy вместо N вызовов Python. Подходит для таблиц баланса по тирам;
+для точного лога конкретного боя используйте обычный движок.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, fields
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..config import current
+from ..config_defs import BattleRules
+from ..battle.damage import offense_rating
+from ..characters.character_class import CharacterClass
+from ..characters.player_character import PlayerCharacter
+from ..monsters.monster import Monster
+
+_PHYSICAL = "physical"
+
+
+@dataclass
+class FighterArrays:
+    """
+    Бойцы одной стороны в виде struct‑of‑arrays: i‑й элемент каждого поля —
+    участник i‑го боя. Урон обычной атаки не зависит от цели до mitigation,
+    поэтому храним уже посчитанный `offense` (шаги 1–3 calc_damage).
+    """
+
+    health: np.ndarray
+    agility: np.ndarray
+    accuracy: np.ndarray
+    dodge_chance: np.ndarray
+    crit_chance: np.ndarray
+    offense: np.ndarray
+    defense: np.ndarray
+    weak_phys: np.ndarray
+    resist_phys: np.ndarray
+    last_stand: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.health)
+
+    @staticmethod
+    def _row(c) -> Tuple:
+        return (
+            c.health,
+            c.agility,
+            c.accuracy,
+            c.dodge_chance,
+            c.crit_chance,
+            offense_rating(c),
+            c.defense,
+            _PHYSICAL in getattr(c, "weaknesses", []),
+            _PHYSICAL in getattr(c, "resistances", []),
+            not c._last_stand_used and c.has_effect("survive_one_turn"),
+        )
+
+    @classmethod
+    def _from_columns(cls, cols: Sequence) -> "FighterArrays":
+        (hp, agi, acc, dodge, crit, off, df, weak, resist, ls) = cols
+        return cls(
+            health=np.asarray(hp, dtype=np.int64),
+            agility=np.asarray(agi, dtype=np.float64),
+            accuracy=np.asarray(acc, dtype=np.float64),
+            dodge_chance=np.asarray(dodge, dtype=np.float64),
+            crit_chance=np.asarray(crit, dtype=np.float64),
+            offense=np.asarray(off, dtype=np.float64),
+            defense=np.asarray(df, dtype=np.float64),
+            weak_phys=np.asarray(weak, dtype=bool),
+            resist_phys=np.asarray(resist, dtype=bool),
+            last_stand=np.asarray(ls, dtype=bool),
+        )
+
+    @classmethod
+    def from_combatants(cls, combatants: Iterable) -> "FighterArrays":
+        """По одному бойцу на бой (текущее здоровье берётся как есть)."""
+        rows = [cls._row(c) for c in combatants]
+        return cls._from_columns(list(zip(*rows)) or [()] * len(fields(cls)))
+
+    @classmethod
+    def repeat(cls, combatant, n: int) -> "FighterArrays":
+        """Один и тот же боец во всех n боях."""
+        return cls._from_columns([[v] * n for v in cls._row(combatant)])
+
+
+@dataclass
+class DuelResults:
+    """Итог пачки дуэлей. Бой, не закончившийся за max_rounds, — ничья."""
+
+    a_wins: np.ndarray
+    b_wins: np.ndarray
+    rounds: np.ndarray
+    a_health: np.ndarray
+    b_health: np.ndarray
+
+    @property
+    def n(self) -> int:
+        return len(self.rounds)
+
+    @property
+    def win_rate(self) -> float:
+        return float(self.a_wins.mean()) if self.n else 0.0
+
+    @property
+    def draws(self) -> int:
+        return int(self.n - self.a_wins.sum() - self.b_wins.sum())
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Формулы damage.py в векторном виде
+# ──────────────────────────────────────────────────────────────────────────────
+def hit_chance_v(att: FighterArrays, dfn: FighterArrays, rules: BattleRules) -> np.ndarray:
+    """damage.hit_chance поэлементно."""
+    delta = (att.agility - dfn.agility) / rules.hit_scale
+    p = 1.0 / (1.0 + np.exp(-(delta - rules.hit_x0) / rules.hit_k))
+    p *= att.accuracy * (1.0 - dfn.dodge_chance)
+    return np.clip(p, rules.hit_min, rules.hit_max)
+
+
+def base_damage_v(att: FighterArrays, dfn: FighterArrays, rules: BattleRules) -> np.ndarray:
+    """damage.base_damage поэлементно (до variance и критов)."""
+    off = att.offense
+    total = off + dfn.defense * rules.reduction_per_point
+    safe = np.where(total > 0, total, 1.0)
+    return np.where(total > 0, off * off / safe, 0.0)
+
+
+def element_mult_v(dfn: FighterArrays, rules: BattleRules) -> np.ndarray:
+    """Множитель физического урона по цели: слабость важнее резиста."""
+    return np.where(
+        dfn.weak_phys,
+        rules.weak_multiplier,
+        np.where(dfn.resist_phys, rules.resist_multiplier, 1.0),
+    )
+
+
+# ──────────────────────────────────────────────────────────────────────────────
+#  Движок
+# ──────────────────────────────────────────────────────────────────────────────
+def simulate_battles(
+    a: FighterArrays,
+    b: FighterArrays,
+    *,
+    seed: Optional[int] = None,
+    max_rounds: int = 200,
+    rules: Optional[BattleRules] = None,
+) -> DuelResults:
+    """
+    Провести len(a) дуэлей a[i] против b[i] до гибели одной из сторон.
+    При равной инициативе первым ходит A (как стабильная сортировка в trials).
+    rules — правила боя; по умолчанию из текущего снимка конфига.
+    """
+    n = len(a)
+    if len(b) != n:
+        raise ValueError(f"Разные размеры сторон: {n} и {len(b)}")
+    r = rules or current().rules
+    rng = np.random.default_rng(seed)
+
+    # Параметры, которые не меняются в бою: [0] — удар A по B, [1] — B по A
+    p_hit = np.stack([hit_chance_v(a, b, r), hit_chance_v(b, a, r)])
+    base = np.stack(
+        [
+            base_damage_v(a, b, r) * element_mult_v(b, r),
+            base_damage_v(b, a, r) * element_mult_v(a, r),
+        ]
+    )
+    crit = np.stack([a.crit_chance, b.crit_chance])
+    agility = np.stack([a.agility, b.agility])
+
+    hp = np.stack([a.health, b.health]).astype(np.int64)
+    last_stand = np.stack([a.last_stand, b.last_stand])
+    rounds = np.zeros(n, dtype=np.int64)
+
+    sigma = (r.variance_max - 1.0) / 3.0
+    crit_mul = r.crit_multiplier["normal"]
+
+    def strike(side: np.ndarray, idx: np.ndarray) -> None:
+        """Сторона side[j] бьёт противника в бою idx[j]."""
+        tgt = 1 - side
+        m = len(idx)
+        hit = rng.random(m) < p_hit[side, idx]
+        v = np.clip(rng.normal(1.0, sigma, m), r.variance_min, r.variance_max)
+        is_crit = rng.random(m) < crit[side, idx]
+        raw = base[side, idx] * v * np.where(is_crit, crit_mul, 1.0)
+        dmg = np.maximum(np.rint(raw).astype(np.int64), r.min_damage)
+        dmg = np.where(hit, dmg, 0)
+
+        cur = hp[tgt, idx]
+        saved = hit & last_stand[tgt, idx] & (dmg >= cur)
+        hp[tgt, idx] = np.where(saved, 1, np.maximum(cur - dmg, 0))
+        last_stand[tgt[saved], idx[saved]] = False
+
+    active = np.flatnonzero((hp[0] > 0) & (hp[1] > 0))
+    for _ in range(max_rounds):
+        if not len(active):
+            break
+        m = len(active)
+        rounds[active] += 1
+        init_a = agility[0, active] + rng.random(m) * 0.1
+        init_b = agility[1, active] + rng.random(m) * 0.1
+        first = np.where(init_a >= init_b, 0, 1)
+
+        strike(first, active)
+        # второй ходит, только если пережил первый удар
+        alive = hp[1 - first, active] > 0
+        strike((1 - first)[alive], active[alive])
+
+        active = active[(hp[0, active] > 0) & (hp[1, active] > 0)]
+
+    return DuelResults(
+        a_wins=(hp[0] > 0) & (hp[1] == 0),
+        b_wins=(hp[1] > 0) & (hp[0] == 0),
+        rounds=rounds,
+        a_health=hp[0],
+        b_health=hp[1],
+    )
+
+
+def simulate_duels(
+    hero,
+    monster,
+    n: int = 10_000,
+    *,
+    seed: Optional[int] = None,
+    max_rounds: int = 200,
+) -> DuelResults:
+    """n одинаковых дуэлей hero против monster (по правилам снимка героя)."""
+    return simulate_battles(
+        FighterArrays.repeat(hero, n),
+        FighterArrays.repeat(monster, n),
+        seed=seed,
+        max_rounds=max_rounds,
+        rules=hero.battle.config.rules,
+    )
+
+
+def tier_sweep(
+    char_class: CharacterClass,
+    levels: Iterable[int],
+    tier: int,
+    n: int = 10_000,
+    *,
+    level_offset: int = 4,
+    seed: int = 0,
+) -> Dict[Tuple[int, str], float]:
+    """
+    Таблица побед героя класса char_class против каждого монстра тира:
+    {(уровень героя, тип монстра): доля побед}. Монстр на level_offset
+    уровней выше героя — как в run_trials.
+    """
+    tier_list = current().tier(tier).monsters
+    ss = np.random.SeedSequence(seed)
+    table: Dict[Tuple[int, str], float] = {}
+    for level in levels:
+        hero = PlayerCharacter.from_config(char_class.name, level, owner=None)
+        for mtype, child in zip(tier_list, ss.spawn(len(tier_list))):
+            monster = Monster.from_config(mtype, level + level_offset)
+            res = simulate_duels(hero, monster, n, seed=child)
+            table[(level, mtype)] = res.win_rate
+    return table
@@ -2,7 +2,7 @@ import sys
 import random
 from typing import Callable, Sequence, TypeVar, Tuple, List
 
-from ..config import CONFIG
+from ..config import current
 from ..monsters.monster import Monster
 from ..characters.player_character import PlayerCharacter
 from .monster_utils import generate_enemies_for_tier  # <-- импортируем
@@ -58,7 +58,7 @@ def choose_monsters_for_battle(
     а tier — число от 1 до 4.
     """
     # --- Выбираем сложность (тир) ---
-    tiers_conf = CONFIG["monsters"]["monster_tiers"]
+    tiers_conf = current().raw["monsters"]["monster_tiers"]
     tier_keys = ["tier1", "tier2", "tier3", "tier4"]
 
     selected_tier = choose_from_list(
@@ -1,33 +1,43 @@
 import random
 import logging
-from typing import List
+from typing import List, Optional
 
-from ..config import CONFIG
+from ..config import current
+from ..config_defs import GameConfig
 from ..monsters.monster import Monster
 
 logger = logging.getLogger(__name__)
 
 
-def generate_enemies_for_tier(tier: int) -> List[Monster]:
+def generate_enemies_for_tier(
+    tier: int,
+    rng: Optional[random.Random] = None,
+    config: Optional[GameConfig] = None,
+) -> List[Monster]:
     """
     Генерирует группу из 1–3 врагов для заданного тира.
 
-    1. Берёт список имён из CONFIG["monsters"]["monster_tiers"]["tier{tier}"]["monsters"].
+    1. Берёт список имён из config.tier(tier).monsters.
     2. Для каждого выбирает уровень в диапазоне [1..tier].
     3. Создаёт экземпляр через Monster.from_config().
+
+    `rng` — генератор боя (BattleContext.rng); без него — модуль random.
+    `config` — снимок конфига боя (BattleContext.config); без него — текущий.
     """
+    rng = rng or random
+    cfg = config or current()
+
     # 1) Сколько врагов выпадет
-    count = random.randint(1, 3)
+    count = rng.randint(1, 3)
 
     # 2) Достаём информацию о тирах
     tier_key = f"tier{tier}"
-    tiers_cfg = CONFIG["monsters"].get("monster_tiers", {})
-    tier_info = tiers_cfg.get(tier_key)
+    tier_info = cfg.tiers.get(tier)
     if not tier_info:
         logger.error("Нет секции monster_tiers['%s'] в конфиге", tier_key)
         raise ValueError(f"Не найдена конфигурация для тира '{tier_key}'")
 
-    names = tier_info.get("monsters", [])
+    names = tier_info.monsters
     if not names:
         logger.error("Список MONSTERS пуст для секции '%s'", tier_key)
         raise ValueError(f"В конфиге monster_tiers['{tier_key}']['monsters'] пуст")
@@ -35,26 +45,28 @@ def generate_enemies_for_tier(tier: int) -> List[Monster]:
     # 3) Собираем список врагов
     enemies: List[Monster] = []
     for _ in range(count):
-        monster_name = random.choice(names)
-        level = random.randint(1, tier)
-        m = Monster.from_config(monster_name, level)
+        monster_name = rng.choice(names)
+        level = rng.randint(1, tier)
+        m = Monster.from_config(monster_name, level, config=cfg)
         enemies.append(m)
 
     return enemies
 
 
-def generate_monster(pc_level: int) -> Monster:
+def generate_monster(pc_level: int, rng: Optional[random.Random] = None) -> Monster:
     """
-    Берёт случайный шаблон из всех CONFIG["monsters"]["templates"],
+    Берёт случайный шаблон из всех монстров текущего конфига,
     задаёт уровень в диапазоне [pc_level-1 .. pc_level+1] (не ниже 1)
     и создаёт через Monster.from_config().
     """
-    templates = list(CONFIG["monsters"]["templates"].keys())
+    rng = rng or random
+    cfg = current()
+    templates = list(cfg.monsters)
     if not templates:
-        logger.error("CONFIG['monsters']['templates'] пуст")
+        logger.error("monsters.templates пуст")
         raise ValueError("Нет доступных шаблонов монстров в конфиге")
 
-    mt_name = random.choice(templates)
-    lvl = random.randint(max(pc_level - 1, 1), pc_level + 1)
+    mt_name = rng.choice(templates)
+    lvl = rng.randint(max(pc_level - 1, 1), pc_level + 1)
 
-    return Monster.from_config(mt_name, lvl)
+    return Monster.from_config(mt_name, lvl, config=cfg)
@@ -0,0 +1,49 @@
+import sys
+import os
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+import pytest
+
+from tg_bot.admission import BattleAdmission, BattleBusy
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_one_battle_per_user_and_global_cap():
+    adm = BattleAdmission(max_concurrent=2, rate_per_minute=60, burst=10, clock=Clock())
+    slot = adm.admit("a")
+    with pytest.raises(BattleBusy):
+        adm.admit("a")  # свой бой ещё идёт
+    adm.admit("b")
+    with pytest.raises(BattleBusy):
+        adm.admit("c")  # общий предел
+    with slot:
+        pass
+    assert not adm.busy("a")
+    adm.admit("c")
+
+
+def test_token_bucket_refills_over_time():
+    clock = Clock()
+    adm = BattleAdmission(max_concurrent=10, rate_per_minute=6, burst=2, clock=clock)
+    for _ in range(2):
+        with adm.admit("a"):
+            pass
+    with pytest.raises(BattleBusy):
+        adm.admit("a")
+    assert not adm.busy("a")  # отказ не занимает слот
+
+    clock.now += 10  # 6 в минуту → один токен за 10 секунд
+    with adm.admit("a"):
+        pass
+    with pytest.raises(BattleBusy):
+        adm.admit("a")
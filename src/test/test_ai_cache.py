@@ -0,0 +1,31 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.battle.context import BattleContext
+from my_game.battle.dispatcher import ai_for, take_turn
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+
+
+def test_ai_lives_for_one_battle_and_memoizes_threat():
+    hero = PlayerCharacter.from_config("WARRIOR", 5, owner=None)
+    orcs = [Monster.from_config("ORC", 5) for _ in range(3)]
+    BattleContext(seed=1).join(hero, *orcs)
+
+    ai = ai_for(hero)
+    take_turn(hero, orcs)
+    assert ai_for(hero) is ai
+
+    # однотипные монстры делят одно значение угрозы
+    threats = {ai.compute_threat(o) for o in orcs}
+    assert len(threats) == 1 and len(ai._threat) == 1
+
+    # смена учитываемого стата — пересчёт
+    orcs[0].accuracy /= 2
+    assert ai.compute_threat(orcs[0]) < ai.compute_threat(orcs[1])
+    assert len(ai._threat) == 2
+
+    BattleContext(seed=2).join(hero)
+    assert ai_for(hero) is not ai
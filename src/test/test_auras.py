@@ -0,0 +1,31 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.config import DEFS
+from my_game.battle.auras import PartyAuras
+from my_game.characters.player_character import PlayerCharacter
+
+
+def test_two_mages_synergy_follows_party_shape():
+    rule = DEFS.auras[0]
+    assert rule.name == "two_mages" and dict(rule.requires) == {"MAGE": 2}
+
+    mages = [PlayerCharacter.from_config("MAGE", 5, owner=None) for _ in range(2)]
+    warrior = PlayerCharacter.from_config("WARRIOR", 5, owner=None)
+    party = [*mages, warrior]
+
+    auras = PartyAuras(party, DEFS)
+    assert auras.rules == [rule]
+    assert all(c.magic_damage == pytest.approx(0.10) for c in party)
+    assert not auras.update()  # состав тот же — без пересчёта
+
+    mages[1].health = 0
+    assert auras.update()
+    assert auras.rules == [] and warrior.magic_damage == 0.0
+
+    party.append(PlayerCharacter.from_config("MAGE", 5, owner=None))  # «призыв»
+    assert auras.update() and party[-1].magic_damage == pytest.approx(0.10)
@@ -0,0 +1,70 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.characters.player import Player
+from my_game.characters.character_class import CharacterClass
+from my_game.monsters.monster import Monster
+from my_game.battle.context import BattleContext
+from my_game.battle.dispatcher import take_turn
+from my_game.battle.events import ListSink, NullSink, Hit, Miss, DamageTaken, Death
+from my_game.battle.log import TextLogRenderer, render
+
+
+def _duel(ctx):
+    player = Player(id=1, username="tester")
+    hero = player.create_character("Hero", CharacterClass.WARRIOR, level=5)
+    goblin = Monster.from_config("GOBLIN", 1)
+    ctx.join(hero, goblin)
+    for _ in range(50):
+        if not (hero.is_alive and goblin.is_alive):
+            break
+        take_turn(hero, goblin)
+        if goblin.is_alive:
+            take_turn(goblin, hero)
+    return hero, goblin
+
+
+def test_null_sink_disables_emit():
+    ctx = BattleContext(NullSink(), seed=1)
+    assert ctx.emit is None
+    hero, goblin = _duel(ctx)
+    assert not (hero.is_alive and goblin.is_alive)
+
+
+def test_events_are_collected_and_rendered():
+    sink = ListSink()
+    hero, goblin = _duel(BattleContext(sink, seed=2))
+
+    attacks = sink.of_type(Hit, Miss)
+    assert attacks
+    assert all(e.attacker in (hero, goblin) for e in attacks)
+    for e in sink.of_type(DamageTaken):
+        assert 0 <= e.health <= e.max_health
+    deaths = sink.of_type(Death)
+    assert len(deaths) == 1
+    assert not deaths[0].target.is_alive
+    assert all(render(e) is not None for e in sink.events)
+
+
+def test_text_renderer_matches_log_format():
+    log = TextLogRenderer()
+    _duel(BattleContext(log, seed=3))
+    text = log.getvalue()
+    assert "урона" in text
+    assert "повержен" in text
+
+
+def _trace(seed):
+    sink = ListSink()
+    _duel(BattleContext(sink, seed=seed))
+    return [
+        (type(e).__name__, getattr(e, "damage", None), getattr(e, "health", None))
+        for e in sink.events
+    ]
+
+
+def test_battle_replays_from_seed():
+    assert _trace(42) == _trace(42)
+    assert _trace(42) != _trace(43)
@@ -0,0 +1,88 @@
+import sys
+import os
+import asyncio
+import logging
+import marshal
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from my_game.characters.player import Player
+from my_game.characters.player_character import PlayerCharacter
+from tg_bot import battle_pool
+from tg_bot.battle_pool import BattlePool, HeroState, ShippedConfig, run_battle_job
+from my_game import config
+from my_game.config import current, dump_snapshot
+from my_game.battle.context import DEFAULT_CONTEXT
+
+
+def _party():
+    owner = Player(id=1, username="u", gold=0)
+    party = [
+        PlayerCharacter.from_config("WARRIOR", 12, owner=owner, name_override="A"),
+        PlayerCharacter.from_config("MAGE", 12, owner=owner, name_override="B"),
+    ]
+    return owner, party
+
+
+def test_job_round_trips_party_state():
+    _, party = _party()
+    states = tuple(HeroState.of(pc) for pc in party)
+    result = run_battle_job(states, 1, ShippedConfig.of(current()))
+    assert [s.name for s in result.party] == ["A", "B"]
+    assert result.win and result.xp > 0 and result.log
+
+
+def _fight(workers, party):
+    async def go():
+        async with BattlePool(workers=workers, timeout=60) as pool:
+            return await pool.run(party, 1)
+
+    return asyncio.run(go())
+
+
+def test_pool_applies_results_back_to_party():
+    for workers in (0, 1):  # поток и процесс
+        owner, party = _party()
+        log, win, xp, gold = _fight(workers, party)
+        assert win and log and xp > 0
+        assert owner.gold == gold > 0
+        for pc in party:
+            assert pc.level > 12 or pc.exp == xp
+
+
+def test_worker_runs_on_parents_snapshot_not_disk(monkeypatch, caplog):
+    # install() меняет глобальный снимок — после теста возвращаем прежний
+    monkeypatch.setattr(config, "_current", current())
+    monkeypatch.setattr(DEFAULT_CONTEXT, "config", DEFAULT_CONTEXT.config)
+    monkeypatch.setattr(battle_pool, "_failed", set())
+    _, party = _party()
+    states = tuple(HeroState.of(pc) for pc in party)
+    old = current()
+
+    raw = marshal.loads(dump_snapshot(old))
+    raw["battle_rules"]["damage_rules"]["min_damage"] = 2
+    shipped = ShippedConfig("parent-v2", old.version + 1, marshal.dumps(raw))
+    run_battle_job(states, 1, shipped)
+    assert current().fingerprint == "parent-v2"
+    assert current().rules.min_damage == 2
+
+    # снимок, который не собирается, пробуем один раз и честно пишем в лог
+    broken = ShippedConfig("parent-v3", old.version + 2, marshal.dumps({}))
+    with caplog.at_level(logging.WARNING, logger=battle_pool.__name__):
+        run_battle_job(states, 1, broken)
+        run_battle_job(states, 1, broken)
+    failures = [r for r in caplog.records if "could not install" in r.getMessage()]
+    stale = [r for r in caplog.records if "runs on config" in r.getMessage()]
+    assert len(failures) == 1 and len(stale) == 2
+    assert current().fingerprint == "parent-v2"
+
+
+def test_bot_battles_are_capped_by_max_rounds():
+    from tg_bot.services import simulate_battle
+
+    _, party = _party()
+    log, win, xp, gold = simulate_battle(party, 4, seed=5, max_rounds=1)
+    assert not win and xp == gold == 0
+    assert "Раунд 1 " in log and "Раунд 2 " not in log
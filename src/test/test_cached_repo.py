@@ -0,0 +1,171 @@
+import sys
+import os
+import asyncio
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from tg_bot.repositories.db import Database
+
+
+async def _hp_in_db(db, char_id):
+    cur = await db.conn.execute("SELECT hp FROM characters WHERE id=?", (char_id,))
+    return (await cur.fetchone())[0]
+
+
+def test_reads_hit_cache_and_writes_are_deferred(tmp_path):
+    async def go():
+        async with Database(str(tmp_path / "bot.db"), cache_size=1) as db:
+            await db.users.get_or_create(1, 10, "u")
+            pc = await db.characters.add_character(1, 10, "A", "WARRIOR")
+            chars = await db.characters.get_characters(1, 10)
+
+            # отряд ждёт выбора сложности с владельцем; чтение списка его не трогает
+            owner = await db.users.get_user(1, 10)
+            chars[0].owner = owner
+            await db.characters.get_characters(1, 10)
+            assert chars[0].owner is owner
+
+            chars[0].health = 1
+            await db.characters.update_character(chars[0], 10)
+            user = await db.users.get_user(1, 10)
+            user.add_gold(50)
+            await db.users.update_user(user, 10)
+            await db.party.set_party(1, 10, [pc.db_id])
+            assert await _hp_in_db(db, pc.db_id) != 1  # ещё не записано
+
+            # вытеснение (размер кеша 1) не теряет грязные данные
+            await db.users.get_or_create(2, 10, "v")
+            assert (await db.users.get_user(1, 10)).gold == 150
+            assert (await db.characters.get_characters(1, 10))[0].health == 1
+            assert await db.party.get_party(1, 10) == [pc.db_id]
+
+            assert await db.cache.flush() == 3
+            assert await _hp_in_db(db, pc.db_id) == 1
+
+    asyncio.run(go())
+
+
+def test_close_flushes_pending_writes(tmp_path):
+    path = str(tmp_path / "bot.db")
+
+    async def go():
+        async with Database(path) as db:
+            user = await db.users.get_or_create(1, 10, "u")
+            user.add_gold(7)
+            await db.users.update_user(user, 10)
+        async with Database(path, cache_size=0) as db:
+            assert (await db.users.get_user(1, 10)).gold == 107
+
+    asyncio.run(go())
+
+
+def test_transaction_commits_once_and_rolls_back_together(tmp_path):
+    async def go():
+        async with Database(str(tmp_path / "bot.db"), cache_size=0) as db:
+            await db.users.get_or_create(1, 10, "u")
+            a = await db.characters.add_character(1, 10, "A", "WARRIOR")
+            b = await db.characters.add_character(1, 10, "B", "MAGE")
+            a.health = b.health = 3
+            async with db.transaction():
+                await db.characters.update_characters([a, b], 10)
+                assert db.conn.in_transaction  # commit ещё не было
+            assert not db.conn.in_transaction
+            assert await _hp_in_db(db, a.db_id) == await _hp_in_db(db, b.db_id) == 3
+
+            user = await db.users.get_user(1, 10)
+            user.gold = 0
+            try:
+                async with db.transaction():
+                    await db.users.update_user(user, 10)
+                    await db.characters.update_characters([a], 10)
+                    raise RuntimeError("сбой посреди обработчика")
+            except RuntimeError:
+                pass
+            assert (await db.users.get_user(1, 10)).gold == 100  # откатилось всё
+
+    asyncio.run(go())
+
+
+def test_entries_stay_dirty_while_flush_is_writing(tmp_path):
+    async def go():
+        async with Database(str(tmp_path / "bot.db"), cache_size=4) as db:
+            user = await db.users.get_or_create(1, 10, "u")
+            user.gold = 42
+            await db.users.update_user(user, 10)
+
+            cache = db.cache
+            gate = asyncio.Event()
+            write = cache.db_users.update_user
+
+            async def slow_update(player, chat_id):
+                await gate.wait()
+                await write(player, chat_id)
+
+            cache.db_users.update_user = slow_update
+            flushing = asyncio.create_task(cache.flush())
+            await asyncio.sleep(0)
+
+            # пока flush ждёт, запись игрока истекает и перечитывается
+            cache._entries.clear()
+            assert (await db.users.get_user(1, 10)).gold == 42
+            assert cache.dirty_count() == 1
+
+            gate.set()
+            assert await flushing == 1
+            assert cache.dirty_count() == 0
+
+    asyncio.run(go())
+
+
+async def _gold_in_db(db, user_id):
+    cur = await db.conn.execute("SELECT gold FROM users WHERE user_id=?", (user_id,))
+    return (await cur.fetchone())[0]
+
+
+async def _items_in_db(db):
+    cur = await db.conn.execute("SELECT COUNT(*) FROM inventory")
+    return (await cur.fetchone())[0]
+
+
+def test_cached_transaction_commits_deferred_writes_or_rolls_back_cache(tmp_path):
+    from my_game.items.item import PotionItem
+
+    potion = PotionItem(name="Зелье", price=30, heal=10)
+
+    async def buy(db):
+        async with db.transaction():
+            user = await db.users.get_user(1, 10)
+            assert user.spend_gold(potion.price)
+            await db.users.update_user(user, 10)
+            await db.inventory.add_item(1, 10, potion)
+            return user
+
+    async def go():
+        async with Database(str(tmp_path / "bot.db"), cache_size=16) as db:
+            await db.users.get_or_create(1, 10, "u")
+
+            # покупка: золото уходит в БД вместе с предметом, без ожидания flush
+            await buy(db)
+            assert await _gold_in_db(db, 1) == 70 and await _items_in_db(db) == 1
+            assert db.cache.dirty_count() == 0
+
+            # сбой посреди обработчика: откатываются и БД, и кеш
+            try:
+                async with db.transaction():
+                    user = await db.users.get_user(1, 10)
+                    user.spend_gold(potion.price)
+                    await db.users.update_user(user, 10)
+                    await db.inventory.add_item(1, 10, potion)
+                    raise RuntimeError("сбой")
+            except RuntimeError:
+                pass
+            assert user.gold == 70 and (await db.users.get_user(1, 10)).gold == 70
+            assert db.cache.dirty_count() == 0
+            assert await _items_in_db(db) == 1
+            assert len(await db.inventory.get_items(1, 10)) == 1
+            assert await db.cache.flush() == 0
+            assert await _gold_in_db(db, 1) == 70
+
+    asyncio.run(go())
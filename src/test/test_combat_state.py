@@ -0,0 +1,35 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+from my_game.battle.context import BattleContext
+from my_game.battle.dispatcher import take_turn
+
+
+def _fight(hero, monster, rounds=3):
+    for _ in range(rounds):
+        take_turn(hero, [monster])
+        take_turn(monster, hero)
+
+
+def test_restore_replays_the_same_battle():
+    hero = PlayerCharacter.from_config("MAGE", 5, owner=None)
+    monster = Monster.from_config("ORC", 6)
+    ctx = BattleContext(seed=7)
+    ctx.join(hero, monster)
+
+    start = hero.snapshot(), monster.snapshot(), ctx.rng.getstate()
+    _fight(hero, monster)
+    first = hero.snapshot(), monster.snapshot()
+    assert first[0] != start[0]
+
+    # один и тот же снимок можно восстанавливать многократно
+    for _ in range(2):
+        hero.restore(start[0])
+        monster.restore(start[1])
+        ctx.rng.setstate(start[2])
+        _fight(hero, monster)
+        assert (hero.snapshot(), monster.snapshot()) == first
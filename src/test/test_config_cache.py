@@ -0,0 +1,32 @@
+import sys
+import os
+import shutil
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game import config
+
+
+def test_cache_is_reused_and_rebuilt_on_change(tmp_path, monkeypatch):
+    src = tmp_path / "config"
+    shutil.copytree(config._CONFIG_DIR, src, ignore=shutil.ignore_patterns("__pycache__"))
+
+    parsed = []
+    real_parse = config._parse_yaml
+    monkeypatch.setattr(
+        config, "_parse_yaml", lambda d: parsed.append(d) or real_parse(d)
+    )
+
+    cold = config.load_config(src, use_cache=True)
+    warm = config.load_config(src, use_cache=True)
+    assert len(parsed) == 1
+    assert warm == cold == config.load_config(src, use_cache=False)
+
+    rules = src / "battle_rules.yaml"
+    rules.write_text(
+        rules.read_text(encoding="utf-8").replace("min_damage: 1\n", "min_damage: 2\n", 1),
+        encoding="utf-8",
+    )
+    changed = config.load_config(src, use_cache=True)
+    assert len(parsed) == 3  # use_cache=False + пересборка после правки
+    assert changed["battle_rules"]["damage_rules"]["min_damage"] == 2
@@ -0,0 +1,63 @@
+import sys
+import os
+from collections.abc import Mapping
+from dataclasses import replace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.config import DEFS, current
+from my_game.config_defs import ConfigError, SkillDef, compile_config
+from my_game.battle.enums import Element
+
+
+def _thawed(raw):
+    """Изменяемая копия сырого YAML снимка (mappingproxy → dict, tuple → list)."""
+    if isinstance(raw, Mapping):
+        return {k: _thawed(v) for k, v in raw.items()}
+    if isinstance(raw, tuple):
+        return [_thawed(v) for v in raw]
+    return raw
+
+
+def _broken(mutate):
+    raw = _thawed(current().raw)
+    mutate(raw)
+    return raw
+
+
+def test_defs_are_typed_and_frozen():
+    fireball = DEFS.skills["Fireball"]
+    assert isinstance(fireball, SkillDef)
+    assert fireball.element is Element.FIRE
+    with pytest.raises(AttributeError):
+        fireball.power = 10
+    # "0.015# 1.5 %" в characters.yaml — комментарий без пробела
+    assert DEFS.classes["WARRIOR"].base_dodge_chance == pytest.approx(0.015)
+    assert DEFS.monsters["ORC"].resistances == ("physical",)
+
+
+@pytest.mark.parametrize(
+    "mutate",
+    [
+        lambda raw: raw["skills"]["Fireball"].update(elemnt="FIRE"),
+        lambda raw: raw["skills"]["Fireball"].update(trigger="on_full_moon"),
+        lambda raw: raw["characters"]["MAGE"]["skills"][2].append("Fireblast"),
+        lambda raw: raw["monsters"]["templates"]["ORC"].update(base_health="lots"),
+        lambda raw: raw["monsters"]["monster_tiers"]["tier1"]["monsters"].append("GOBLN"),
+        lambda raw: raw["ai"]["warrior"]["skills"]["Taunt"].update(acc_treshold=0.5),
+    ],
+)
+def test_misconfiguration_fails_at_load(mutate):
+    with pytest.raises(ConfigError):
+        compile_config(_broken(mutate))
+
+
+def test_level_table_matches_formula_past_the_cap():
+    top = len(DEFS.level_table["ROGUE"])
+    table = DEFS.level_stats("ROGUE", top)
+    # выше предела таблицы — тот же расчёт на лету
+    assert DEFS.level_stats("ROGUE", top + 1).max_health > table.max_health
+    assert replace(DEFS, level_table={}).level_stats("ROGUE", top) == table
+    assert "Evasion Mastery" in table.skills
@@ -0,0 +1,49 @@
+import sys
+import os
+import shutil
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game import config
+from my_game.config_defs import ConfigError
+from my_game.battle.context import BattleContext, DEFAULT_CONTEXT
+import my_game.battle.dispatcher  # noqa: F401 — регистрирует проверку конфигов ИИ
+
+
+@pytest.fixture
+def config_dir(tmp_path, monkeypatch):
+    # reload() меняет глобальный снимок — после теста возвращаем прежний
+    monkeypatch.setattr(config, "_current", config.current())
+    monkeypatch.setattr(DEFAULT_CONTEXT, "config", DEFAULT_CONTEXT.config)
+    src = tmp_path / "config"
+    shutil.copytree(config._CONFIG_DIR, src, ignore=shutil.ignore_patterns("__pycache__"))
+    return src
+
+
+def test_running_battle_keeps_its_snapshot(config_dir):
+    battle = BattleContext(seed=1)
+    old = battle.config
+    assert config.reload(config_dir) is None  # файлы те же — менять нечего
+
+    rules = config_dir / "battle_rules.yaml"
+    rules.write_text(
+        rules.read_text(encoding="utf-8").replace("min_damage: 1\n", "min_damage: 2\n", 1),
+        encoding="utf-8",
+    )
+    new = config.reload(config_dir)
+
+    assert new.version == old.version + 1
+    assert new.rules.min_damage == 2
+    assert battle.config is old and old.rules.min_damage == 1
+    assert BattleContext().config is new
+    assert DEFAULT_CONTEXT.config is new
+
+
+def test_bad_reload_keeps_current_snapshot(config_dir):
+    before = config.current()
+    (config_dir / "ai_rogue.yaml").unlink()
+    with pytest.raises(ConfigError):
+        config.reload(config_dir)
+    assert config.current() is before
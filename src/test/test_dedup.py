@@ -0,0 +1,107 @@
+import sys
+import os
+import asyncio
+from types import SimpleNamespace
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, os.path.join(ROOT, "src"))
+sys.path.insert(0, ROOT)
+
+from tg_bot.dedup import CallbackDedup, IN_PROGRESS, deduplicated
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def _query(qid, message_id=7, data="shop:0"):
+    answers = []
+
+    async def answer(text=None, show_alert=None):
+        answers.append((text, show_alert))
+
+    return SimpleNamespace(
+        id=qid,
+        data=data,
+        from_user=SimpleNamespace(id=1),
+        message=SimpleNamespace(chat=SimpleNamespace(id=2), message_id=message_id),
+        answer=answer,
+        answers=answers,
+    )
+
+
+def test_repeats_get_cached_reply_until_ttl():
+    clock = Clock()
+    dedup = CallbackDedup(ttl=10, tap_window=1, clock=clock)
+    calls = []
+
+    @deduplicated(dedup)
+    async def buy(query, claim):
+        calls.append(query.id)
+        claim.done("Куплено: Зелье")
+
+    async def go():
+        await buy(_query("a"))
+        redelivered, double_tap = _query("a"), _query("b")  # тот же id / та же кнопка
+        await buy(redelivered)
+        await buy(double_tap)
+        assert redelivered.answers == double_tap.answers == [("Куплено: Зелье", False)]
+        await buy(_query("c", message_id=8))  # другая кнопка — новое действие
+        clock.now += 11
+        await buy(_query("d"))  # память истекла
+
+    asyncio.run(go())
+    assert calls == ["a", "c", "d"]
+
+
+def test_deliberate_repeat_purchase_after_double_tap_window():
+    clock = Clock()
+    dedup = CallbackDedup(ttl=10, tap_window=1, clock=clock)
+    calls = []
+
+    @deduplicated(dedup)
+    async def buy(query, claim):
+        calls.append(query.id)
+        claim.done("Куплено: Зелье")
+
+    async def go():
+        await buy(_query("a"))
+        clock.now += 3  # та же кнопка той же витрины, но уже не двойное нажатие
+        await buy(_query("b"))
+        late = _query("a")  # а поздняя повторная доставка первого — всё ещё повтор
+        await buy(late)
+        assert late.answers == [("Куплено: Зелье", False)]
+
+    asyncio.run(go())
+    assert calls == ["a", "b"]
+
+
+def test_in_progress_and_failed_actions():
+    dedup = CallbackDedup(ttl=10, clock=Clock())
+    gate = asyncio.Event()
+    calls = []
+
+    @deduplicated(dedup)
+    async def battle(query, claim):
+        calls.append(query.id)
+        await gate.wait()
+        if query.id == "a":
+            return  # отказ без done() — повтор обработается заново
+        claim.done("Бой уже проведён")
+
+    async def go():
+        first = asyncio.create_task(battle(_query("a")))
+        await asyncio.sleep(0)
+        dup = _query("b")
+        await battle(dup)
+        assert dup.answers == [IN_PROGRESS]
+        gate.set()
+        await first
+        await battle(_query("c"))
+
+    asyncio.run(go())
+    assert calls == ["a", "c"]
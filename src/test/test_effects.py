@@ -0,0 +1,81 @@
+import sys
+import os
+from dataclasses import replace
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.config import DEFS
+from my_game.battle.effects import EffectStore, effect_mask
+
+
+def _apply_three(mode, max_stacks=2):
+    rules = replace(DEFS.rules, buff_stacking=mode, max_stacks=max_stacks)
+    store = EffectStore()
+    for d in (1, 2, 3):
+        store.add({"effect": "burn", "duration": d}, rules)
+    return [e["duration"] for e in store.instances("burn")]
+
+
+@pytest.mark.parametrize(
+    "mode, durations",
+    [("refresh", [3]), ("independent", [1, 2, 3]), ("stack", [2, 3])],
+)
+def test_stacking_modes(mode, durations):
+    assert _apply_three(mode) == durations
+
+
+def test_mask_tracks_presence():
+    store = EffectStore([{"effect": "stun"}, {"effect": "burn"}, {"effect": "burn"}])
+    assert store.has("stun") and store.mask & effect_mask(("evade", "stun"))
+    first = store.get("burn")
+    store.remove(first)
+    assert store.has("burn") and len(store) == 2
+    store.discard("burn")
+    store.remove(store.get("stun"))
+    assert not store and not store.has("burn")
+
+
+def test_turn_clock_expires_effects_and_cooldowns():
+    from my_game.monsters.monster import Monster
+    from my_game.battle.status import end_of_turn
+
+    orc = Monster.from_config("ORC", 3)
+    orc.apply_effect({"effect": "burn", "duration": 2})
+    orc.apply_effect({"effect": "evade", "duration": 1})
+    orc.cooldowns["Smash"] = orc.turn_clock + 2
+
+    end_of_turn(orc)
+    assert orc.has_effect("burn") and not orc.has_effect("evade")
+    assert orc.cooldown_left("Smash") == 1
+    end_of_turn(orc)
+    assert not orc.effects and orc.cooldown_left("Smash") == 0
+    assert orc.health < orc.max_health  # burn успел сработать дважды
+
+
+def test_effect_bits_are_fixed_by_config_and_thread_safe():
+    import threading
+    from my_game.config import current
+    from my_game.battle.effects import _BUILTIN, effect_bit
+
+    # имена конфига получили биты при его сборке, в порядке имён
+    names = sorted(set(current().status_effects) - set(_BUILTIN))
+    bits = [effect_bit(n) for n in names]
+    assert bits == sorted(bits) and len(set(bits)) == len(bits)
+    assert effect_bit("evade") == 1 << _BUILTIN.index("evade")
+
+    # новые имена из разных потоков не получают один бит
+    fresh = [f"test_fx_{i}" for i in range(16)]
+    got = {}
+
+    def grab(chunk):
+        for n in chunk:
+            got[n] = effect_bit(n)
+
+    threads = [threading.Thread(target=grab, args=(fresh[i::4],)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(got.values())) == len(fresh)
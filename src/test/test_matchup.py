@@ -0,0 +1,65 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.battle.context import BattleContext
+from my_game.battle.damage import (
+    base_damage,
+    calc_damage,
+    check_hit,
+    hit_chance,
+    matchup,
+    roll_strikes,
+)
+from my_game.battle.enums import Element
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+
+
+def test_matchup_is_cached_until_stats_change():
+    hero = PlayerCharacter.from_config("WARRIOR", 5, owner=None)
+    orc = Monster.from_config("ORC", 5)
+    BattleContext(seed=1).join(hero, orc)
+
+    m = matchup(hero, orc)
+    assert matchup(hero, orc) is m
+    assert m.hit == hit_chance(hero, orc)
+    assert m.damage(1.1) == base_damage(hero, orc, power=1.1)
+
+    hero.level_up()  # меняет статы → новая версия
+    m2 = matchup(hero, orc)
+    assert m2 is not m
+    assert m2.damage() == pytest.approx(base_damage(hero, orc))
+
+    orc.defense += 50
+    orc.stats_changed()
+    assert matchup(hero, orc).damage() < m2.damage()
+
+
+def test_roll_strikes_matches_per_target_rolls():
+    def setup(seed):
+        mage = PlayerCharacter.from_config("MAGE", 8, owner=None)
+        orcs = [Monster.from_config("ORC", 5) for _ in range(4)]
+        BattleContext(seed=seed).join(mage, *orcs)
+        return mage, orcs
+
+    mage, orcs = setup(7)
+    strikes = roll_strikes(
+        mage, orcs, element=Element.FIRE, power=1.6, success_chance=0.9
+    )
+
+    mage, orcs = setup(7)
+    expected = []
+    for orc in orcs:
+        if mage.battle.rng.random() > 0.9:
+            expected.append(None)
+        elif not check_hit(mage, orc):
+            expected.append(0)
+        else:
+            expected.append(calc_damage(mage, orc, element=Element.FIRE, power=1.6))
+
+    got = [None if s.failed else s.damage for s in strikes]
+    assert got == expected
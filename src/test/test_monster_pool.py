@@ -0,0 +1,28 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.monsters.monster import Monster
+from my_game.battle.context import BattleContext
+
+
+def test_clones_share_immutable_data_but_not_combat_state():
+    a = Monster.from_config("ORC", 5)
+    a.take_damage(10)
+    a.apply_effect({"effect": "burn", "duration": 2})
+    a.cooldowns["Smash"] = 3
+    BattleContext(seed=1).join(a)
+
+    b = Monster.from_config("ORC", 5)
+    assert b.health == b.max_health
+    assert b.status_effects == [] and b.cooldowns == {}
+    assert b.battle is not a.battle
+    assert b.display_name != a.display_name
+    assert b.resistances is a.resistances and b.template is a.template
+    assert Monster.prototype("ORC", 5).health == b.max_health
+    assert b.loot_table is not a.loot_table
+
+    b.loot_table["Gem"] = 1.0  # добыча клона не течёт в прототип и соседей
+    assert "Gem" not in Monster.from_config("ORC", 5).loot_table
+    assert "Gem" not in Monster.prototype("ORC", 5).loot_table
@@ -0,0 +1,57 @@
+import sys
+import os
+import random
+from collections import Counter
+from dataclasses import replace
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.config import DEFS
+from my_game.battle.scheduler import TurnScheduler
+from my_game.battle.context import BattleContext
+from my_game.battle.engine import run_battle
+from my_game.battle.events import ListSink, ExtraTurn, Hit, Miss
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+
+
+def _unit(name, agility):
+    return SimpleNamespace(name=name, agility=agility, is_alive=True)
+
+
+def _rules(mode, weight=0.0):
+    return replace(DEFS.rules, turn_order=mode, turn_random_weight=weight)
+
+
+def test_agility_priority_rounds_and_deaths():
+    fast, mid, slow = _unit("fast", 30), _unit("mid", 20), _unit("slow", 10)
+    sched = TurnScheduler([slow, fast, mid], _rules("agility_priority"), random.Random(1))
+    assert [sched.pop().name for _ in range(3)] == ["fast", "mid", "slow"]
+    assert sched.round == 1
+
+    mid.is_alive = False  # погибший выпадает из очереди без пересортировки
+    sched.push_extra(slow)
+    assert [sched.pop().name for _ in range(3)] == ["slow", "fast", "slow"]
+    assert sched.round == 2
+
+
+def test_speed_gives_faster_units_more_turns():
+    fast, slow = _unit("fast", 40), _unit("slow", 10)
+    sched = TurnScheduler([fast, slow], _rules("speed", 0.1), random.Random(2))
+    turns = Counter(sched.pop().name for _ in range(500))
+    assert 3.5 < turns["fast"] / turns["slow"] < 4.5
+
+
+def test_extra_turn_is_queued_right_after_the_turn():
+    sink = ListSink()
+    ctx = BattleContext(sink, seed=3)
+    hero = PlayerCharacter.from_config("WARRIOR", 5, owner=None)
+    orc = Monster.from_config("ORC", 5)
+    hero.apply_effect({"effect": "extra_turn", "duration": 1})
+
+    run_battle(ctx, [hero], [orc], max_rounds=1)
+
+    attacks = [e.attacker for e in sink.of_type(Hit, Miss)]
+    assert len(sink.of_type(ExtraTurn)) == 1
+    assert attacks.count(hero) == 2 and attacks.count(orc) <= 1
@@ -0,0 +1,37 @@
+import sys
+import os
+import copy
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.characters.player import Player
+from my_game.characters.character_class import CharacterClass
+from my_game.simulation import derive_seed, run_series_parallel, run_trials
+
+
+def _hero():
+    return Player(id=1, username="t").create_character("Leon", CharacterClass.ROGUE)
+
+
+def test_series_match_sequential_run_trials():
+    hero = _hero()
+    series = [dict(tier=1, trials=20), dict(tier=2, trials=15)]
+
+    results = run_series_parallel(hero, series, seed=11, workers=1)
+
+    for i, kwargs in enumerate(series):
+        # герой растёт на протяжении всей серии, как в run_trials
+        expected = run_trials(copy.deepcopy(hero), seed=derive_seed(11, i), **kwargs)
+        assert results[i] == expected
+    assert hero.level == 1  # исходный герой не тронут
+
+
+def test_parallel_result_does_not_depend_on_worker_count():
+    hero = _hero()
+    series = [dict(tier=1, trials=20)] * 3
+
+    single = run_series_parallel(hero, series, seed=11, workers=1)
+    pooled = run_series_parallel(hero, series, seed=11, workers=2)
+
+    assert single == pooled
+    assert [s["trials"] for s in single] == [20, 20, 20]
@@ -0,0 +1,45 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.config import DEFS
+from my_game.config_defs import DamageSkill, PassiveSkill
+from my_game.battle.context import BattleContext
+from my_game.battle.enums import CritType
+from my_game.battle.events import ListSink, Splash
+from my_game.battle.passives import NO_PASSIVES, hooks_for
+from my_game.battle.skill_executor import execute_skill
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+
+
+def test_skills_are_compiled_with_handler_and_crit():
+    backstab = DEFS.skills["Backstab"]
+    assert isinstance(backstab, DamageSkill) and backstab.handler is not None
+    assert backstab.crit is CritType.HEAVY
+    assert DEFS.skills["Fireball"].crit is CritType.NORMAL
+    assert isinstance(DEFS.skills["Cleave"], PassiveSkill)
+
+    mage = PlayerCharacter.from_config("MAGE", 5, owner=None)
+    orc = Monster.from_config("ORC", 5)
+    BattleContext(seed=1).join(mage, orc)
+    execute_skill(mage, orc, DEFS.skills["Fireball"])
+    assert mage.mana == mage.base_mana - DEFS.skills["Fireball"].mana_cost
+    assert mage.cooldown_left("Fireball") == DEFS.skills["Fireball"].cooldown
+
+
+def test_passives_are_hooks_built_from_skills():
+    assert hooks_for(["Fireball"]) is NO_PASSIVES
+    assert len(hooks_for(["Cleave", "Last Stand"]).after_attack) == 1
+
+    sink = ListSink()
+    hero = PlayerCharacter.from_config("WARRIOR", 10, owner=None)
+    assert hero.has_effect("survive_one_turn")  # Last Stand при сборке
+    orcs = [Monster.from_config("ORC", 1) for _ in range(2)]
+    BattleContext(sink, seed=2).join(hero, *orcs)
+    hero._visible_enemies = orcs
+    for _ in range(5):
+        hero.attack(orcs[0])
+    splashes = sink.of_type(Splash)
+    assert splashes and all(e.target is orcs[1] for e in splashes)
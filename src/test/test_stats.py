@@ -0,0 +1,61 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.base.stats import Modifier
+from my_game.battle.context import BattleContext
+from my_game.battle.skill_executor import execute_skill
+from my_game.characters.player_character import PlayerCharacter
+from my_game.items.item import GearItem
+from my_game.items.enums import ItemSlot, ItemQuality
+from my_game.monsters.monster import Monster
+
+
+def _helm(name, **stats):
+    return GearItem(
+        name=name,
+        price=1,
+        slot=ItemSlot.HEAD,
+        quality=ItemQuality.FINE,
+        allowed_classes=[],
+        stats=stats,
+    )
+
+
+def test_gear_and_growth_layers():
+    pc = PlayerCharacter.from_config("WARRIOR", 5, owner=None)
+    base_str, base_dodge = pc.strength, pc.dodge_chance
+
+    pc.equip_item(_helm("a", strength=3, dodge_chance=0.01))
+    assert pc.strength == base_str + 3
+    pc.equip_item(_helm("b", strength=1))  # прежний шлем снимается
+    assert pc.strength == base_str + 1 and pc.dodge_chance == base_dodge
+
+    version = pc._stat_version
+    pc.level_up()
+    assert pc.strength == base_str + 1 + int(pc._growth["strength"])
+    assert pc._stat_version > version
+    assert len(pc.stats.layer("growth")) == 10
+
+
+def test_buffs_follow_effects_and_battle_reset():
+    pc = PlayerCharacter.from_config("WARRIOR", 6, owner=None)
+    orc = Monster.from_config("ORC", 5)
+    BattleContext(seed=1).join(pc, orc)
+    pc.team = [pc]
+    pc._visible_enemies = [orc]
+    base_str = pc.strength
+
+    execute_skill(pc, [pc], "Battle Roar")  # +8 % STR на 3 хода
+    assert pc.strength == int(base_str * 1.08 + 0.5)
+    for _ in range(3):
+        pc.tick_effects()
+    assert pc.strength == base_str
+
+    pc.stats.add(Modifier("defense", 0.5, "auras", percent=True))
+    assert pc.defense == pytest.approx(pc.stats.value("defense"))
+    pc.reset_combat_state()
+    assert pc.stats.layer("auras") == [] and pc.stats.layer("buffs") == []
@@ -0,0 +1,39 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from my_game.battle.context import BattleContext
+from my_game.battle.skill_executor import execute_skill
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+
+
+def _ready(pc, target):
+    mask = pc.ready_skills(target)
+    return {name for name, bit in pc.skill_book().bits.items() if mask & bit}
+
+
+def test_ready_bitset_follows_triggers_cooldowns_and_mana():
+    rogue = PlayerCharacter.from_config("ROGUE", 10, owner=None)
+    orc = Monster.from_config("ORC", 5)
+    BattleContext(seed=1).join(rogue, orc)
+
+    ready = _ready(rogue, orc)
+    assert "Backstab" in ready  # if_first: ещё не ходил
+    assert "Assassinate" not in ready  # if_enemy_low_hp: орк цел
+
+    orc.health = 1
+    rogue._has_acted = True
+    ready = _ready(rogue, orc)
+    assert "Assassinate" in ready and "Backstab" not in ready
+
+    execute_skill(rogue, orc, "Poisoned Blade")
+    assert not rogue.can_use("Poisoned Blade", orc)
+    for _ in range(rogue.cooldown_left("Poisoned Blade")):
+        rogue.tick_effects()
+    assert rogue.can_use("Poisoned Blade", orc)
+
+    rogue.mana = 0
+    assert _ready(rogue, orc) == {"Evasion Mastery"}  # без цены
+    assert not rogue.can_use("Fireball", orc)  # чужой навык
@@ -0,0 +1,61 @@
+import sys
+import os
+import math
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+pytest.importorskip("numpy")
+
+from my_game.characters.player_character import PlayerCharacter
+from my_game.monsters.monster import Monster
+from my_game.battle.context import BattleContext
+from my_game.simulation.vectorized import FighterArrays, simulate_duels
+
+
+def _scalar_duel(hero_level, monster_type, monster_level, seed):
+    """Та же модель на обычном движке: только attack() в порядке инициативы."""
+    hero = PlayerCharacter.from_config("WARRIOR", hero_level, owner=None)
+    monster = Monster.from_config(monster_type, monster_level)
+    ctx = BattleContext(seed=seed)
+    ctx.join(hero, monster)
+    rng = ctx.rng
+    rounds = 0
+    while hero.is_alive and monster.is_alive:
+        rounds += 1
+        order = sorted(
+            [(hero, monster), (monster, hero)],
+            key=lambda p: p[0].agility + rng.random() * 0.1,
+            reverse=True,
+        )
+        for actor, target in order:
+            actor.attack(target)
+            if not target.is_alive:
+                break
+    return hero.is_alive, rounds
+
+
+@pytest.mark.parametrize("monster_type", ["ORC", "ELEMENTAL"])
+def test_vectorized_matches_scalar_engine(monster_type):
+    trials = 2000
+    outcomes = [_scalar_duel(3, monster_type, 7, seed) for seed in range(trials)]
+    p_scalar = sum(win for win, _ in outcomes) / trials
+    rounds_scalar = sum(r for _, r in outcomes) / trials
+
+    hero = PlayerCharacter.from_config("WARRIOR", 3, owner=None)
+    monster = Monster.from_config(monster_type, 7)
+    res = simulate_duels(hero, monster, 50_000, seed=1)
+
+    # 4σ биномиальной ошибки скалярной выборки
+    tol = 4 * math.sqrt(max(p_scalar * (1 - p_scalar), 0.01) / trials)
+    assert abs(res.win_rate - p_scalar) < tol
+    assert abs(res.rounds.mean() - rounds_scalar) < 0.1 * rounds_scalar
+    assert res.draws == 0
+
+
+def test_arrays_keep_per_battle_fighters():
+    heroes = [PlayerCharacter.from_config("ROGUE", lvl, owner=None) for lvl in (1, 5)]
+    arrays = FighterArrays.from_combatants(heroes)
+    assert len(arrays) == 2
+    assert list(arrays.health) == [h.health for h in heroes]
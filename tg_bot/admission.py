@@ -0,0 +1,96 @@
+from __future__ import annotations
+import os
+import time
+from typing import Callable, Dict, Hashable, Set, Tuple
+
+from .battle_pool import WORKERS
+
+
+# Сколько боёв может идти одновременно на весь бот
+MAX_CONCURRENT = int(os.getenv("BATTLE_MAX_CONCURRENT", str(max(1, WORKERS) * 2)))
+# Ведро токенов одного игрока: боёв в минуту и запас подряд
+RATE_PER_MINUTE = float(os.getenv("BATTLE_RATE_PER_MINUTE", "6"))
+BURST = float(os.getenv("BATTLE_BURST", "3"))
+
+
+class BattleBusy(Exception):
+    """Бой не принят; текст исключения — ответ игроку."""
+
+
+class BattleSlot:
+    """Допуск к одному бою; освобождается при выходе из `with`."""
+
+    __slots__ = ("_admission", "key")
+
+    def __init__(self, admission: "BattleAdmission", key: Hashable):
+        self._admission = admission
+        self.key = key
+
+    def __enter__(self) -> "BattleSlot":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._admission.release(self.key)
+
+
+class BattleAdmission:
+    """
+    Допуск боёв бота: не больше одного боя на игрока (вместе с записью
+    итогов в БД), не больше `max_concurrent` боёв на всех и ведро токенов
+    на игрока. Лишние запросы отклоняются сразу (BattleBusy), а не ждут в
+    очереди — пара активных игроков не займёт пул целиком.
+
+    Работает в одном цикле событий без await внутри, поэтому без блокировок.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = MAX_CONCURRENT,
+        rate_per_minute: float = RATE_PER_MINUTE,
+        burst: float = BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrent = max_concurrent
+        self.rate = rate_per_minute / 60.0
+        self.burst = burst
+        self._clock = clock
+        self._active: Set[Hashable] = set()
+        # игрок → (токены, время последнего пересчёта)
+        self._buckets: Dict[Hashable, Tuple[float, float]] = {}
+
+    def busy(self, key: Hashable) -> bool:
+        """Идёт ли у игрока бой."""
+        return key in self._active
+
+    def admit(self, key: Hashable) -> BattleSlot:
+        """Занять слот боя для игрока `key` или бросить BattleBusy."""
+        if key in self._active:
+            raise BattleBusy("Предыдущий бой ещё идёт.")
+        if len(self._active) >= self.max_concurrent:
+            raise BattleBusy("Сейчас слишком много боёв, попробуйте чуть позже.")
+        now = self._clock()
+        tokens = self._tokens(key, now)
+        if tokens < 1.0:
+            raise BattleBusy("Слишком часто! Передохните немного.")
+        self._buckets[key] = (tokens - 1.0, now)
+        self._active.add(key)
+        return BattleSlot(self, key)
+
+    def release(self, key: Hashable) -> None:
+        self._active.discard(key)
+        if len(self._buckets) > 1024:
+            self._prune()
+
+    # ───────────────────────
+    #  Ведро токенов
+    # ───────────────────────
+    def _tokens(self, key: Hashable, now: float) -> float:
+        tokens, last = self._buckets.get(key, (self.burst, now))
+        return min(self.burst, tokens + (now - last) * self.rate)
+
+    def _prune(self) -> None:
+        # полное ведро ничем не отличается от отсутствующего
+        now = self._clock()
+        for key in [k for k in self._buckets if k not in self._active]:
+            if self._tokens(key, now) >= self.burst:
+                del self._buckets[key]
@@ -0,0 +1,188 @@
+from __future__ import annotations
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import NamedTuple, Optional, Sequence, Set, Tuple
+
+from my_game.characters.player_character import PlayerCharacter
+from my_game.config import current, dump_snapshot, install
+from my_game.config_defs import GameConfig
+
+from .services import simulate_battle
+
+
+logger = logging.getLogger(__name__)
+
+# Сколько боёв считать одновременно; 0 — один поток вместо процессов
+WORKERS = int(os.getenv("BATTLE_WORKERS", str(min(4, os.cpu_count() or 1))))
+# Сколько секунд ждать один бой
+TIMEOUT = float(os.getenv("BATTLE_TIMEOUT", "30"))
+
+
+class HeroState(NamedTuple):
+    """Всё, что нужно воркеру для героя, и всё, что возвращается обратно."""
+
+    class_name: str
+    level: int
+    name: str
+    exp: int
+    health: int
+    mana: float
+
+    @classmethod
+    def of(cls, pc: PlayerCharacter) -> "HeroState":
+        return cls(pc.char_class.name, pc.level, pc.name, pc.exp, pc.health, pc.mana)
+
+    def build(self) -> PlayerCharacter:
+        pc = PlayerCharacter.from_config(
+            self.class_name, self.level, owner=None, name_override=self.name
+        )
+        pc.exp = self.exp
+        pc.health = self.health
+        pc.mana = self.mana
+        return pc
+
+    def apply_to(self, pc: PlayerCharacter) -> None:
+        """Перенести итог боя на исходного героя (с ростом уровней)."""
+        while pc.level < self.level:
+            pc.level_up()
+        pc.exp = self.exp
+        pc.health = self.health
+        pc.mana = self.mana
+
+
+class ShippedConfig(NamedTuple):
+    """Снимок конфига основного процесса, отправляемый с каждым боем."""
+
+    fingerprint: str
+    version: int
+    payload: bytes  # dump_snapshot(); разбирается воркером, только если нужен
+
+    @classmethod
+    def of(cls, snap: GameConfig) -> "ShippedConfig":
+        # сериализуем один раз на снимок, а не на каждый бой
+        global _shipped
+        if _shipped is None or _shipped[:2] != (snap.fingerprint, snap.version):
+            _shipped = cls(snap.fingerprint, snap.version, dump_snapshot(snap))
+        return _shipped
+
+
+_shipped: Optional[ShippedConfig] = None
+# снимки, которые воркер не смог собрать: каждую версию пробуем один раз
+_failed: Set[str] = set()
+
+
+def _follow_parent(shipped: ShippedConfig) -> GameConfig:
+    """Перейти в воркере на снимок основного процесса, если он новее."""
+    snap = current()
+    if (
+        snap.fingerprint != shipped.fingerprint
+        # в режиме потока снимок общий — старый бой не откатывает новый
+        and shipped.version >= snap.version
+        and shipped.fingerprint not in _failed
+    ):
+        try:
+            snap = install(
+                shipped.payload, version=shipped.version, fingerprint=shipped.fingerprint
+            )
+        except Exception:
+            _failed.add(shipped.fingerprint)
+            logger.exception("worker could not install config v%s", shipped.version)
+    return snap
+
+
+class BattleResult(NamedTuple):
+    log: str
+    win: bool
+    xp: int
+    gold: int
+    party: Tuple[HeroState, ...]
+
+
+def run_battle_job(
+    party: Tuple[HeroState, ...], tier: int, shipped: ShippedConfig
+) -> BattleResult:
+    """
+    Тело задачи в воркере: собрать отряд по состоянию, провести бой,
+    вернуть лог и новое состояние героев. Золото не начисляется — владелец
+    остаётся в основном процессе. Бой идёт на снимке конфига основного
+    процесса (`shipped`), а не на YAML с диска.
+    """
+    snap = _follow_parent(shipped)
+    if snap.fingerprint != shipped.fingerprint:
+        logger.warning(
+            "battle tier=%s runs on config v%s, bot is on v%s",
+            tier, snap.version, shipped.version,
+        )
+    heroes = [state.build() for state in party]
+    log, win, xp, gold = simulate_battle(heroes, tier)
+    return BattleResult(log, win, xp, gold, tuple(HeroState.of(h) for h in heroes))
+
+
+class BattlePool:
+    """
+    Пул для боёв бота: симуляция идёт вне цикла событий aiogram, поэтому
+    долгий бой не останавливает опрос для остальных. Каждый бой пишет лог
+    в собственный TextLogRenderer, так что параллельные бои не смешиваются.
+    """
+
+    def __init__(self, workers: int = WORKERS, timeout: float = TIMEOUT):
+        self.workers = workers
+        self.timeout = timeout
+        self._executor: Executor | None = None
+
+    def start(self) -> None:
+        if self._executor is not None:
+            return
+        if self.workers > 0:
+            # spawn: форк процесса с потоками aiosqlite/aiohttp небезопасен
+            self._executor = ProcessPoolExecutor(
+                self.workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        else:
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix="battle")
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def run(
+        self, party: Sequence[PlayerCharacter], tier: int
+    ) -> Tuple[str, bool, int, int]:
+        """
+        Провести бой в пуле и применить итог к `party`: опыт, уровни, HP,
+        ману и золото владельца. Возвращает (log, win, xp, gold), как
+        simulate_battle. При превышении таймаута — asyncio.TimeoutError,
+        отряд при этом не меняется. Воркер доиграет брошенный бой впустую,
+        но не дольше BATTLE_MAX_ROUNDS раундов (services.simulate_battle).
+        """
+        if not party:
+            raise ValueError("Party cannot be empty")
+        self.start()
+        states = tuple(HeroState.of(pc) for pc in party)
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, run_battle_job, states, tier, ShippedConfig.of(current())
+        )
+        try:
+            result = await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            logger.warning("battle tier=%s timed out after %ss", tier, self.timeout)
+            raise
+
+        for pc, state in zip(party, result.party):
+            state.apply_to(pc)
+        owner = party[0].owner
+        if owner and result.gold:
+            owner.add_gold(result.gold)
+        return result.log, result.win, result.xp, result.gold
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.shutdown()
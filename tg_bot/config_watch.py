@@ -0,0 +1,42 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+
+from my_game.config import config_fingerprint, current, reload
+
+
+logger = logging.getLogger(__name__)
+
+# Как часто проверять src/config (секунды); 0 — не следить
+POLL_SECONDS = float(os.getenv("CONFIG_POLL_SECONDS", "2"))
+
+
+async def watch_config(interval: float = POLL_SECONDS) -> None:
+    """
+    Следит за YAML в src/config и подменяет снимок конфига, когда файлы
+    изменились. Идущие бои доигрывают на своём снимке (BattleContext.config),
+    новые берут свежий. Сломанный YAML не применяется: старый снимок
+    остаётся, ошибка пишется в лог один раз на каждую версию файлов.
+    """
+    failed = ""  # хеш версии файлов, на которой reload уже упал
+    while True:
+        await asyncio.sleep(interval)
+        key = None  # файл мог пропасть посреди записи — тогда хеша нет
+        try:
+            key = await asyncio.to_thread(config_fingerprint)
+            if key == current().fingerprint or key == failed:
+                continue
+            snap = await asyncio.to_thread(reload)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            if key != failed:
+                logger.exception(
+                    "config reload failed, keeping v%s", current().version
+                )
+            failed = key
+            continue
+        failed = ""
+        if snap is not None:
+            logger.info("config reloaded: v%s (%s)", snap.version, snap.fingerprint)
@@ -0,0 +1,152 @@
+from __future__ import annotations
+import os
+import time
+from collections import OrderedDict
+from functools import wraps
+from typing import Awaitable, Callable, Dict, Optional, Tuple
+
+from aiogram.types import CallbackQuery
+
+
+# Сколько секунд помнить обработанный callback (повторная доставка по id)
+TTL = float(os.getenv("CALLBACK_DEDUP_TTL", "10"))
+# Окно двойного нажатия: столько секунд та же кнопка считается повтором
+TAP_WINDOW = float(os.getenv("CALLBACK_DOUBLE_TAP", "1"))
+
+IN_PROGRESS = ("Уже обрабатывается…", False)
+
+Reply = Tuple[str, bool]  # (текст ответа на callback, show_alert)
+
+
+def callback_keys(query: CallbackQuery) -> Tuple[str, ...]:
+    """
+    Ключи повтора: id callback (повторная доставка Telegram) и «токен
+    действия» — та же кнопка того же сообщения от того же игрока (двойное
+    нажатие даёт новый id, но тот же токен). Токен помнится только окно
+    двойного нажатия: нарочно повторить покупку с той же витрины можно.
+    """
+    keys = [f"id:{query.id}"]
+    if query.message is not None:
+        keys.append(
+            f"msg:{query.message.chat.id}:{query.message.message_id}:"
+            f"{query.from_user.id}:{query.data}"
+        )
+    return tuple(keys)
+
+
+class Claim:
+    """Первая обработка callback; в `with` — снимается, если не завершена."""
+
+    __slots__ = ("_dedup", "keys", "reply")
+
+    def __init__(self, dedup: "CallbackDedup", keys: Tuple[str, ...], reply=None):
+        self._dedup = dedup
+        self.keys = keys
+        # ответ для повтора; None — это первая доставка
+        self.reply: Optional[Reply] = reply
+
+    @property
+    def duplicate(self) -> bool:
+        return self.reply is not None
+
+    def done(self, text: str = "", show_alert: bool = False) -> None:
+        """Запомнить итог: повторы получат этот ответ без новой обработки."""
+        self._dedup._finish(self.keys, (text or "Уже выполнено.", show_alert))
+
+    def __enter__(self) -> "Claim":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # не дошли до done() (ошибка, отказ) — повтор обработается заново
+        self._dedup._forget(self)
+
+
+class CallbackDedup:
+    """
+    Короткоживущая память обработанных callback'ов, в памяти процесса.
+
+    Пока первый callback обрабатывается, повторы получают «Уже
+    обрабатывается…»; после done() — сохранённый ответ: по id callback в
+    течение `ttl` секунд, по кнопке — `tap_window` секунд. Ни бой, ни
+    покупка при повторе не выполняются снова.
+    """
+
+    def __init__(
+        self,
+        ttl: float = TTL,
+        tap_window: float = TAP_WINDOW,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.tap_window = tap_window
+        self._clock = clock
+        self._pending: Dict[str, Claim] = {}
+        # ключ → (истекает, ответ); у каждого окна своё хранилище, чтобы
+        # порядок вставки совпадал с порядком истечения
+        self._ids: "OrderedDict[str, Tuple[float, Reply]]" = OrderedDict()
+        self._taps: "OrderedDict[str, Tuple[float, Reply]]" = OrderedDict()
+
+    def claim(self, query: CallbackQuery) -> Claim:
+        return self.claim_keys(callback_keys(query))
+
+    def claim_keys(self, keys: Tuple[str, ...]) -> Claim:
+        now = self._clock()
+        self._expire(self._ids, now)
+        self._expire(self._taps, now)
+        for key in keys:
+            if key in self._pending:
+                return Claim(self, keys, IN_PROGRESS)
+            hit = self._store(key).get(key)
+            if hit is not None:
+                return Claim(self, keys, hit[1])
+        claim = Claim(self, keys)
+        for key in keys:
+            self._pending[key] = claim
+        return claim
+
+    def _store(self, key: str) -> "OrderedDict[str, Tuple[float, Reply]]":
+        return self._ids if key.startswith("id:") else self._taps
+
+    def _finish(self, keys: Tuple[str, ...], reply: Reply) -> None:
+        now = self._clock()
+        for key in keys:
+            self._pending.pop(key, None)
+            store = self._store(key)
+            window = self.ttl if store is self._ids else self.tap_window
+            store.pop(key, None)
+            store[key] = (now + window, reply)
+
+    def _forget(self, claim: Claim) -> None:
+        for key in claim.keys:
+            if self._pending.get(key) is claim:
+                del self._pending[key]
+
+    @staticmethod
+    def _expire(done: "OrderedDict[str, Tuple[float, Reply]]", now: float) -> None:
+        while done:
+            key, (expires, _) = next(iter(done.items()))
+            if expires > now:
+                break
+            del done[key]
+
+
+def deduplicated(dedup: CallbackDedup):
+    """
+    Обёртка callback-хендлера: повторы отвечаются сохранённым итогом, а сам
+    хендлер получает Claim вторым аргументом и вызывает claim.done(текст),
+    когда действие выполнено.
+    """
+
+    def wrap(handler: Callable[[CallbackQuery, Claim], Awaitable[None]]):
+        @wraps(handler)
+        async def wrapper(query: CallbackQuery):
+            claim = dedup.claim(query)
+            if claim.duplicate:
+                await query.answer(*claim.reply)
+                return
+            with claim:
+                await handler(query, claim)
+
+        return wrapper
+
+    return wrap
@@ -1,4 +1,5 @@
 from __future__ import annotations
+import asyncio
 
 from aiogram import Router, F
 from aiogram.enums import ChatType
@@ -11,7 +12,10 @@ from aiogram.types import (
 from aiogram.filters import CommandStart
 
 from ..repositories.db import Database
-from ..services import simulate_battle, store
+from ..admission import BattleAdmission, BattleBusy
+from ..battle_pool import BattlePool
+from ..dedup import CallbackDedup, Claim, deduplicated
+from ..services import store
 from ..keyboards import (
     main_menu,
     chars_menu,
@@ -20,7 +24,7 @@ from ..keyboards import (
 )
 from my_game.characters.character_class import CharacterClass
 from my_game.items.item import GearItem
-from my_game.config import CONFIG
+from my_game.config import current
 
 router = Router()
 # Отбираем только личные чаты
@@ -30,6 +34,10 @@ active_shops: dict[tuple[int, int], list] = {}
 active_inventories: dict[tuple[int, int], list] = {}
 party_select: dict[tuple[int, int], list] = {}
 pending_battles: dict[tuple[int, int], list] = {}
+# один бой на игрока, общий предел и ведро токенов (tg_bot/admission.py)
+admission = BattleAdmission()
+# повторы callback'ов отвечают сохранённым итогом (tg_bot/dedup.py)
+dedup = CallbackDedup()
 
 
 @router.message(CommandStart())
@@ -72,13 +80,11 @@ async def rest_character(message: Message):
         return
     chars = await db.characters.get_characters(message.from_user.id, message.chat.id)
     id_map = {c.db_id: c for c in chars}
-    for cid in party_ids:
-        pc = id_map.get(cid)
-        if not pc:
-            continue
+    party = [id_map[cid] for cid in party_ids if cid in id_map]
+    for pc in party:
         pc.health = pc.max_health
         pc.mana = pc.base_mana
-        await db.characters.update_character(pc, message.chat.id)
+    await db.characters.update_characters(party, message.chat.id)
     await message.answer("Отряд отдохнул и восстановлен.", reply_markup=main_menu())
 
 
@@ -181,6 +187,9 @@ async def save_party(query: CallbackQuery):
 
 @router.message(F.text == "⚔ Бой")
 async def start_battle(message: Message):
+    if admission.busy((message.from_user.id, message.chat.id)):
+        await message.answer("Предыдущий бой ещё идёт.", reply_markup=main_menu())
+        return
     db: Database = message.bot.db
     party_ids = await db.party.get_party(message.from_user.id, message.chat.id)
     if not party_ids:
@@ -198,33 +207,55 @@ async def start_battle(message: Message):
 
     pending_battles[(message.from_user.id, message.chat.id)] = party
 
-    tiers = CONFIG["monsters"]["monster_tiers"]
-    tier_keys = ["tier1", "tier2", "tier3", "tier4"]
+    tiers = current().tiers
     buttons = [
-        [InlineKeyboardButton(text=tiers[k]["name"], callback_data=f"battle:{i+1}")]
-        for i, k in enumerate(tier_keys)
+        [InlineKeyboardButton(text=tiers[n].name, callback_data=f"battle:{n}")]
+        for n in (1, 2, 3, 4)
     ]
     kb = InlineKeyboardMarkup(inline_keyboard=buttons)
     await message.answer("Выберите сложность боя:", reply_markup=kb)
 
 
 @router.callback_query(F.data.startswith("battle:"))
-async def handle_battle_callback(query: CallbackQuery):
+@deduplicated(dedup)
+async def handle_battle_callback(query: CallbackQuery, claim: Claim):
     tier = int(query.data.split(":", 1)[1])
     key = (query.from_user.id, query.message.chat.id)
-    party = pending_battles.pop(key, None)
-    if not party:
-        await query.message.answer("Ошибка: отряд не найден.", reply_markup=main_menu())
-        await query.answer()
+    try:
+        slot = admission.admit(key)
+    except BattleBusy as e:
+        # отвечаем сразу, без работы с БД и пулом
+        await query.answer(str(e), show_alert=True)
         return
 
-    log, win, xp, gold = simulate_battle(party, tier)
-    db: Database = query.message.bot.db
-    for pc in party:
-        await db.characters.update_character(pc, query.message.chat.id)
-    owner = party[0].owner
-    if owner:
-        await db.users.update_user(owner, query.message.chat.id)
+    # слот держится до конца записи итогов в БД
+    with slot:
+        party = pending_battles.pop(key, None)
+        if not party:
+            await query.message.answer(
+                "Ошибка: отряд не найден.", reply_markup=main_menu()
+            )
+            await query.answer()
+            return
+
+        battles: BattlePool = query.message.bot.battles
+        try:
+            # бой считается в пуле; опыт, HP и золото уже перенесены на party
+            log, win, xp, gold = await battles.run(party, tier)
+        except asyncio.TimeoutError:
+            await query.message.answer(
+                "Бой затянулся, попробуйте ещё раз.", reply_markup=main_menu()
+            )
+            await query.answer()
+            return
+        db: Database = query.message.bot.db
+        # весь отряд и золото — одной транзакцией
+        async with db.transaction():
+            await db.characters.update_characters(party, query.message.chat.id)
+            owner = party[0].owner
+            if owner:
+                await db.users.update_user(owner, query.message.chat.id)
+        claim.done(f"Бой уже проведён: {'победа' if win else 'поражение'}.")
 
     await query.message.answer(
         f"Результат боя:\n<pre>{log}</pre>",
@@ -252,7 +283,8 @@ async def close_shop(query: CallbackQuery):
 
 
 @router.callback_query(F.data.startswith("shop:"))
-async def buy_item_callback(query: CallbackQuery):
+@deduplicated(dedup)
+async def buy_item_callback(query: CallbackQuery, claim: Claim):
     key = (query.from_user.id, query.message.chat.id)
     goods = active_shops.get(key)
     if goods is None:
@@ -265,12 +297,18 @@ async def buy_item_callback(query: CallbackQuery):
         return
     item = goods[index]
     db: Database = query.message.bot.db
-    user = await db.users.get_user(query.from_user.id, query.message.chat.id)
-    if not user or not user.spend_gold(item.price):
+    # золото и предмет — вместе или никак; игрок читается внутри транзакции,
+    # чтобы откат вернул списанное золото и в кеше
+    async with db.transaction():
+        user = await db.users.get_user(query.from_user.id, query.message.chat.id)
+        paid = bool(user) and user.spend_gold(item.price)
+        if paid:
+            await db.users.update_user(user, query.message.chat.id)
+            await db.inventory.add_item(user.id, query.message.chat.id, item)
+    if not paid:
         await query.answer("Недостаточно золота", show_alert=True)
         return
-    await db.users.update_user(user, query.message.chat.id)
-    await db.inventory.add_item(user.id, query.message.chat.id, item)
+    claim.done(f"Куплено: {item.name}")
     await query.message.answer(f"Куплено: {item.name}")
     await query.answer()
 
@@ -283,7 +321,8 @@ async def close_inventory(query: CallbackQuery):
 
 
 @router.callback_query(F.data.startswith("inv:"))
-async def use_item_callback(query: CallbackQuery):
+@deduplicated(dedup)
+async def use_item_callback(query: CallbackQuery, claim: Claim):
     key = (query.from_user.id, query.message.chat.id)
     items = active_inventories.get(key)
     if items is None:
@@ -295,25 +334,33 @@ async def use_item_callback(query: CallbackQuery):
         return
     item = items[index]
     db: Database = query.message.bot.db
-    chars = await db.characters.get_characters(
-        query.from_user.id, query.message.chat.id
-    )
-    if not chars:
+    # герой читается и меняется внутри транзакции: откат вернёт его и в кеше
+    async with db.transaction():
+        chars = await db.characters.get_characters(
+            query.from_user.id, query.message.chat.id
+        )
+        pc = chars[0] if chars else None
+        replaced = error = None
+        if pc is not None:
+            if isinstance(item, GearItem):
+                try:
+                    replaced = pc.equip_item(item)
+                except ValueError as e:
+                    error = str(e)
+            else:
+                pc.consume_potion(item)
+        if pc is not None and error is None:
+            if replaced and pc.owner:
+                await db.inventory.add_item(pc.owner.id, query.message.chat.id, replaced)
+            await db.characters.update_character(pc, query.message.chat.id)
+            await db.inventory.remove_item(item.db_id, query.message.chat.id)
+    if pc is None:
         await query.message.answer("Нет персонажей")
         await query.answer()
         return
-    pc = chars[0]
-    if isinstance(item, GearItem):
-        try:
-            replaced = pc.equip_item(item)
-        except ValueError as e:
-            await query.answer(str(e), show_alert=True)
-            return
-        if replaced and pc.owner:
-            await db.inventory.add_item(pc.owner.id, query.message.chat.id, replaced)
-    else:
-        pc.consume_potion(item)
-    await db.characters.update_character(pc, query.message.chat.id)
-    await db.inventory.remove_item(item.db_id, query.message.chat.id)
+    if error:
+        await query.answer(error, show_alert=True)
+        return
+    claim.done(f"Использовано: {item.name}")
     await query.message.answer(f"Использовано: {item.name}")
     await query.answer()
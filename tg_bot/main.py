@@ -18,6 +18,8 @@ from aiogram.enums import ParseMode
 from aiogram.client.bot import DefaultBotProperties
 
 from tg_bot.repositories.db import Database
+from tg_bot.battle_pool import BattlePool
+from tg_bot.config_watch import POLL_SECONDS, watch_config
 from tg_bot.handlers import private, group
 
 
@@ -25,14 +27,20 @@ async def main() -> None:
     token = os.getenv("BOT_TOKEN")
     if not token:
         raise RuntimeError("BOT_TOKEN env variable not set")
-    async with Database("bot.db") as db:
+    async with Database("bot.db") as db, BattlePool() as battles:
         bot = Bot(token, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
         bot.db = db
+        bot.battles = battles
         dp = Dispatcher()
         dp.include_router(private.router)
         dp.include_router(group.router)
         await bot.delete_webhook(drop_pending_updates=True)
-        await dp.start_polling(bot)
+        watcher = asyncio.create_task(watch_config()) if POLL_SECONDS > 0 else None
+        try:
+            await dp.start_polling(bot)
+        finally:
+            if watcher:
+                watcher.cancel()
 
 
 if __name__ == "__main__":
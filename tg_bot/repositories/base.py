@@ -36,6 +36,12 @@ class AbstractCharactersRepo(ABC):
     @abstractmethod
     async def update_character(self, char: PlayerCharacter, chat_id: int) -> None: ...
 
+    async def update_characters(
+        self, chars: Sequence[PlayerCharacter], chat_id: int
+    ) -> None:
+        for char in chars:
+            await self.update_character(char, chat_id)
+
 
 class AbstractInventoryRepo(ABC):
     @abstractmethod
@@ -0,0 +1,488 @@
+from __future__ import annotations
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncContextManager, Callable, Dict, List, Optional, Sequence, Tuple
+
+from my_game.characters.player import Player
+from my_game.characters.player_character import PlayerCharacter
+
+from .base import (
+    AbstractUsersRepo,
+    AbstractCharactersRepo,
+    AbstractInventoryRepo,
+    AbstractPartyRepo,
+)
+
+
+logger = logging.getLogger(__name__)
+
+# Сколько игроков держать в памяти; 0 — без кеша
+CACHE_SIZE = int(os.getenv("CACHE_SIZE", "1024"))
+# Через сколько секунд запись игрока перечитывается из БД
+CACHE_TTL = float(os.getenv("CACHE_TTL", "300"))
+# Как часто сбрасывать изменения в БД (секунды)
+FLUSH_SECONDS = float(os.getenv("CACHE_FLUSH_SECONDS", "5"))
+
+Key = Tuple[int, int]  # (user_id, chat_id)
+# грязная сущность и номер её пометки: flush снимает пометку, только если
+# после записи её не перезаписали
+Mark = Tuple[object, int]
+
+_MISSING = object()
+
+
+@asynccontextmanager
+async def _no_transaction():
+    yield
+
+
+# поля, которые откат транзакции возвращает объектам, прочитанным внутри неё
+_SAVED_FIELDS = {
+    Player: ("gold", "username"),
+    PlayerCharacter: ("level", "exp", "health", "mana"),
+}
+
+
+class _Journal:
+    """Что транзакция поменяла в кеше: для записи в конце и для отката."""
+
+    __slots__ = ("touched", "saved", "undo")
+
+    def __init__(self):
+        # id(грязной карты) → (карта, ключи, помеченные внутри транзакции)
+        self.touched: Dict[int, Tuple[Dict, set]] = {}
+        # id(объекта) → снимок полей до изменений
+        self.saved: Dict[int, Tuple[object, Dict[str, object]]] = {}
+        self.undo: List[Callable[[], None]] = []
+
+
+# журнал транзакции, открытой в текущей задаче
+_journal: ContextVar[Optional[_Journal]] = ContextVar("cache_tx", default=None)
+
+
+class _Entry:
+    """Всё, что прочитано для одного игрока; части грузятся лениво."""
+
+    __slots__ = ("loaded_at", "user", "chars", "party", "items")
+
+    def __init__(self, now: float):
+        self.loaded_at = now
+        self.user: object = _MISSING  # Player | None
+        self.chars: Optional[List[PlayerCharacter]] = None
+        self.party: Optional[List[int]] = None
+        self.items: Optional[list] = None
+
+
+class PlayerCache:
+    """
+    LRU с TTL над репозиториями SQLite и отложенная запись.
+
+    Чтения (пользователь, персонажи, отряд, инвентарь) идут в БД только при
+    промахе. update_user / update_character / set_party меняют кеш и
+    помечают сущность грязной; flush() раз в `flush_seconds` пишет все
+    грязные сущности пачкой, close() — последний раз перед выходом.
+    Грязные сущности живут отдельно от LRU, поэтому вытеснение или
+    истечение записи их не теряет: при новой загрузке они накладываются
+    поверх прочитанного из БД. Пометка снимается только после commit —
+    пока flush пишет, перечитанная запись всё ещё видит несохранённое.
+
+    Вставки и удаления, которым нужен id из БД (add_user, add_character,
+    add_item, remove_item), пишутся сразу. Сброс идёт одной транзакцией
+    `transaction()` (Database.transaction), персонажи — одним executemany
+    на чат.
+
+    transaction() — единица работы обработчика поверх кеша: всё, что он
+    пометил грязным, пишется в той же транзакции SQLite, что и его вставки
+    и удаления, и одним commit. При исключении откатывается и кеш: объекты,
+    прочитанные внутри транзакции, получают прежние значения, пометки —
+    прежний вид, а то, что вернуть нельзя, перечитается из БД.
+    """
+
+    def __init__(
+        self,
+        users: AbstractUsersRepo,
+        characters: AbstractCharactersRepo,
+        inventory: AbstractInventoryRepo,
+        party: AbstractPartyRepo,
+        *,
+        size: int = CACHE_SIZE,
+        ttl: float = CACHE_TTL,
+        flush_seconds: float = FLUSH_SECONDS,
+        transaction: Callable[[], AsyncContextManager] = _no_transaction,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.db_users = users
+        self.db_characters = characters
+        self.db_inventory = inventory
+        self.db_party = party
+        self.size = size
+        self.ttl = ttl
+        self.flush_seconds = flush_seconds
+        self._transaction = transaction
+        self._clock = clock
+        self._entries: "OrderedDict[Key, _Entry]" = OrderedDict()
+        # персонаж → игрок, в чьей записи он лежит
+        self._char_keys: Dict[int, Key] = {}
+        # грязные сущности до commit их записи
+        self._dirty_users: Dict[Key, Mark] = {}
+        self._dirty_chars: Dict[Tuple[int, int], Mark] = {}
+        self._dirty_party: Dict[Key, Mark] = {}
+        self._seq = 0
+        self._flusher: asyncio.Task | None = None
+        self._flush_lock = asyncio.Lock()
+
+        self.users = CachedUsersRepo(self)
+        self.characters = CachedCharactersRepo(self)
+        self.inventory = CachedInventoryRepo(self)
+        self.party = CachedPartyRepo(self)
+
+    # ───────────────────────
+    #  LRU
+    # ───────────────────────
+    def entry(self, key: Key) -> _Entry:
+        now = self._clock()
+        entry = self._entries.get(key)
+        if entry is not None and now - entry.loaded_at < self.ttl:
+            self._entries.move_to_end(key)
+            return entry
+        if entry is not None:
+            self._drop(key)
+        entry = self._entries[key] = _Entry(now)
+        while len(self._entries) > self.size:
+            self._drop(next(iter(self._entries)))
+        return entry
+
+    def _drop(self, key: Key) -> None:
+        self._drop_chars(self._entries.pop(key))
+
+    def mark(
+        self, dirty: Dict, key, value, invalidate: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Пометить сущность грязной (новая пометка заменяет прежнюю). Внутри
+        транзакции пометка журналируется; `invalidate` сбросит сущность в
+        кеше при откате, если ни прежней пометки, ни снимка объекта нет.
+        """
+        journal = _journal.get()
+        if journal is not None:
+            _, keys = journal.touched.setdefault(id(dirty), (dirty, set()))
+            if key not in keys:
+                keys.add(key)
+                prior = dirty.get(key)
+                restorable = prior is not None or id(value) in journal.saved
+
+                def undo():
+                    if prior is not None:
+                        dirty[key] = prior
+                    else:
+                        dirty.pop(key, None)
+                    if not restorable and invalidate is not None:
+                        invalidate()
+
+                journal.undo.append(undo)
+        self._seq += 1
+        dirty[key] = (value, self._seq)
+
+    def remember(self, obj) -> None:
+        """Внутри транзакции — запомнить поля объекта для отката."""
+        journal = _journal.get()
+        if journal is None or obj is None or id(obj) in journal.saved:
+            return
+        snapshot = {name: getattr(obj, name) for name in _SAVED_FIELDS.get(type(obj), ())}
+        journal.saved[id(obj)] = (obj, snapshot)
+
+        def undo():
+            level = snapshot.pop("level", None)
+            if level is not None and level != obj.level:
+                # рост уровня не откатить полями — персонаж перечитается из БД
+                self.forget_char(obj.db_id)
+            for name, value in snapshot.items():
+                setattr(obj, name, value)
+
+        journal.undo.append(undo)
+
+    def on_rollback(self, undo: Callable[[], None]) -> None:
+        journal = _journal.get()
+        if journal is not None:
+            journal.undo.append(undo)
+
+    def forget_char(self, char_id: int) -> None:
+        key = self._char_keys.get(char_id)
+        entry = self._entries.get(key) if key else None
+        if entry is not None:
+            self._drop_chars(entry)
+
+    def _drop_chars(self, entry: _Entry) -> None:
+        for pc in entry.chars or ():
+            self._char_keys.pop(pc.db_id, None)
+        entry.chars = None
+
+    @asynccontextmanager
+    async def transaction(self):
+        """Единица работы обработчика (см. описание класса)."""
+        if _journal.get() is not None:
+            yield  # вложенная — часть внешней
+            return
+        journal = _Journal()
+        token = _journal.set(journal)
+        try:
+            async with self._transaction():
+                yield
+                written = self._touched(journal)
+                await self._write(*written)
+        except BaseException:
+            for undo in reversed(journal.undo):
+                undo()
+            raise
+        else:
+            self._clean(*written)
+        finally:
+            _journal.reset(token)
+
+    def _touched(self, journal: _Journal) -> List[Dict]:
+        """Текущие пометки сущностей, помеченных в транзакции, по картам."""
+        written = []
+        for dirty in (self._dirty_users, self._dirty_chars, self._dirty_party):
+            _, keys = journal.touched.get(id(dirty), (dirty, ()))
+            written.append({k: dirty[k] for k in keys if k in dirty})
+        return written
+
+    @staticmethod
+    def pending(dirty: Dict, key, default=None):
+        """Несохранённое значение сущности или default."""
+        mark = dirty.get(key)
+        return default if mark is None else mark[0]
+
+    def dirty_count(self) -> int:
+        return len(self._dirty_users) + len(self._dirty_chars) + len(self._dirty_party)
+
+    # ───────────────────────
+    #  Отложенная запись
+    # ───────────────────────
+    def start(self) -> None:
+        if self._flusher is None and self.flush_seconds > 0:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_seconds)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("cache flush failed, %s entities pending", self.dirty_count())
+
+    async def flush(self) -> int:
+        """Записать все грязные сущности; вернуть их число."""
+        async with self._flush_lock:
+            # снимок — уже под транзакцией: единица работы обработчика либо
+            # завершилась, либо откатила свои пометки
+            async with self._transaction():
+                users = dict(self._dirty_users)
+                chars = dict(self._dirty_chars)
+                parties = dict(self._dirty_party)
+                # при ошибке транзакция откатится, а пометки останутся до следующего раза
+                await self._write(users, chars, parties)
+            self._clean(users, chars, parties)
+            return len(users) + len(chars) + len(parties)
+
+    async def _write(
+        self,
+        users: Dict[Key, Mark],
+        chars: Dict[Tuple[int, int], Mark],
+        parties: Dict[Key, Mark],
+    ) -> None:
+        by_chat: Dict[int, List[PlayerCharacter]] = {}
+        for (_, chat_id), (pc, _) in chars.items():
+            by_chat.setdefault(chat_id, []).append(pc)
+        async with self._transaction():
+            for (_, chat_id), (player, _) in users.items():
+                await self.db_users.update_user(player, chat_id)
+            for chat_id, batch in by_chat.items():
+                await self.db_characters.update_characters(batch, chat_id)
+            for (user_id, chat_id), (ids, _) in parties.items():
+                await self.db_party.set_party(user_id, chat_id, ids)
+
+    def _clean(self, *written: Dict) -> None:
+        """Снять записанные пометки, если их не обновили во время записи."""
+        for snapshot, dirty in zip(
+            written, (self._dirty_users, self._dirty_chars, self._dirty_party)
+        ):
+            for key, mark in snapshot.items():
+                if dirty.get(key) is mark:
+                    del dirty[key]
+
+    async def close(self) -> None:
+        if self._flusher is not None:
+            self._flusher.cancel()
+            try:
+                await self._flusher
+            except asyncio.CancelledError:
+                pass
+            self._flusher = None
+        await self.flush()
+
+
+class CachedUsersRepo(AbstractUsersRepo):
+    def __init__(self, cache: PlayerCache):
+        self.cache = cache
+
+    async def get_user(self, user_id: int, chat_id: int) -> Player | None:
+        key = (user_id, chat_id)
+        entry = self.cache.entry(key)
+        if entry.user is _MISSING:
+            user = self.cache.pending(self.cache._dirty_users, key)
+            if user is None:
+                user = await self.cache.db_users.get_user(user_id, chat_id)
+            entry.user = user
+        self.cache.remember(entry.user)
+        return entry.user
+
+    async def add_user(self, user_id: int, chat_id: int, username: str) -> Player:
+        user = await self.cache.db_users.add_user(user_id, chat_id, username)
+        self.cache.entry((user_id, chat_id)).user = _MISSING  # INSERT OR IGNORE
+        return user
+
+    async def get_or_create(self, user_id: int, chat_id: int, username: str) -> Player:
+        user = await self.get_user(user_id, chat_id)
+        if user:
+            return user
+        await self.add_user(user_id, chat_id, username)
+        return await self.get_user(user_id, chat_id)
+
+    async def update_user(self, player: Player, chat_id: int) -> None:
+        key = (player.id, chat_id)
+        cache = self.cache
+        entry = cache.entry(key)
+        entry.user = player
+
+        def invalidate():
+            entry.user = _MISSING
+
+        cache.mark(cache._dirty_users, key, player, invalidate)
+
+
+class CachedCharactersRepo(AbstractCharactersRepo):
+    def __init__(self, cache: PlayerCache):
+        self.cache = cache
+
+    async def get_characters(self, user_id: int, chat_id: int) -> List[PlayerCharacter]:
+        key = (user_id, chat_id)
+        cache = self.cache
+        entry = cache.entry(key)
+        if entry.chars is None:
+            chars = list(await cache.db_characters.get_characters(user_id, chat_id))
+            for i, pc in enumerate(chars):
+                chars[i] = cache.pending(cache._dirty_chars, (pc.db_id, chat_id), pc)
+            entry.chars = chars
+            for pc in chars:
+                cache._char_keys[pc.db_id] = key
+        for i, pc in enumerate(entry.chars):
+            entry.chars[i] = _detached(pc)
+            cache.remember(entry.chars[i])
+        return list(entry.chars)
+
+    async def add_character(
+        self, user_id: int, chat_id: int, name: str, class_name: str
+    ) -> PlayerCharacter:
+        pc = await self.cache.db_characters.add_character(
+            user_id, chat_id, name, class_name
+        )
+        entry = self.cache.entry((user_id, chat_id))
+        if entry.chars is not None:
+            entry.chars.append(pc)
+            self.cache._char_keys[pc.db_id] = (user_id, chat_id)
+        return pc
+
+    async def update_character(self, char: PlayerCharacter, chat_id: int) -> None:
+        char_id = getattr(char, "db_id", None)
+        if not char_id:
+            return
+        cache = self.cache
+        key = cache._char_keys.get(char_id)
+        entry = cache._entries.get(key) if key else None
+        if entry is not None and entry.chars is not None:
+            # пришёл другой объект того же персонажа — кеш хранит последний
+            for i, pc in enumerate(entry.chars):
+                if pc.db_id == char_id:
+                    entry.chars[i] = char
+        cache.mark(
+            cache._dirty_chars, (char_id, chat_id), char, lambda: cache.forget_char(char_id)
+        )
+
+
+def _detached(pc: PlayerCharacter) -> PlayerCharacter:
+    """
+    Персонаж без экипировки (её таблица characters не хранит), как его
+    вернула бы БД. Держателей не трогает: экипированный персонаж заменяется
+    в кеше новым объектом, а owner, выставленный обработчиком (отряд,
+    ждущий выбора сложности), остаётся на месте.
+    """
+    if pc.equipment:
+        fresh = PlayerCharacter.from_config(
+            pc.char_class.name, pc.level, owner=None, name_override=pc.name
+        )
+        fresh.exp = pc.exp
+        fresh.health = min(pc.health, fresh.max_health)
+        fresh.mana = min(pc.mana, fresh.base_mana)
+        fresh.__dict__["db_id"] = pc.db_id
+        return fresh
+    return pc
+
+
+class CachedPartyRepo(AbstractPartyRepo):
+    def __init__(self, cache: PlayerCache):
+        self.cache = cache
+
+    async def get_party(self, user_id: int, chat_id: int) -> List[int]:
+        key = (user_id, chat_id)
+        entry = self.cache.entry(key)
+        if entry.party is None:
+            ids = self.cache.pending(self.cache._dirty_party, key)
+            if ids is None:
+                ids = await self.cache.db_party.get_party(user_id, chat_id)
+            entry.party = list(ids)
+        return list(entry.party)
+
+    async def set_party(self, user_id: int, chat_id: int, char_ids: Sequence[int]) -> None:
+        key = (user_id, chat_id)
+        entry = self.cache.entry(key)
+        prior = entry.party
+        entry.party = list(char_ids)
+
+        def restore():
+            entry.party = prior
+
+        self.cache.on_rollback(restore)
+        self.cache.mark(self.cache._dirty_party, key, list(char_ids))
+
+
+class CachedInventoryRepo(AbstractInventoryRepo):
+    def __init__(self, cache: PlayerCache):
+        self.cache = cache
+
+    async def get_items(self, user_id: int, chat_id: int):
+        entry = self.cache.entry((user_id, chat_id))
+        if entry.items is None:
+            entry.items = list(await self.cache.db_inventory.get_items(user_id, chat_id))
+        return list(entry.items)
+
+    async def add_item(self, user_id: int, chat_id: int, item) -> None:
+        await self.cache.db_inventory.add_item(user_id, chat_id, item)
+        # id новой строки знает только БД — список перечитается при запросе
+        entry = self.cache.entry((user_id, chat_id))
+        entry.items = None
+        self.cache.on_rollback(lambda: setattr(entry, "items", None))
+
+    async def remove_item(self, item_id: int, chat_id: int) -> None:
+        await self.cache.db_inventory.remove_item(item_id, chat_id)
+        for (_, chat), entry in self.cache._entries.items():
+            if chat == chat_id and entry.items is not None:
+                entry.items = [i for i in entry.items if i.db_id != item_id]
+                self.cache.on_rollback(lambda e=entry: setattr(e, "items", None))
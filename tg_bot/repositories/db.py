@@ -1,6 +1,16 @@
+from contextlib import AbstractAsyncContextManager
+
 import aiosqlite
 
+from .base import (
+    AbstractUsersRepo,
+    AbstractCharactersRepo,
+    AbstractInventoryRepo,
+    AbstractPartyRepo,
+)
+from .cached import CACHE_SIZE, PlayerCache
 from .sqlite import (
+    SQLiteSession,
     SQLiteUsersRepo,
     SQLiteCharactersRepo,
     SQLiteInventoryRepo,
@@ -9,22 +19,41 @@ from .sqlite import (
 
 
 class Database:
-    def __init__(self, path: str):
+    def __init__(self, path: str, cache_size: int = CACHE_SIZE):
         self.path = path
+        self.cache_size = cache_size
         self.conn: aiosqlite.Connection | None = None
-        self.users: SQLiteUsersRepo | None = None
-        self.characters: SQLiteCharactersRepo | None = None
-        self.inventory: SQLiteInventoryRepo | None = None
-        self.party: SQLitePartyRepo | None = None
+        self.session: SQLiteSession | None = None
+        self.cache: PlayerCache | None = None
+        self.users: AbstractUsersRepo | None = None
+        self.characters: AbstractCharactersRepo | None = None
+        self.inventory: AbstractInventoryRepo | None = None
+        self.party: AbstractPartyRepo | None = None
 
     async def connect(self):
         self.conn = await aiosqlite.connect(self.path)
         await self.conn.execute("PRAGMA foreign_keys = ON")
         await self._create_tables()
-        self.users = SQLiteUsersRepo(self.conn)
-        self.characters = SQLiteCharactersRepo(self.conn)
-        self.inventory = SQLiteInventoryRepo(self.conn)
-        self.party = SQLitePartyRepo(self.conn)
+        self.session = SQLiteSession(self.conn)
+        self.users = SQLiteUsersRepo(self.session)
+        self.characters = SQLiteCharactersRepo(self.session)
+        self.inventory = SQLiteInventoryRepo(self.session)
+        self.party = SQLitePartyRepo(self.session)
+        if self.cache_size > 0:
+            # горячие игроки в памяти, изменения пишутся пачками (cached.py)
+            self.cache = PlayerCache(
+                self.users,
+                self.characters,
+                self.inventory,
+                self.party,
+                size=self.cache_size,
+                transaction=self.session.transaction,
+            )
+            self.cache.start()
+            self.users = self.cache.users
+            self.characters = self.cache.characters
+            self.inventory = self.cache.inventory
+            self.party = self.cache.party
 
     async def _create_tables(self):
         await self.conn.execute(
@@ -78,7 +107,21 @@ class Database:
         )
         await self.conn.commit()
 
+    def transaction(self) -> AbstractAsyncContextManager:
+        """
+        Единица работы: записи внутри `async with db.transaction():` идут
+        одной транзакцией с одним commit; исключение откатывает все.
+        """
+        if self.cache is not None:
+            # отложенные записи обработчика уходят в ту же транзакцию
+            return self.cache.transaction()
+        return self.session.transaction()
+
     async def close(self):
+        if self.cache:
+            # последний сброс отложенных изменений до закрытия соединения
+            await self.cache.close()
+            self.cache = None
         if self.conn:
             await self.conn.close()
             self.conn = None
@@ -1,7 +1,10 @@
 from __future__ import annotations
+import asyncio
 import json
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from dataclasses import asdict
-from typing import List
+from typing import AsyncIterator, List, Optional, Sequence
 
 import aiosqlite
 
@@ -19,9 +22,48 @@ from .base import (
 )
 
 
-class SQLiteUsersRepo(AbstractUsersRepo):
+# сессия, чья транзакция открыта в текущей задаче
+_active: ContextVar[Optional["SQLiteSession"]] = ContextVar("sqlite_tx", default=None)
+
+
+class SQLiteSession:
+    """
+    Общее соединение и единица работы поверх него.
+
+    Все записи репозиториев идут через transaction(): вне открытой
+    транзакции это транзакция из одного запроса (commit на вызов, как
+    раньше), а внутри `async with db.transaction()` запросы присоединяются
+    к ней и фиксируются одним commit (одним fsync) в конце; исключение
+    откатывает всё. Соединение у бота одно, поэтому транзакции разных задач
+    идут по очереди — иначе commit одной фиксировал бы половину другой.
+    """
+
     def __init__(self, conn: aiosqlite.Connection):
         self.conn = conn
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def transaction(self) -> AsyncIterator[aiosqlite.Connection]:
+        if _active.get() is self:
+            yield self.conn  # вложенная — часть внешней
+            return
+        async with self._lock:
+            token = _active.set(self)
+            try:
+                yield self.conn
+            except BaseException:
+                await self.conn.rollback()
+                raise
+            else:
+                await self.conn.commit()
+            finally:
+                _active.reset(token)
+
+
+class SQLiteUsersRepo(AbstractUsersRepo):
+    def __init__(self, session: SQLiteSession):
+        self.session = session
+        self.conn = session.conn
 
     async def get_user(self, user_id: int, chat_id: int) -> Player | None:
         cur = await self.conn.execute(
@@ -34,11 +76,11 @@ class SQLiteUsersRepo(AbstractUsersRepo):
         return None
 
     async def add_user(self, user_id: int, chat_id: int, username: str) -> Player:
-        await self.conn.execute(
-            "INSERT OR IGNORE INTO users(user_id, chat_id, username, gold) VALUES (?, ?, ?, ?)",
-            (user_id, chat_id, username, 100),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "INSERT OR IGNORE INTO users(user_id, chat_id, username, gold) VALUES (?, ?, ?, ?)",
+                (user_id, chat_id, username, 100),
+            )
         return Player(id=user_id, username=username)
 
     async def get_or_create(self, user_id: int, chat_id: int, username: str) -> Player:
@@ -48,16 +90,17 @@ class SQLiteUsersRepo(AbstractUsersRepo):
         return await self.add_user(user_id, chat_id, username)
 
     async def update_user(self, player: Player, chat_id: int) -> None:
-        await self.conn.execute(
-            "UPDATE users SET username=?, gold=? WHERE user_id=? AND chat_id=?",
-            (player.username, player.gold, player.id, chat_id),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "UPDATE users SET username=?, gold=? WHERE user_id=? AND chat_id=?",
+                (player.username, player.gold, player.id, chat_id),
+            )
 
 
 class SQLitePartyRepo(AbstractPartyRepo):
-    def __init__(self, conn: aiosqlite.Connection):
-        self.conn = conn
+    def __init__(self, session: SQLiteSession):
+        self.session = session
+        self.conn = session.conn
 
     async def get_party(self, user_id: int, chat_id: int):
         cur = await self.conn.execute(
@@ -70,17 +113,18 @@ class SQLitePartyRepo(AbstractPartyRepo):
         return []
 
     async def set_party(self, user_id: int, chat_id: int, char_ids):
-        await self.conn.execute(
-            "INSERT INTO party(user_id, chat_id, char_ids) VALUES (?, ?, ?) "
-            "ON CONFLICT(user_id, chat_id) DO UPDATE SET char_ids=excluded.char_ids",
-            (user_id, chat_id, json.dumps(list(char_ids))),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "INSERT INTO party(user_id, chat_id, char_ids) VALUES (?, ?, ?) "
+                "ON CONFLICT(user_id, chat_id) DO UPDATE SET char_ids=excluded.char_ids",
+                (user_id, chat_id, json.dumps(list(char_ids))),
+            )
 
 
 class SQLiteCharactersRepo(AbstractCharactersRepo):
-    def __init__(self, conn: aiosqlite.Connection):
-        self.conn = conn
+    def __init__(self, session: SQLiteSession):
+        self.session = session
+        self.conn = session.conn
 
     async def get_characters(self, user_id: int, chat_id: int) -> List[PlayerCharacter]:
         cur = await self.conn.execute(
@@ -102,20 +146,20 @@ class SQLiteCharactersRepo(AbstractCharactersRepo):
         self, user_id: int, chat_id: int, name: str, class_name: str
     ) -> PlayerCharacter:
         pc = PlayerCharacter.from_config(class_name, 1, owner=None, name_override=name)
-        cur = await self.conn.execute(
-            "INSERT INTO characters(user_id, chat_id, name, class, level, exp, hp, mana) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-            (
-                user_id,
-                chat_id,
-                pc.name,
-                class_name,
-                pc.level,
-                pc.exp,
-                pc.health,
-                pc.mana,
-            ),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            cur = await self.conn.execute(
+                "INSERT INTO characters(user_id, chat_id, name, class, level, exp, hp, mana) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    user_id,
+                    chat_id,
+                    pc.name,
+                    class_name,
+                    pc.level,
+                    pc.exp,
+                    pc.health,
+                    pc.mana,
+                ),
+            )
         pc.__dict__["db_id"] = cur.lastrowid
         return pc
 
@@ -123,16 +167,33 @@ class SQLiteCharactersRepo(AbstractCharactersRepo):
         char_id = getattr(char, "db_id", None)
         if not char_id:
             return
-        await self.conn.execute(
-            "UPDATE characters SET level=?, exp=?, hp=?, mana=? WHERE id=? AND chat_id=?",
-            (char.level, char.exp, char.health, char.mana, char_id, chat_id),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "UPDATE characters SET level=?, exp=?, hp=?, mana=? WHERE id=? AND chat_id=?",
+                (char.level, char.exp, char.health, char.mana, char_id, chat_id),
+            )
+
+    async def update_characters(
+        self, chars: Sequence[PlayerCharacter], chat_id: int
+    ) -> None:
+        rows = [
+            (c.level, c.exp, c.health, c.mana, c.db_id, chat_id)
+            for c in chars
+            if getattr(c, "db_id", None)
+        ]
+        if not rows:
+            return
+        async with self.session.transaction():
+            await self.conn.executemany(
+                "UPDATE characters SET level=?, exp=?, hp=?, mana=? WHERE id=? AND chat_id=?",
+                rows,
+            )
 
 
 class SQLiteInventoryRepo(AbstractInventoryRepo):
-    def __init__(self, conn: aiosqlite.Connection):
-        self.conn = conn
+    def __init__(self, session: SQLiteSession):
+        self.session = session
+        self.conn = session.conn
 
     async def get_items(self, user_id: int, chat_id: int):
         cur = await self.conn.execute(
@@ -182,15 +243,15 @@ class SQLiteInventoryRepo(AbstractInventoryRepo):
                 "heal": getattr(item, "heal", 0),
                 "mana": getattr(item, "mana", 0),
             }
-        await self.conn.execute(
-            "INSERT INTO inventory(user_id, chat_id, data) VALUES (?, ?, ?)",
-            (user_id, chat_id, json.dumps(data)),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "INSERT INTO inventory(user_id, chat_id, data) VALUES (?, ?, ?)",
+                (user_id, chat_id, json.dumps(data)),
+            )
 
     async def remove_item(self, item_id: int, chat_id: int) -> None:
-        await self.conn.execute(
-            "DELETE FROM inventory WHERE id=? AND chat_id=?",
-            (item_id, chat_id),
-        )
-        await self.conn.commit()
+        async with self.session.transaction():
+            await self.conn.execute(
+                "DELETE FROM inventory WHERE id=? AND chat_id=?",
+                (item_id, chat_id),
+            )
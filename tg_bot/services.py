@@ -1,81 +1,71 @@
 from __future__ import annotations
-import io
-import contextlib
-import random
-from typing import Tuple
+import logging
+import os
+from typing import Optional, Tuple
 from typing import Sequence
 
 from my_game.characters.player_character import PlayerCharacter
 from my_game.utils.monster_utils import generate_enemies_for_tier
-from my_game.battle.dispatcher import take_turn as ai_take_turn
-from my_game.config import CONFIG
+from my_game.battle.context import BattleContext
+from my_game.battle.engine import run_battle
+from my_game.battle.events import BattleStarted, BattleEnded
+from my_game.battle.log import TextLogRenderer
 from my_game.items.store import Store
 
 
+logger = logging.getLogger(__name__)
+
 store = Store()
 
+# Предел раундов боя бота: бой, брошенный по таймауту, не займёт воркер навсегда
+MAX_ROUNDS = int(os.getenv("BATTLE_MAX_ROUNDS", "200"))
+
 
 def simulate_battle(
-    party: Sequence[PlayerCharacter], tier: int
+    party: Sequence[PlayerCharacter],
+    tier: int,
+    seed: Optional[int] = None,
+    max_rounds: int = MAX_ROUNDS,
 ) -> Tuple[str, bool, int, int]:
-    """Run battle for a party and return (log, win, xp, gold)."""
+    """
+    Run battle for a party and return (log, win, xp, gold).
+
+    The whole battle (enemies included) is driven by one seeded RNG, so
+    passing the logged `seed` with the same party replays it exactly.
+    A battle still undecided after `max_rounds` rounds counts as a loss.
+    """
     if not party:
         raise ValueError("Party cannot be empty")
-    enemies = generate_enemies_for_tier(tier)
-    participants = list(party) + enemies
+    log = TextLogRenderer()
+    # снимок конфига фиксируется здесь: перезагрузка посреди боя его не меняет
+    ctx = BattleContext(log, seed)
+    cfg = ctx.config
+    logger.info("battle tier=%s seed=%s config=v%s", tier, ctx.seed, cfg.version)
+    rng = ctx.rng
 
-    for pc in party:
-        pc.team = party
-    for m in enemies:
-        m.team = enemies
+    enemies = generate_enemies_for_tier(tier, rng, cfg)
+    emit = ctx.emit
 
-    tiers = CONFIG["monsters"]["monster_tiers"]
-    buf = io.StringIO()
-    with contextlib.redirect_stdout(buf):
-        print(f"\n⚔️  Начало боя (тир {tier} — {tiers[f'tier{tier}']['name']})")
-        for e in enemies:
-            print(f"   • {e.name} (ур. {e.level}) — HP {e.health}/{e.max_health}")
+    emit(
+        BattleStarted(
+            tier,
+            cfg.tier(tier).name,
+            tuple((e.name, e.level, e.health, e.max_health) for e in enemies),
+            tuple((h.name, h.level, h.health, h.max_health) for h in party),
+        )
+    )
+    win = run_battle(ctx, party, enemies, max_rounds=max_rounds)
+    if win:
+        base = cfg.xp_rewards[tier]
+        count = len(enemies)
+        reward = base * count * 1.2 if count > 1 else base
         for hero in party:
-            print(
-                f"🔹 {hero.name} (lvl {hero.level}) — HP {hero.health}/{hero.max_health}"
-            )
-        print()
-        round_num = 1
-        while any(h.is_alive for h in party) and any(m.is_alive for m in enemies):
-            print(f"=== Раунд {round_num} ===")
-            order = [p for p in participants if p.is_alive]
-            order.sort(key=lambda x: x.agility + random.random() * 0.1, reverse=True)
-            for actor in order:
-                if actor in party:
-                    ai_take_turn(actor, [m for m in enemies if m.is_alive])
-                else:
-                    targets = [h for h in party if h.is_alive]
-                    if not targets:
-                        break
-                    target = random.choice(targets)
-                    ai_take_turn(actor, target)
-
-                if not any(h.is_alive for h in party) or not any(
-                    m.is_alive for m in enemies
-                ):
-                    break
-            round_num += 1
-            print()
-        win = any(h.is_alive for h in party)
-        if win:
-            base = CONFIG["growth"]["xp_rewards"][f"tier{tier}"]
-            count = len(enemies)
-            reward = base * count * 1.2 if count > 1 else base
-            for hero in party:
-                hero.add_exp(reward)
-            gold = int(reward // 10)
-            owner = party[0].owner
-            if owner:
-                owner.add_gold(gold)
-            print(f"🎉 Победа! Отряд получает {reward} XP и {gold} золота")
-        else:
-            reward = gold = 0
-            print("☠️  Отряд пал в бою.")
-    log = buf.getvalue()
-    buf.close()
-    return log, win, reward, gold
+            hero.add_exp(reward)
+        gold = int(reward // 10)
+        owner = party[0].owner
+        if owner:
+            owner.add_gold(gold)
+    else:
+        reward = gold = 0
+    emit(BattleEnded(win, reward, gold))
+    return log.getvalue(), win, reward, gold